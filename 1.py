@@ -1,201 +1,175 @@
 from playwright.async_api import async_playwright, TimeoutError # 변경
-from playwright_stealth import Stealth # 변경
-import json
 from datetime import datetime
 import glob
 import os
 import re # 정규 표현식 모듈 추가
 import asyncio # 비동기 처리를 위해 asyncio 모듈 추가
-from urllib.parse import urlparse # URL 파싱을 위해 추가
-
-# 날짜 포맷 정규화 함수 (debug_page.py에서 복사)
-def normalize_date(date_str):
-    if not date_str or date_str == '정보 없음':
-        return '정보 없음'
-    parts = date_str.split(' / ')
-    project_end_date_part = parts[0].strip()
-    try:
-        project_end_date_clean = ' '.join(project_end_date_part.split(' ')[:3])
-        dt_object = datetime.strptime(project_end_date_clean.replace(',', ''), '%B %d %Y')
-        return dt_object.strftime('%Y-%m-%d')
-    except ValueError:
-        pass
-    if 'Ships ' in date_str:
-        ship_date_part = date_str.split('Ships ')[-1].strip()
-        try:
-            dt_object = datetime.strptime(ship_date_part.replace(',', ''), '%B %d %Y')
-            return dt_object.strftime('%Y-%m-%d')
-        except ValueError:
-            pass
-    try:
-        dt_object = datetime.strptime(date_str.replace(',', ''), '%B %d %Y')
-        return dt_object.strftime('%Y-%m-%d')
-    except ValueError:
-        return '정보 없음'
-
-# 제품군별 가격 매핑 (달러 기준)
-CATEGORY_PRICES = {
-    "hoodies": 59.99,
-    "knitted crewnecks": 59.99,
-    "t-shirts": 29.99,
-    "enamel pins": 19.99,
-    "vinyl figures": 29.99,
-    "plushies": 29.99,
-    "longbois": 36.99,
-    "doughbois": 39.99,
-    "jumbo plushies": 39.99,
-    "keychain plushies": 15.99,
-    "sweatpants": 54.99,
-    "ball cap": 24.99,
-    # 한국어 제품군명도 추가 (혹시 모를 경우를 대비)
-    "후디": 59.99,
-    "니트 크루넥": 59.99,
-    "티셔츠": 29.99,
-    "에나멜 핀": 19.99,
-    "비닐 피규어": 29.99,
-    "플러시": 29.99,
-    "롱보이": 36.99,
-    "도우보이": 39.99,
-    "점보 플러시": 39.99,
-    "키체인 플러시": 15.99,
-    "스웨트팬츠": 54.99,
-    "볼 캡": 24.99
-}
+import itertools
+import time
+import argparse
+import multiprocessing
+import zlib
+from context_pool import ContextPool # 프록시별 컨텍스트 재사용 풀
+from makeship_site import is_simulated, site_hostname, site_url # MAKESHIP_BASE_URL (로컬 시뮬레이터) 지원
+from makeship_parsing import (DATE_IN_TEXT_PATTERN, DOLLAR_PRICE_PATTERN, FIRST_WORD_PATTERN, FUNDED_TEXT_PATTERN,
+                              TOTAL_PRICE_PATTERN, VISIT_STORE_PATTERN, calculate_revenue, get_category_price,
+                              normalize_date, process_sales_data) # 판매량/달성률/가격/날짜 공용 파싱
+from scrape_logging import (LOG_FORMATS, LOG_FORMAT_TEXT, current_settings, drain_logging, get_logger, setup_logging,
+                            shutdown_logging) # 큐 기반 로깅 (stdout 쓰기는 백그라운드 스레드에서)
+from resource_policy import ResourcePolicy, DEFAULT_FIRST_PARTY_DOMAINS # 이미지/폰트/미디어/3rd-party 스크립트 차단
+from stealth_script import apply_stealth, get_stealth_script # stealth 스크립트는 한 번만 생성해 재사용
+from page_readiness import ReadinessStats, wait_for_product_ready # 고정 sleep 대신 준비 상태 기반 대기
+from next_data_fetcher import NextDataFetcher # 브라우저 없이 __NEXT_DATA__ JSON으로 수집
+from proxy_manager import ProxyManager # 상태 점수 기반 프록시 선택/격리
+from concurrency_controller import AIMDController, memory_ceiling # 적응형 동시 실행 수 제어
+from jsonl_checkpoint import CheckpointWriter, load_checkpoint # 완료 즉시 JSONL 기록
+from product_store import ProductStore # URL 기준 SQLite 제품 저장소 (JSON 결과 파일은 여기서 내보냄)
+from freshness_scheduler import FreshnessScheduler # 진행 상태/종료일 기반 재수집 일정
+from snapshot_store import SnapshotStore, TIME_FORMAT as SNAPSHOT_TIME_FORMAT # 원본 필드/HTML 스냅샷 저장 및 오프라인 재처리
+from host_politeness import HostPoliteness # 목록 페이지 요청의 호스트별 동시 수/간격 제한
+from listing_discovery import CATEGORY_CONFIGS, discover_categories_async # 카테고리 목록 스크롤 (--discover)
+from scrape_metrics import (ScrapeMetrics, STAGE_CONTEXT_ACQUIRE, STAGE_EXTRACT, STAGE_GOTO, STAGE_HTTP_FETCH,
+                            STAGE_POST_PROCESS, STAGE_STEALTH, STAGE_STEALTH_PREPARE, STAGE_TOTAL, STAGE_WAIT_READY, STAGE_WAIT_TITLE) # 단계별 지연/결과 지표
+from retry_policy import (ScrapeError, ERROR_BLOCK, ERROR_MISSING_TITLE, ERROR_OTHER, ERROR_TIMEOUT, BLOCK_STATUS_CODES,
+                          backoff_delay, classify_error, dead_letter_record, is_block_text, max_attempts,
+                          prune_dead_letters) # 오류 유형별 재시도 / 데드레터
 
-def get_category_price(category):
-    """제품군에 따른 가격을 반환합니다."""
-    if not category or category == "제품군을 찾을 수 없습니다.":
-        return 0.0
-    
-    # 소문자로 변환하여 매칭
-    category_lower = category.lower()
-    
-    # 직접 매칭 시도
-    if category_lower in CATEGORY_PRICES:
-        return CATEGORY_PRICES[category_lower]
-    
-    # 부분 매칭 시도 (예: "Hoodies" -> "hoodies")
-    for key in CATEGORY_PRICES:
-        if key in category_lower or category_lower in key:
-            return CATEGORY_PRICES[key]
-    
-    # 매칭되지 않는 경우 기본값 반환
-    print(f"경고: 제품군 '{category}'에 대한 가격 정보를 찾을 수 없습니다.")
-    return 29.99  # 기본값으로 플러시 가격 사용
+# 컨텍스트 하나로 처리할 최대 페이지 수 (이후 새 컨텍스트로 교체)
+CONTEXT_MAX_PAGES = 50
 
-def calculate_revenue(sales_volume, category, product_price):
-    """판매량, 제품군, 실제 제품 가격을 기반으로 매출을 계산합니다."""
-    try:
-        # 판매량이 정보 없음인 경우만 0 반환
-        if not sales_volume or sales_volume == "판매량 정보를 찾을 수 없습니다.":
-            return 0.0
-        
-        # Sold Out인 경우 최소 목표 수량(200개)로 가정하여 매출 계산
-        if sales_volume == "Sold Out":
-            sales_count = 200  # Sold Out은 최소 목표 달성을 의미하므로 200개로 가정
-            
-            # 실제 크롤링한 가격이 있으면 사용, 없으면 제품군별 하드코딩 가격 사용
-            actual_price = 0.0
-            if product_price and product_price != "가격을 찾을 수 없습니다.":
-                price_match = re.search(r'(\d+\.?\d*)', str(product_price).replace(',', ''))
-                if price_match:
-                    actual_price = float(price_match.group(1))
-            
-            if actual_price == 0.0:
-                actual_price = get_category_price(category)
-            
-            revenue = sales_count * actual_price
-            print(f"'Sold Out' 제품 - 최소 {sales_count}개 판매 가정, 가격: ${actual_price}, 매출: ${revenue:.2f}")
-            return round(revenue, 2)
-        
-        # 판매량에서 숫자만 추출
-        sales_match = re.search(r'(\d+)', str(sales_volume).replace(',', ''))
-        if sales_match:
-            sales_count = int(sales_match.group(1))
-            
-            # 실제 크롤링한 가격이 있으면 사용, 없으면 제품군별 하드코딩 가격 사용
-            actual_price = 0.0
-            if product_price and product_price != "가격을 찾을 수 없습니다.":
-                # 크롤링한 가격에서 숫자만 추출
-                price_match = re.search(r'(\d+\.?\d*)', str(product_price).replace(',', ''))
-                if price_match:
-                    actual_price = float(price_match.group(1))
-            
-            # 실제 가격이 없거나 0이면 제품군별 하드코딩 가격 사용
-            if actual_price == 0.0:
-                actual_price = get_category_price(category)
-            
-            revenue = sales_count * actual_price
-            return round(revenue, 2)
-        else:
-            return 0.0
-    except Exception as e:
-        print(f"매출 계산 중 오류: {e}")
-        return 0.0
-
-def process_sales_data(sales_raw_text, funded_raw_text):
-    processed_sales = "판매량 정보를 찾을 수 없습니다."
-    processed_rate = "달성률 정보를 찾을 수 없습니다."
-
-    # 1. 판매량 파싱
-    if sales_raw_text and sales_raw_text != "정보 없음":
-        sold_of_pattern = r'([0-9,]+)\s+of\s+([0-9,]+)\s+sold'
-        sold_of_match = re.search(sold_of_pattern, sales_raw_text, re.IGNORECASE)
-        if sold_of_match:
-            processed_sales = sold_of_match.group(1).replace(',', '')
-        else:
-            sold_only_pattern = r'([0-9,]+)\s+sold'
-            sold_only_match = re.search(sold_only_pattern, sales_raw_text, re.IGNORECASE)
-            if sold_only_match:
-                processed_sales = sold_only_match.group(1).replace(',', '')
-            elif "Sold Out" in sales_raw_text:
-                processed_sales = "Sold Out"
-
-    # 2. 달성률 파싱
-    if funded_raw_text and funded_raw_text != "정보 없음":
-        funded_pattern = r'([0-9,]+%)(?:\s*\+)?\s+Funded' # '+' 기호 처리 추가
-        funded_match = re.search(funded_pattern, funded_raw_text, re.IGNORECASE)
-        if funded_match:
-            processed_rate = funded_match.group(1).replace(',', '')
-        elif "Sold Out" in funded_raw_text:
-            processed_rate = "Sold Out"
-
-    # 3. 판매량 기반 달성률 계산 (X of Y sold -> X/Y 비율) - 명시적인 달성률이 없을 때만 시도
-    if processed_rate == "달성률 정보를 찾을 수 없습니다." and processed_sales != "판매량 정보를 찾을 수 없습니다." and processed_sales != "Sold Out" and "of" in sales_raw_text:
-        sold_of_pattern = r'([0-9,]+)\s+of\s+([0-9,]+)\s+sold'
-        sold_of_match = re.search(sold_of_pattern, sales_raw_text, re.IGNORECASE)
-        if sold_of_match:
-            x_val = int(sold_of_match.group(1).replace(',', ''))
-            y_val_str = sold_of_match.group(2).replace(',', '')
-            y_val = int(y_val_str) if y_val_str.isdigit() else 0
-            if y_val > 0:
-                processed_rate = f"{(x_val / y_val * 100):.1f}%"
-            else:
-                processed_rate = "0.0%"
+# 리소스 차단 모드 (False로 두면 모든 리소스를 그대로 로드)
+BLOCK_HEAVY_RESOURCES = True
+# 허용할 리소스 타입 (그 외 image, font, media, stylesheet 등은 모두 차단)
+ALLOWED_RESOURCE_TYPES = ("document", "xhr", "fetch", "script")
 
-    # 모든 정보가 없을 경우 최종적으로 Sold Out 처리
-    if processed_sales == "판매량 정보를 찾을 수 없습니다." and processed_rate == "달성률 정보를 찾을 수 없습니다." and ("Sold Out" in sales_raw_text or "Sold Out" in funded_raw_text):
-        processed_sales = "Sold Out"
-        processed_rate = "Sold Out"
+# 브라우저 없이 HTTP로 __NEXT_DATA__를 먼저 시도할지 여부 (필드가 빠지면 Playwright로 폴백)
+USE_HTTP_FETCH = True
 
-    return processed_sales, processed_rate
+# 동시 처리 페이지 수 (AIMD 제어기가 지연시간/오류율을 보고 MIN~상한 사이에서 자동 조절)
+INITIAL_CONCURRENCY = 10
+MIN_CONCURRENCY = 2
+MAX_CONCURRENCY = 64
+# Chromium 페이지 하나당 예상 메모리 (사용 가능 메모리 기준 동시 실행 상한 계산에 사용)
+MEMORY_PER_PAGE_MB = 150
+# 작업 큐 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_SOLD_OUT = 0  # 'Sold Out' 제품 재확인
+PRIORITY_NEW = 1       # 처음 보는 URL
+PRIORITY_STALE = 2     # 이전에 수집한 적이 있는 URL
+PRIORITY_STOP = 99     # 작업자 종료 신호
 
-async def extract_product_data(page, url):
-    """단일 제품 페이지에서 데이터를 추출하는 함수"""
-    print(f"URL: {url} 처리 시작...") # 디버그 로그 추가
-    try:
-        print(f"URL: {url} 페이지 로드 시도 중...") # 디버그 로그 추가
-        # 페이지 로딩 전략 변경 및 명시적 대기 추가
-        await page.goto(url, wait_until='commit', timeout=30000) # 페이지 로딩 전략을 'commit'으로 변경 (최소 대기)
-        print(f"URL: {url} 페이지 로드 완료. 제품 타이틀 셀렉터 대기 중...") # 디버그 로그 추가
-        await page.wait_for_selector('[class*="ProductDetails__ProductTitle"]', timeout=30000)
-        # 페이지 로딩 후 2초 명시적 대기
-        await asyncio.sleep(2)
-    except TimeoutError:
-        print(f"페이지 로드 시간 초과: {url}")
-        return None
+# 완료된 제품을 즉시 기록하는 체크포인트 로그 (중단 후 재시작 시 이어서 진행)
+CHECKPOINT_FILE = "makeship_checkpoint.jsonl"
+# 샤드(멀티 프로세스) 모드에서 프로세스별로 사용하는 체크포인트 로그
+SHARD_CHECKPOINT_PATTERN = "makeship_checkpoint.shard{index}.jsonl"
+# 전체 제품 데이터를 보관하는 SQLite DB (실행이 끝나면 체크포인트 레코드를 upsert)
+PRODUCT_DB_FILE = "makeship_products.db"
+# 실행이 끝난 뒤 DB 전체를 makeship_all_products_<ts>.json으로도 내보낼지 기본값 (--export-json으로 켬)
+# 실행마다 파일이 쌓이지 않도록 기본은 DB에만 반영하고, 엑셀은 2.py가 DB에서 직접 만듭니다.
+EXPORT_JSON_AFTER_RUN = False
+
+# 추출한 원본 필드 스냅샷 저장 폴더 (--snapshot으로 저장, --replay-snapshots로 네트워크 없이 재처리)
+SNAPSHOT_DIR = "makeship_snapshots"
+# 스냅샷에 렌더링된 HTML도 함께 저장할지 여부 (추출 JS를 고칠 때 확인용, 용량이 커짐)
+SNAPSHOT_SAVE_HTML = False
+# 재시도 한도를 넘긴 URL을 기록하는 데드레터 파일 (--retry-dead-letters로 이 URL만 다시 처리)
+DEAD_LETTER_FILE = "makeship_dead_letters.jsonl"
+SHARD_DEAD_LETTER_PATTERN = "makeship_dead_letters.shard{index}.jsonl"
+
+# 페이지 준비 대기 설정 (DOM 변경이 멈춘 것으로 보는 시간 / 최대 대기 시간)
+READY_QUIET_MS = 500
+READY_MAX_WAIT_MS = 5000
+# 페이지별 실제 준비 대기 시간 기록
+readiness_stats = ReadinessStats()
+
+# 단계별 지연시간 / 결과 지표 (실행이 끝나면 Prometheus textfile과 JSON 요약으로 저장)
+METRICS_PROM_FILE = "makeship_metrics.prom"
+METRICS_JSON_PATTERN = "scrape_metrics_{timestamp}.json"
+metrics = ScrapeMetrics()
+
+# 진행 로그 (setup_logging 이후 백그라운드 스레드에서 출력, --quiet이면 경고 이상만)
+logger = get_logger("scraper")
 
-    # --- 데이터 추출 ---
+# 긴 CSS 셀렉터 (사용자가 제공한 정확한 선택자들)
+PRODUCT_INFO_ROOT = '#__next > div._app__ContainerWrapper-sc-meusgd-0.fdDSJw > div > div._app__ContentWrapper-sc-meusgd-2.iURiPk > div > div > div.handle__ProductInfoWrapper-sc-1y81hk8-2.kYqEeP > div'
+
+# 한 번의 page.evaluate로 모든 필드와 폴백 후보 텍스트를 수집하는 스크립트.
+# 요소가 없으면 null을 반환하므로, 없는 요소마다 타임아웃을 기다리지 않습니다.
+EXTRACT_FIELDS_JS = """
+(root) => {
+    const q = (selector) => document.querySelector(selector);
+    const text = (el) => (el ? (el.innerText || '').trim() : null);
+    const textOf = (selector) => text(q(selector));
+    const firstWithText = (selector, needle) => {
+        for (const el of document.querySelectorAll(selector)) {
+            if ((el.innerText || '').toLowerCase().includes(needle.toLowerCase())) return el;
+        }
+        return null;
+    };
+    const isVisible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+
+    // 제품군: /shop/ 또는 /collections/ 링크 안의 p, 또는 "Store" 텍스트를 포함하는 링크
+    const header = '[class*="ProductInfo__ProductHeaderWrapper"]';
+    const categoryEl = q(`${header} a[href*="/shop/"] p, ${header} a[href*="/collections/"] p`)
+        || firstWithText(`${header} a`, 'Store');
+
+    // 판매량 후보 (우선순위 순서)
+    const salesCandidates = [
+        ['판매량-ProgressRow', textOf(`${root} > div:nth-child(3) > div > div.ProgressBarContainer__ProgressRow-sc-1slgn8k-2.cbQHDc > p`)],
+        ['판매량-PastLimitedCampaignRow', textOf(`${root} > div:nth-child(3) > div > div.ProgressBarContainer__PastLimitedCampaignRow-sc-1slgn8k-3.bLtdCY > p`)],
+        ['Units Sold Text', textOf('p[data-testid="units-sold-text"]')],
+        ['Sold Out Text', text(firstWithText('p', 'Sold Out'))],
+    ];
+    // 달성률 후보 (우선순위 순서)
+    const fundedCandidates = [
+        ['달성률-ProgressRow-Funded', textOf(`${root} > div:nth-child(3) > div > div.ProgressBarContainer__ProgressRow-sc-1slgn8k-2.cbQHDc > div > p`)],
+        ['Funded Text', text(firstWithText('p', '% Funded'))],
+    ];
+
+    // 화면에 보이는 p 태그 중 판매량/달성률 패턴과 일치하는 첫 텍스트 (JavaScript 폴백)
+    let visibleSalesText = null;
+    const patterns = [/\\d+\\s+of\\s+\\d+\\s+sold/i, /\\d+,?\\d*\\s+sold/i, /\\d+%\\s+Funded/i, /^Sold\\s+Out$/i];
+    for (const p of document.querySelectorAll('p')) {
+        if (!isVisible(p)) continue;
+        const t = (p.innerText || '').trim();
+        if (patterns.some((pattern) => pattern.test(t))) { visibleSalesText = t; break; }
+    }
+
+    // "Total Price: $xx.xx" 텍스트를 포함하는 요소
+    let totalPriceText = null;
+    const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        if (/Total Price: \\$[0-9,.]+/i.test(walker.currentNode.textContent)) {
+            totalPriceText = text(walker.currentNode.parentElement);
+            break;
+        }
+    }
+
+    const ipLinkEl = q('[class*="CreatorMessage__CreatorMessageWrapper"] a');
+    return {
+        title: textOf('[class*="ProductDetails__ProductTitle"]'),
+        ipName: text(firstWithText('a', 'By:')),
+        category: text(categoryEl),
+        endDatePrimary: textOf(`${root} > div:nth-child(3) > div > p`),
+        endDateCountdown: textOf('[class*="ProductPageCountdown__CountdownDate"]'),
+        salesCandidates,
+        fundedCandidates,
+        visibleSalesText,
+        shippingPrimary: textOf(`${root} > div.ProductInfo__PostPurchaseDetailsWrapper-sc-pdgh6r-9.jthCJt > div > div > p`),
+        shippingHybrid: textOf(`${root} > div.commonFunctions__HybridMessagingContainer-sc-e97hvy-8.gpFhIO`),
+        shippingGeneral: text(firstWithText('p', 'Ships ') || firstWithText('p', 'estimated to ship on')),
+        ipLink: ipLinkEl ? ipLinkEl.getAttribute('href') : null,
+        pricePrimary: textOf(`${root} > div.ProductInfo__ProductHeaderWrapper-sc-pdgh6r-2.jUpShe > div > div > p`),
+        priceGeneral: textOf('[class*="ProductInfo__Price"]'),
+        priceTotal: totalPriceText,
+    };
+}
+"""
+
+def build_product_data(url, raw):
+    """
+    EXTRACT_FIELDS_JS가 수집한 원본 텍스트(raw)로부터 제품 데이터를 구성합니다.
+    파싱 로직(process_sales_data, normalize_date, calculate_revenue)은 기존과 동일합니다.
+    """
     product_data = {
         "제품_URL": url,
         "진행_여부": "정보 없음",
@@ -210,51 +184,36 @@ async def extract_product_data(page, url):
         "프로젝트_종료일": "정보 없음",
         "배송_시작일": "정보 없음"
     }
-    
+
     # 제품명
-    try:
-        product_data["제품명"] = await page.locator('[class*="ProductDetails__ProductTitle"]').inner_text(timeout=3000)
-    except Exception as e:
-        product_data["제품명"] = "제품명을 찾을 수 없습니다."
+    product_data["제품명"] = raw.get("title") or "제품명을 찾을 수 없습니다."
 
-    # IP명
-    try:
-        # 'By:' 텍스트를 포함하는 링크를 찾아 IP 이름만 추출
-        ip_name_element = page.locator('a:has-text("By:")')
-        ip_name_text = await ip_name_element.inner_text(timeout=3000)
-        product_data["IP명"] = ip_name_text.replace('By: ', '').strip()
-    except Exception as e:
-        product_data["IP명"] = "IP명을 찾을 수 없습니다."
+    # IP명 ('By:' 텍스트를 포함하는 링크에서 IP 이름만 추출)
+    ip_name_text = raw.get("ipName")
+    product_data["IP명"] = ip_name_text.replace('By: ', '').strip() if ip_name_text else "IP명을 찾을 수 없습니다."
 
     # 제품군
-    try:
-        # 제품 헤더 안에서, /collections/ 또는 /shop/ URL을 포함하는 링크의 p 태그를 찾음
-        category_locator = page.locator('[class*="ProductInfo__ProductHeaderWrapper"] a[href*="/shop/"] p, [class*="ProductInfo__ProductHeaderWrapper"] a[href*="/collections/"] p, [class*="ProductInfo__ProductHeaderWrapper"] a:has-text("Store")')
-        if await category_locator.count() > 0:
-            category_text = await category_locator.first.inner_text(timeout=3000)
-            # "Visit Creator Store" 또는 "Visit Store" 같은 텍스트 제거
-            processed_category = re.sub(r'^Visit\s+.*\s+Store$', '', category_text, flags=re.IGNORECASE).strip()
-            if not processed_category:
-                # 만약 Visit Store 제거 후 빈 문자열이 되면, 링크의 텍스트 자체를 사용 (단어만)
-                link_text = await category_locator.first.inner_text(timeout=3000)
-                match = re.search(r'([A-Za-z]+)', link_text)
-                if match:
-                    processed_category = match.group(1).strip()
-                else:
-                    processed_category = "제품군을 찾을 수 없습니다."
-            product_data["제품군"] = processed_category
-    except Exception as e:
-        product_data["제품군"] = "제품군 추출 실패: " + str(e)
+    category_text = raw.get("category")
+    if category_text is not None:
+        # "Visit Creator Store" 또는 "Visit Store" 같은 텍스트 제거
+        processed_category = VISIT_STORE_PATTERN.sub('', category_text).strip()
+        if not processed_category:
+            # 만약 Visit Store 제거 후 빈 문자열이 되면, 링크의 텍스트 자체를 사용 (단어만)
+            match = FIRST_WORD_PATTERN.search(category_text)
+            if match:
+                processed_category = match.group(1).strip()
+            else:
+                processed_category = "제품군을 찾을 수 없습니다."
+        product_data["제품군"] = processed_category
 
     # 프로젝트 종료일 및 진행 여부
     try:
         end_date = "해당 없음"
         status = "종료"
-        
-        # 1. 사용자가 제공한 정확한 선택자 시도
-        primary_end_date_locator = page.locator('#__next > div._app__ContainerWrapper-sc-meusgd-0.fdDSJw > div > div._app__ContentWrapper-sc-meusgd-2.iURiPk > div > div > div.handle__ProductInfoWrapper-sc-1y81hk8-2.kYqEeP > div > div:nth-child(3) > div > p')
-        if await primary_end_date_locator.count() > 0:
-            end_date_text = await primary_end_date_locator.inner_text(timeout=3000)
+
+        # 1. 사용자가 제공한 정확한 선택자
+        end_date_text = raw.get("endDatePrimary")
+        if end_date_text is not None:
             if "ends on" in end_date_text.lower():
                 end_date = end_date_text.replace('Ends on ', '').strip()
                 status = "진행 중"
@@ -266,211 +225,126 @@ async def extract_product_data(page, url):
                 status = "진행 중"
             else:
                 end_date = end_date_text.strip()
-                if re.search(r'[A-Za-z]+\s+\d{1,2},\s+\d{4}', end_date):
+                if DATE_IN_TEXT_PATTERN.search(end_date):
                     status = "진행 중"
                 else:
                     status = "종료"
-        else:
-            status = "종료"
-        
-        # 2. 첫 번째 선택자가 실패했고, end_date가 아직 설정되지 않은 경우, 원래 사용하던 선택자 시도
-        #    (primary_end_date_locator가 아무것도 찾지 못했거나 오류 메시지를 반환한 경우)
-        if status == "종료" and end_date == "해당 없음": # 첫 번째 시도가 실패한 경우
-            fallback_end_date_locator = page.locator('[class*="ProductPageCountdown__CountdownDate"]')
-            if await fallback_end_date_locator.count() > 0:
-                end_date_text = await fallback_end_date_locator.inner_text(timeout=3000)
-                end_date = end_date_text.replace('Ends on ', '').strip()
+
+        # 2. 첫 번째 선택자가 실패한 경우, 원래 사용하던 카운트다운 선택자
+        if status == "종료" and end_date == "해당 없음":
+            countdown_text = raw.get("endDateCountdown")
+            if countdown_text is not None:
+                end_date = countdown_text.replace('Ends on ', '').strip()
                 status = "진행 중"
-            # 대체 선택자도 실패하면 최종적으로 "해당 없음" 유지
 
         product_data["프로젝트_종료일"] = normalize_date(end_date)
         product_data["진행_여부"] = status
     except Exception as e:
+        logger.warning(f"URL {url}에서 프로젝트 종료일/진행 여부 추출 실패: {e}")
         product_data["프로젝트_종료일"] = "프로젝트 종료일 정보를 찾을 수 없습니다."
         product_data["진행_여부"] = "상태 확인 중 오류"
 
     # 판매량 및 달성률
-    sales_volume_raw = "판매량 정보를 찾을 수 없습니다."
-    funded_rate_raw = "달성률 정보를 찾을 수 없습니다."
     try:
-        # --- 판매량 및 달성률 추출 ---
-        try:
-            sales_text_found = ""
-            funded_text_found = ""
-
-            # 1. 판매량 특정 선택자들 시도
-            sales_locators = [
-                ("#__next > div._app__ContainerWrapper-sc-meusgd-0.fdDSJw > div > div._app__ContentWrapper-sc-meusgd-2.iURiPk > div > div > div.handle__ProductInfoWrapper-sc-1y81hk8-2.kYqEeP > div > div:nth-child(3) > div > div.ProgressBarContainer__ProgressRow-sc-1slgn8k-2.cbQHDc > p", "판매량-ProgressRow"),
-                ("#__next > div._app__ContainerWrapper-sc-meusgd-0.fdDSJw > div > div._app__ContentWrapper-sc-meusgd-2.iURiPk > div > div > div.handle__ProductInfoWrapper-sc-1y81hk8-2.kYqEeP > div > div:nth-child(3) > div > div.ProgressBarContainer__PastLimitedCampaignRow-sc-1slgn8k-3.bLtdCY > p", "판매량-PastLimitedCampaignRow"),
-                ('p[data-testid="units-sold-text"]', "Units Sold Text"),
-                (r'p:has-text("Sold Out")', "Sold Out Text")
-            ]
-            for selector, name in sales_locators:
-                try:
-                    text_element = page.locator(selector)
-                    if await text_element.count() > 0:
-                        current_text = await text_element.first.inner_text(timeout=1000) # 짧은 타임아웃
-                        if current_text and current_text.strip():
-                            sales_text_found = current_text.strip()
-                            print(f"DEBUG: '{name}' 로케이터로 판매량 찾음 -> '{sales_text_found}'")
-                            break
-                except Exception:
-                    pass
-
-            # 2. 달성률 특정 선택자들 시도
-            funded_locators = [
-                ("#__next > div._app__ContainerWrapper-sc-meusgd-0.fdDSJw > div > div._app__ContentWrapper-sc-meusgd-2.iURiPk > div > div > div.handle__ProductInfoWrapper-sc-1y81hk8-2.kYqEeP > div > div:nth-child(3) > div > div.ProgressBarContainer__ProgressRow-sc-1slgn8k-2.cbQHDc > div > p", "달성률-ProgressRow-Funded"),
-                (r'p:has-text("% Funded")', "Funded Text"),
-            ]
-            for selector, name in funded_locators:
-                try:
-                    text_element = page.locator(selector)
-                    if await text_element.count() > 0:
-                        current_text = await text_element.first.inner_text(timeout=1000) # 짧은 타임아웃
-                        if current_text and current_text.strip():
-                            funded_text_found = current_text.strip()
-                            print(f"DEBUG: '{name}' 로케이터로 달성률 찾음 -> '{funded_text_found}'")
-                            break
-                except Exception:
-                    pass
-
-            # 3. JavaScript 폴백: 두 정보 모두 찾지 못했을 경우 전체 페이지에서 텍스트 기반 패턴 검색
-            if not sales_text_found and not funded_text_found:
-                print("DEBUG: 특정 선택자들 실패. JavaScript 폴백 실행.")
-                find_visible_sales_text_js = """
-                () => {
-                    const patterns = [
-                        /\\d+\\s+of\\s+\\d+\\s+sold/i,
-                        /\\d+,?\\d*\\s+sold/i,
-                        /\\d+%\\s+Funded/i,
-                        /^Sold\\s+Out$/i
-                    ];
-                    const paragraphs = document.querySelectorAll('p');
-                    for (const p of paragraphs) {
-                        const isVisible = !!(p.offsetWidth || p.offsetHeight || p.getClientRects().length);
-                        if (isVisible) {
-                            for (const pattern of patterns) {
-                                if (pattern.test(p.innerText.trim())) {
-                                    return p.innerText.trim();
-                                }
-                            }
-                        }
-                    }
-                    return null;
-                }
-                """
-                js_combined_text = await page.evaluate(find_visible_sales_text_js)
-                if js_combined_text:
-                    if re.search(r'\d+% Funded', js_combined_text, re.IGNORECASE):
-                        funded_text_found = js_combined_text
-                    else:
-                        sales_text_found = js_combined_text
-                    print(f"DEBUG: JavaScript 폴백으로 텍스트 찾음 -> '{js_combined_text}'")
-
-            sales_volume_raw = sales_text_found if sales_text_found else "판매량 정보를 찾을 수 없습니다."
-            funded_rate_raw = funded_text_found if funded_text_found else "달성률 정보를 찾을 수 없습니다."
-
-            sales_volume, funded_rate = process_sales_data(sales_volume_raw, funded_rate_raw)
-            print(f"판매량: {sales_volume}")
-            print(f"달성률: {funded_rate}")
-            product_data["판매량"] = sales_volume  # 처리된 판매량 저장
-            product_data["달성률"] = funded_rate  # 처리된 달성률 저장
+        sales_text_found = ""
+        funded_text_found = ""
 
-        except Exception as e:
-            print(f"URL {page.url}에서 판매량/달성률 추출 실패: {e}")
-            product_data["판매량"] = "판매량 정보를 찾을 수 없습니다."
-            product_data["달성률"] = "달성률 정보를 찾을 수 없습니다."
+        # 1. 판매량 후보를 우선순위 순서대로 확인
+        for name, current_text in raw.get("salesCandidates", []):
+            if current_text and current_text.strip():
+                sales_text_found = current_text.strip()
+                logger.debug(f"'{name}' 로케이터로 판매량 찾음 -> '{sales_text_found}'")
+                break
+
+        # 2. 달성률 후보를 우선순위 순서대로 확인
+        for name, current_text in raw.get("fundedCandidates", []):
+            if current_text and current_text.strip():
+                funded_text_found = current_text.strip()
+                logger.debug(f"'{name}' 로케이터로 달성률 찾음 -> '{funded_text_found}'")
+                break
+
+        # 3. JavaScript 폴백: 두 정보 모두 찾지 못했을 경우 화면에 보이는 텍스트 기반 패턴 검색 결과 사용
+        if not sales_text_found and not funded_text_found:
+            js_combined_text = raw.get("visibleSalesText")
+            if js_combined_text:
+                if FUNDED_TEXT_PATTERN.search(js_combined_text):
+                    funded_text_found = js_combined_text
+                else:
+                    sales_text_found = js_combined_text
+                logger.debug(f"JavaScript 폴백으로 텍스트 찾음 -> '{js_combined_text}'")
+
+        sales_volume_raw = sales_text_found if sales_text_found else "판매량 정보를 찾을 수 없습니다."
+        funded_rate_raw = funded_text_found if funded_text_found else "달성률 정보를 찾을 수 없습니다."
+
+        sales_volume, funded_rate = process_sales_data(sales_volume_raw, funded_rate_raw)
+        logger.debug(f"판매량: {sales_volume}, 달성률: {funded_rate}")
+        product_data["판매량"] = sales_volume  # 처리된 판매량 저장
+        product_data["달성률"] = funded_rate  # 처리된 달성률 저장
     except Exception as e:
-        print(f"[상위 try-except] URL {page.url}에서 판매량/달성률 추출 중 치명적인 오류 발생: {e}")
+        logger.warning(f"URL {url}에서 판매량/달성률 추출 실패: {e}")
         product_data["판매량"] = "판매량 정보를 찾을 수 없습니다."
         product_data["달성률"] = "달성률 정보를 찾을 수 없습니다."
-    
+
     # 배송 시작일
     try:
         shipping_date = "배송 시작일 정보를 찾을 수 없습니다."
-        
-        # 1. 사용자께서 존재한다고 말씀해주신 선택자 먼저 시도
-        primary_shipping_date_locator = page.locator('#__next > div._app__ContainerWrapper-sc-meusgd-0.fdDSJw > div > div._app__ContentWrapper-sc-meusgd-2.iURiPk > div > div > div.handle__ProductInfoWrapper-sc-1y81hk8-2.kYqEeP > div > div.ProductInfo__PostPurchaseDetailsWrapper-sc-pdgh6r-9.jthCJt > div > div > p')
-        if await primary_shipping_date_locator.count() > 0:
-            shipping_date_text = await primary_shipping_date_locator.inner_text(timeout=3000)
-            shipping_date = shipping_date_text.replace('Ships ', '').strip()
-        
-        # 2. 첫 번째 선택자가 실패했을 경우 (아직 기본값인 경우), '초록색 선택자' 시도
-        if shipping_date == "배송 시작일 정보를 찾을 수 없습니다.":
-            fallback_shipping_date_locator = page.locator('#__next > div._app__ContainerWrapper-sc-meusgd-0.fdDSJw > div > div._app__ContentWrapper-sc-meusgd-2.iURiPk > div > div > div.handle__ProductInfoWrapper-sc-1y81hk8-2.kYqEeP > div > div.commonFunctions__HybridMessagingContainer-sc-e97hvy-8.gpFhIO')
-            if await fallback_shipping_date_locator.count() > 0:
-                shipping_date_text = await fallback_shipping_date_locator.inner_text(timeout=3000)
+
+        # 1. 사용자께서 존재한다고 말씀해주신 선택자, 2. '초록색 선택자' 순서로 시도
+        for shipping_date_text in (raw.get("shippingPrimary"), raw.get("shippingHybrid")):
+            if shipping_date_text is not None:
                 shipping_date = shipping_date_text.replace('Ships ', '').strip()
-        
-        # 3. 새로운 일반적인 선택자 추가 (배송 관련 텍스트 검색)
+                break
+
+        # 3. 일반적인 선택자 (배송 관련 텍스트 검색)
         if shipping_date == "배송 시작일 정보를 찾을 수 없습니다.":
-            general_shipping_locator = page.locator(r'p:has-text("Ships "), p:has-text("estimated to ship on")')
-            if await general_shipping_locator.count() > 0:
-                shipping_text = await general_shipping_locator.first.inner_text(timeout=3000)
+            shipping_text = raw.get("shippingGeneral")
+            if shipping_text is not None:
                 # "Ships Month Day, Year." 또는 "estimated to ship on Month Day, Year."에서 날짜 추출
-                date_match = re.search(r'([A-Za-z]+\s+\d{1,2},\s+\d{4})', shipping_text)
+                date_match = DATE_IN_TEXT_PATTERN.search(shipping_text)
                 if date_match:
                     shipping_date = date_match.group(0).strip()
                 else:
                     shipping_date = shipping_text.replace('Ships ', '').strip() # 남은 부분에서 최대한 정보 추출
 
         product_data["배송_시작일"] = normalize_date(shipping_date)
-        print(f"배송 시작일: {product_data['배송_시작일']}")
+        logger.debug(f"배송 시작일: {product_data['배송_시작일']}")
     except Exception as e:
-        print(f"배송 시작일 추출 실패: {e}")
+        logger.warning(f"배송 시작일 추출 실패: {e}")
 
-    # IP 소개 링크
-    try:
-        # 여러 링크가 있을 수 있으므로 첫 번째 링크를 선택
-        ip_link_elements = page.locator('[class*="CreatorMessage__CreatorMessageWrapper"] a')
-        if await ip_link_elements.count() > 0:
-            extracted_link = await ip_link_elements.first.get_attribute('href', timeout=3000)
-            if extracted_link and extracted_link.startswith('/'):
-                product_data["IP_소개_링크"] = f"https://www.makeship.com{extracted_link}"
-            else:
-                product_data["IP_소개_링크"] = extracted_link
-        # else 블록은 필요 없음 (초기값이 '찾을 수 없음'이므로)
-    except Exception as e:
-        product_data["IP_소개_링크"] = "IP 소개 링크 추출 실패: " + str(e)
+    # IP 소개 링크 (첫 번째 링크)
+    extracted_link = raw.get("ipLink")
+    if extracted_link:
+        if extracted_link.startswith('/'):
+            product_data["IP_소개_링크"] = f"https://www.makeship.com{extracted_link}"
+        else:
+            product_data["IP_소개_링크"] = extracted_link
 
     # 제품 가격
     product_price = "가격을 찾을 수 없습니다."
     try:
-        # 1. 사용자께서 제공하신 정확한 선택자 시도 (최우선)
-        primary_price_locator = page.locator('#__next > div._app__ContainerWrapper-sc-meusgd-0.fdDSJw > div > div._app__ContentWrapper-sc-meusgd-2.iURiPk > div > div > div.handle__ProductInfoWrapper-sc-1y81hk8-2.kYqEeP > div > div.ProductInfo__ProductHeaderWrapper-sc-pdgh6r-2.jUpShe > div > div > p')
-        if await primary_price_locator.count() > 0:
-            price_text = await primary_price_locator.first.inner_text(timeout=3000)
-            match = re.search(r'\$?(\d+\.?\d*)', price_text)
+        # 1. 사용자께서 제공하신 정확한 선택자 (최우선), 2. 일반적인 가격 선택자 (폴백)
+        for source, price_text in (("primary", raw.get("pricePrimary")), ("general", raw.get("priceGeneral"))):
+            if price_text is None:
+                continue
+            match = DOLLAR_PRICE_PATTERN.search(price_text)
             if match:
                 extracted_price = match.group(1).strip()
                 # $0.00이 아니고 숫자로 변환 가능한 경우만 사용
                 if extracted_price and float(extracted_price) > 0:
                     product_price = extracted_price
-                    print(f"DEBUG 가격 추출 (primary): ${product_price}")
-        
-        # 2. 일반적인 가격 선택자 시도 (폴백)
-        if product_price == "가격을 찾을 수 없습니다.":
-            general_price_locator = page.locator('[class*="ProductInfo__Price"]')
-            if await general_price_locator.count() > 0:
-                price_text = await general_price_locator.first.inner_text(timeout=3000)
-                match = re.search(r'\$?(\d+\.?\d*)', price_text)
-                if match:
-                    extracted_price = match.group(1).strip()
-                    if extracted_price and float(extracted_price) > 0:
-                        product_price = extracted_price
-                        print(f"DEBUG 가격 추출 (general): ${product_price}")
+                    logger.debug(f"가격 추출 ({source}): ${product_price}")
+                    break
 
-        # 3. "Total Price:" 텍스트를 포함하는 요소 찾기 (폴백)
+        # 3. "Total Price:" 텍스트를 포함하는 요소 (폴백)
         if product_price == "가격을 찾을 수 없습니다.":
-            fallback_price_locator_text = page.locator(r'text=/Total Price: \$[0-9,.]+/i')
-            if await fallback_price_locator_text.count() > 0:
-                price_text = await fallback_price_locator_text.inner_text(timeout=3000)
-                match = re.search(r'\$[0-9,.]+', price_text)
+            price_text = raw.get("priceTotal")
+            if price_text is not None:
+                match = TOTAL_PRICE_PATTERN.search(price_text)
                 if match:
                     extracted_price = match.group(0).replace('$', '').strip()
                     if extracted_price and float(extracted_price) > 0:
                         product_price = extracted_price
-                        print(f"DEBUG 가격 추출 (Total Price): ${product_price}")
+                        logger.debug(f"가격 추출 (Total Price): ${product_price}")
     except Exception as e:
         product_price = "제품 가격 추출 실패: " + str(e)
 
@@ -479,18 +353,56 @@ async def extract_product_data(page, url):
         price_float = float(product_price) if product_price != "가격을 찾을 수 없습니다." else 0.0
     except:
         price_float = 0.0
-    
+
     if product_price == "가격을 찾을 수 없습니다." or price_float == 0.0:
         estimated_price = get_category_price(product_data["제품군"])
         product_price = f"{estimated_price:.2f}" # 소수점 둘째 자리까지 표시
-        print(f"경고: 제품 가격을 찾을 수 없어 제품군 '{product_data['제품군']}'의 추정 가격 ${product_price}로 대체했습니다.")
-    
+        logger.warning(f"경고: 제품 가격을 찾을 수 없어 제품군 '{product_data['제품군']}'의 추정 가격 ${product_price}로 대체했습니다.")
+
     product_data["제품_가격"] = product_price
 
     # 매출 계산 (실제 크롤링한 가격 우선, 없으면 제품군별 하드코딩 가격 사용)
     product_data["매출"] = calculate_revenue(product_data["판매량"], product_data["제품군"], product_data["제품_가격"])
-    
-    print(f"URL: {url} 데이터 추출 완료.") # 디버그 로그 추가
+    return product_data
+
+async def extract_product_data(page, url, snapshot_store=None, proxy=None):
+    """단일 제품 페이지에서 데이터를 추출하는 함수"""
+    logger.debug(f"URL: {url} 페이지 로드 시도 중...")
+    try:
+        # 페이지 로딩 전략 변경 및 명시적 대기 추가
+        with metrics.timer(STAGE_GOTO, proxy):
+            response = await page.goto(site_url(url), wait_until='commit', timeout=30000) # 페이지 로딩 전략을 'commit'으로 변경 (최소 대기)
+        if response and response.status in BLOCK_STATUS_CODES:
+            raise ScrapeError(ERROR_BLOCK, f"HTTP {response.status} 응답 (차단 의심): {url}")
+        logger.debug(f"URL: {url} 페이지 로드 완료. 제품 타이틀 셀렉터 대기 중...")
+        try:
+            with metrics.timer(STAGE_WAIT_TITLE, proxy):
+                await page.wait_for_selector('[class*="ProductDetails__ProductTitle"]', timeout=30000)
+        except TimeoutError:
+            # 타이틀이 없으면 차단/봇 확인 페이지인지, 아직 로딩 중인지 확인하여 오류 유형을 구분
+            state = await page.evaluate("() => ({ready: document.readyState, text: document.title + ' ' + (document.body ? document.body.innerText.slice(0, 2000) : '')})")
+            if is_block_text(state['text']):
+                raise ScrapeError(ERROR_BLOCK, f"차단 페이지 감지: {url}")
+            if state['ready'] != 'complete':
+                raise
+            raise ScrapeError(ERROR_MISSING_TITLE, f"제품 타이틀을 찾을 수 없습니다: {url}")
+        # 고정 2초 대기 대신, 대상 필드가 모두 나타나거나 DOM 변경이 멈출 때까지 대기
+        with metrics.timer(STAGE_WAIT_READY, proxy):
+            readiness = await wait_for_product_ready(page, quiet_ms=READY_QUIET_MS, max_wait_ms=READY_MAX_WAIT_MS, stats=readiness_stats)
+        logger.debug(f"URL: {url} 준비 완료 ({readiness['사유']}, {readiness['대기_ms']:.0f}ms)")
+    except TimeoutError as e:
+        raise ScrapeError(ERROR_TIMEOUT, f"페이지 로드 시간 초과: {url}") from e
+
+    # --- 데이터 추출 (단일 page.evaluate 호출) ---
+    with metrics.timer(STAGE_EXTRACT, proxy):
+        raw = await page.evaluate(EXTRACT_FIELDS_JS, PRODUCT_INFO_ROOT)
+    with metrics.timer(STAGE_POST_PROCESS):
+        product_data = build_product_data(url, raw)
+    if snapshot_store:
+        html = await page.content() if SNAPSHOT_SAVE_HTML else None
+        await asyncio.to_thread(snapshot_store.put, url, raw, html, "playwright")
+
+    logger.debug(f"URL: {url} 데이터 추출 완료.")
     return product_data
 
 def load_proxies_from_file(filename="proxy.txt"):
@@ -539,142 +451,616 @@ def load_urls_from_file():
         return []
     return urls
 
-async def process_url(browser, url, proxy, semaphore, all_products_data, is_rescrape=False):
-    async with semaphore:
-        # is_rescrape 여부와 관계없이, process_url은 항상 스크래핑을 시도합니다.
-        # 건너뛰기 로직은 main 함수에서 이미 처리된 URL을 tasks에 추가하지 않는 방식으로 처리됩니다.
+def report_stealth_overhead(url_count):
+    """
+    stealth 준비/적용에 쓴 시간을 실행 전체와 URL당 평균으로 지표에 기록하고 출력합니다.
+    (stealth_startup_seconds / stealth_per_url_seconds를 변경 전후 실행의 지표 파일에서 비교)
+    """
+    prepare = sum(metrics.stage_samples.get(STAGE_STEALTH_PREPARE, []))
+    per_context = metrics.stage_samples.get(STAGE_STEALTH, [])
+    total = prepare + sum(per_context)
+    per_url_ms = total / url_count * 1000 if url_count else 0
+    metrics.set_value("stealth_startup_seconds", prepare)
+    metrics.set_value("stealth_context_seconds", sum(per_context))
+    metrics.set_value("stealth_per_url_seconds", per_url_ms / 1000)
+    print(f"stealth: 스크립트 생성 {prepare * 1000:.1f}ms, 컨텍스트 {len(per_context)}개에 등록 {sum(per_context) * 1000:.1f}ms "
+          f"(URL당 {per_url_ms:.2f}ms)")
+
+def make_context_setup(resource_policy):
+    """컨텍스트 생성 시 stealth와 리소스 차단 정책을 함께 적용하는 콜백을 만듭니다."""
+    async def setup_context(context):
+        await apply_stealth(context, metrics)
+        await resource_policy.attach(context)
+    return setup_context
 
-        context = None
+async def fetch_product_data_http(http_fetcher, url, proxy, snapshot_store=None):
+    """__NEXT_DATA__ JSON만으로 제품 데이터를 구성합니다. 필수 필드가 빠져 있으면 None을 반환합니다."""
+    with metrics.timer(STAGE_HTTP_FETCH, proxy):
+        raw, missing = await http_fetcher.fetch_raw(site_url(url), proxy)
+    product_data = None
+    if missing:
+        logger.info(f"URL: {url} __NEXT_DATA__ 누락 필드 {missing} → Playwright 폴백")
+    else:
         try:
-            context = await browser.new_context(proxy={"server": f"http://{proxy}"}) # 컨텍스트 생성 및 프록시 적용
-            page = await context.new_page()
-            
-            # Stealth 적용 (최신 방식)
-            stealth_instance = Stealth() # Stealth 클래스 인스턴스 생성
-            await stealth_instance.apply_stealth_async(context) # context에 비동기 stealth 적용
-
-            product_data = await extract_product_data(page, url)
-            if product_data:
-                all_products_data[url] = product_data # 딕셔너리에 추가 또는 업데이트
-                # 개별 제품 정보 출력 (JSON 형식으로)
-                print(f"\n{'='*80}")
-                print(f"✅ [{product_data['진행_여부']}] {product_data['제품명']}")
-                print(f"{'='*80}")
-                print(json.dumps(product_data, ensure_ascii=False, indent=2))
-                print(f"{'='*80}\n")
-                return product_data
-            else:
-                print(f"❌ 제품 데이터 추출 실패: {url}")
-                return None
+            with metrics.timer(STAGE_POST_PROCESS):
+                product_data = build_product_data(url, raw)
         except Exception as e:
-            print(f"URL {url} 처리 중 예외 발생: {e}")
-            return None
-        finally:
-            if context:
-                await context.close()
+            # __NEXT_DATA__ 값의 형식이 예상과 달라 후처리에 실패하면 브라우저 경로로 다시 수집
+            logger.warning(f"URL: {url} __NEXT_DATA__ 후처리 실패 ({e!r}) → Playwright 폴백")
+    http_fetcher.record_result(product_data is not None)
+    if product_data is None:
+        return None
+    if snapshot_store:
+        await asyncio.to_thread(snapshot_store.put, url, raw, None, "next_data")
+    return product_data
+
+async def process_url(context_pool, url, proxy, is_rescrape=False, http_fetcher=None, checkpoint=None, snapshot_store=None):
+    # is_rescrape 여부와 관계없이, process_url은 항상 스크래핑을 시도합니다.
+    # 건너뛰기 로직은 main 함수에서 이미 처리된 URL을 작업 큐에 넣지 않는 방식으로 처리됩니다.
+    # 반환값: (제품 데이터, None) 또는 실패 시 (None, 유형이 분류된 ScrapeError)
+
+    entry = page = None
+    failed = False
+    try:
+        # 1. 브라우저 없이 HTTP 요청 한 번으로 __NEXT_DATA__ 파싱 시도
+        product_data = None
+        if http_fetcher:
+            try:
+                product_data = await fetch_product_data_http(http_fetcher, url, proxy, snapshot_store)
+            except Exception as e:
+                # HTTP 경로의 어떤 오류도 URL 실패로 처리하지 않고 브라우저로 다시 수집
+                logger.warning(f"URL: {url} HTTP 수집 오류 ({e!r}) → Playwright 폴백")
+                product_data = None
+
+        # 2. JSON에 필드가 빠져 있으면 프록시별로 워밍된 컨텍스트(stealth 적용 완료)의 페이지로 폴백
+        if product_data is None:
+            with metrics.timer(STAGE_CONTEXT_ACQUIRE, proxy):
+                entry, page = await context_pool.acquire(proxy)
+            product_data = await extract_product_data(page, url, snapshot_store, proxy)
+
+        if product_data:
+            if checkpoint:
+                checkpoint.write(product_data) # 완료 즉시 체크포인트 로그에 기록 (메모리에 쌓지 않음)
+            # 제품 데이터는 extra로 넘겨 JSON 직렬화를 로깅 스레드에서 처리 (json 형식/DEBUG 레벨에서 한 줄로 출력)
+            logger.info(f"✅ [{product_data['진행_여부']}] {product_data['제품명']}", extra={"제품": product_data})
+            return product_data, None
+        else:
+            failed = True # 로드 실패한 컨텍스트는 교체
+            logger.warning(f"❌ 제품 데이터 추출 실패: {url}")
+            return None, ScrapeError(ERROR_OTHER, f"제품 데이터 추출 실패: {url}")
+    except Exception as e:
+        failed = True
+        kind = classify_error(e)
+        logger.warning(f"❌ 제품 데이터 추출 실패 ({kind}): {url} - {e}", extra={"오류_유형": kind, "제품_URL": url})
+        return None, e if isinstance(e, ScrapeError) else ScrapeError(kind, str(e))
+    finally:
+        if entry:
+            await context_pool.release(proxy, entry, page, failed=failed)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Makeship 제품 상세 정보 스크래퍼")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="URL을 나누어 처리할 프로세스 수 (프로세스마다 브라우저 1개, 기본값 1)")
+    parser.add_argument("--ignore-schedule", action="store_true",
+                        help="재수집 일정을 무시하고 모든 URL을 다시 스크래핑")
+    parser.add_argument("--retry-dead-letters", action="store_true",
+                        help="URL 파일 대신 데드레터 파일에 기록된 실패 URL만 다시 처리")
+    parser.add_argument("--snapshot", action="store_true",
+                        help=f"추출한 원본 필드를 '{SNAPSHOT_DIR}' 폴더에 압축 저장")
+    parser.add_argument("--replay-snapshots", action="store_true",
+                        help="사이트에 접속하지 않고 저장된 스냅샷을 현재 파싱 로직으로 다시 처리")
+    parser.add_argument("--discover", action="store_true",
+                        help="URL 파일 대신 카테고리 목록 페이지를 같은 브라우저에서 스크롤하며, 발견한 URL을 바로 스크래핑")
+    parser.add_argument("--export-json", action="store_true", default=EXPORT_JSON_AFTER_RUN,
+                        help="실행이 끝난 뒤 제품 DB 전체를 makeship_all_products_<ts>.json으로도 내보냄")
+    parser.add_argument("--quiet", action="store_true",
+                        help="제품별 진행 로그를 생략하고 경고/오류만 출력 (처리량 우선)")
+    parser.add_argument("--log-format", choices=LOG_FORMATS, default=LOG_FORMAT_TEXT,
+                        help="로그 형식 (json: 로그 수집기용 한 줄 JSON, 제품 데이터 포함)")
+    parser.add_argument("--log-level", default="INFO", choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+                        help="로그 레벨 (DEBUG이면 단계별 디버그 로그와 제품 데이터까지 출력)")
+    return parser.parse_args()
 
-async def main():
-    urls = load_urls_from_file()
-    if not urls:
+def load_previous_products():
+    """
+    제품 DB에서 URL별 제품 데이터와 "Sold Out" 제품 URL 목록을 반환합니다.
+    예전 실행이 남긴 makeship_all_products_*.json은 처음 한 번만 DB로 가져옵니다.
+    """
+    print("이전에 처리된 제품 데이터 로드 중...")
+    with ProductStore(PRODUCT_DB_FILE) as store:
+        store.import_legacy_json()
+        return store.load_products(), store.sold_out_urls()
+
+def save_to_store(records, source, scraped_at=None, export_json=EXPORT_JSON_AFTER_RUN):
+    """
+    수집한 레코드를 DB에 upsert하고 export_json이면 전체 제품을 JSON으로 내보냅니다. 내보낸 파일명을 반환합니다.
+    scraped_at(datetime 또는 제품_URL -> datetime)은 레코드의 수집 시각으로 기록됩니다. (기본: 현재 시각)
+    """
+    if isinstance(scraped_at, dict):
+        groups = {}
+        for record in records:
+            groups.setdefault(scraped_at[record["제품_URL"]], []).append(record)
+    else:
+        groups = {scraped_at: records}
+    with ProductStore(PRODUCT_DB_FILE) as store:
+        run_id = store.begin_run(source)
+        for group_scraped_at, group in groups.items():
+            store.upsert_many(group, run_id, group_scraped_at)
+        store.finish_run(run_id, len(records))
+        print(f"제품 DB '{PRODUCT_DB_FILE}'에 {len(records)}개 제품을 반영했습니다. (전체 {store.count()}개)")
+        return store.export_json() if export_json else None
+
+def replay_snapshots(export_json=EXPORT_JSON_AFTER_RUN):
+    """
+    저장된 스냅샷(URL별 최신 원본 필드)을 현재의 build_product_data로 다시 처리합니다. (네트워크 사용 없음)
+    process_sales_data / normalize_date / calculate_revenue 수정 사항을 재수집 없이 반영할 때 사용합니다.
+    """
+    started = time.monotonic()
+    store = SnapshotStore(SNAPSHOT_DIR)
+    all_products_data, _ = load_previous_products()
+    with ProductStore(PRODUCT_DB_FILE) as product_store:
+        updated_times = product_store.updated_times()
+    replayed = {}
+    fetched_times = {}
+    skipped = 0
+    for entry, raw in store.iter_latest():
+        url = entry["제품_URL"]
+        if url in updated_times and entry["수집_시간"] < updated_times[url]:
+            skipped += 1 # DB 레코드가 스냅샷 이후에 (스냅샷 없이) 다시 수집된 경우: 오래된 데이터로 덮어쓰지 않음
+            continue
+        replayed[url] = build_product_data(url, raw)
+        fetched_times[url] = datetime.strptime(entry["수집_시간"], SNAPSHOT_TIME_FORMAT)
+    if not replayed and not skipped:
+        print(f"'{SNAPSHOT_DIR}' 폴더에 스냅샷이 없습니다.")
+        return
+
+    changed = [product for url, product in replayed.items() if all_products_data.get(url) != product]
+    # DB의 수집 시각은 스냅샷 시각으로 유지 (재처리를 반복해도 같은 스냅샷이 다시 적용되도록)
+    filename = save_to_store(changed, "replay", fetched_times, export_json)
+    print(f"\n=== 스냅샷 재처리 완료 ({time.monotonic() - started:.1f}초) ===")
+    print(f"스냅샷 {len(replayed)}개 재처리, 그 중 {len(changed)}개 제품 데이터 변경")
+    if skipped:
+        print(f"DB 레코드보다 오래된 스냅샷 {skipped}개는 건너뛰었습니다.")
+    if filename:
+        print(f"전체 제품 데이터가 '{filename}' 파일로 저장되었습니다.")
+
+async def main(args):
+    if args.replay_snapshots:
+        replay_snapshots(args.export_json)
+        return
+    # DB에 기록하는 수집 시각 (이번 실행의 스냅샷보다 늦지 않도록 시작 시각 사용 → --replay-snapshots 비교 기준)
+    run_started = datetime.now()
+
+    if args.retry_dead_letters:
+        # 이전 실행에서 재시도 한도를 넘긴 URL만 다시 처리 (전체 재실행 없이 빈 곳만 채움)
+        dead_letter_files = existing_dead_letter_files()
+        dead_letters = {}
+        for dead_letter_file in dead_letter_files:
+            dead_letters.update(load_checkpoint(dead_letter_file))
+        if not dead_letters:
+            print("재시도할 데드레터가 없으므로 스크립트를 종료합니다.")
+            return
+        urls = list(dead_letters)
+        print(f"데드레터 {len(dead_letter_files)}개 파일에서 {len(urls)}개 URL을 다시 처리합니다.")
+    elif args.discover:
+        if args.shards > 1:
+            print("--discover는 --shards와 함께 사용할 수 없습니다. (목록 수집과 스크래핑이 한 이벤트 루프를 공유)")
+            return
+        urls = [] # 목록 페이지에서 발견하는 대로 작업 큐에 추가
+        print(f"--discover: 카테고리 {len(CATEGORY_CONFIGS)}개의 목록 수집과 스크래핑을 동시에 진행합니다.")
+    else:
+        urls = load_urls_from_file()
+    if not urls and not args.discover:
         print("처리할 URL이 없으므로 스크립트를 종료합니다.")
         return
 
-    proxies = load_proxies_from_file()
+    if is_simulated():
+        # 로컬 시뮬레이터에는 프록시 없이 직접 연결
+        print(f"MAKESHIP_BASE_URL이 지정되어 '{site_url('/')}'에 프록시 없이 연결합니다.")
+        proxies = [None]
+    else:
+        proxies = load_proxies_from_file()
     if not proxies:
         print("로드된 프록시가 없습니다. 스크립트를 종료합니다.")
         return
 
     # 이전에 저장된 JSON 파일들을 로드하여 이미 처리된 URL 목록과 "Sold Out" 제품 목록을 가져옵니다.
-    print("이전에 처리된 제품 데이터 로드 중...")
-    all_products_data = {}
-    sold_out_urls_to_rescrape = set()
-    json_files = glob.glob('makeship_all_products_*.json')
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if "제품_목록" in data:
-                    for product in data["제품_목록"]:
-                        if "제품_URL" in product:
-                            url = product["제품_URL"]
-                            all_products_data[url] = product
-                            if product.get("판매량") == "Sold Out":
-                                sold_out_urls_to_rescrape.add(url)
-            print(f"'{json_file}'에서 {len(data.get("제품_목록", []))}개 제품 로드 완료.")
-        except Exception as e:
-            print(f"'{json_file}' 로드 중 오류 발생: {e}")
-
+    all_products_data, sold_out_urls_to_rescrape = load_previous_products()
     print(f"총 {len(all_products_data)}개의 URL이 이전에 처리되었으며, 그 중 {len(sold_out_urls_to_rescrape)}개가 'Sold Out' 제품입니다.")
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True) # 브라우저를 헤드리스 모드로 한 번만 실행 (속도 향상)
-        # 세마포어를 사용하여 동시 실행 브라우저 수 제한 (예: 10개로 증가)
-        semaphore = asyncio.Semaphore(10)
-        
-        # --- "Sold Out" 제품 우선 재스크래핑 ---
-        if sold_out_urls_to_rescrape:
-            print(f"\n=== 'Sold Out' 제품 {len(sold_out_urls_to_rescrape)}개 재스크래핑 시작 ===")
-            tasks = []
-            for i, url in enumerate(list(sold_out_urls_to_rescrape), 0):
-                proxy = proxies[i % len(proxies)]
-                tasks.append(process_url(browser, url, proxy, semaphore, all_products_data, is_rescrape=True))
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True) # 예외 발생 시에도 결과 반환
-            completed_sold_out_count = 0
-            for result in results:
-                if isinstance(result, Exception):
-                    print(f"❗️ 'Sold Out' 제품 처리 중 오류 발생: {result}")
-                elif result:
-                    all_products_data[result["제품_URL"]] = result
-                    completed_sold_out_count += 1
-
-            print(f"\n=== 'Sold Out' 제품 재스크래핑 완료. {completed_sold_out_count}/{len(sold_out_urls_to_rescrape)}개 처리. ===")
-
-        # --- 나머지 URL 및 신규 제품 스크래핑 (Sold Out 제외 모든 URL 대상) ---
-        print(f"\n=== 나머지 및 신규 제품 스크래핑 시작 (Sold Out 제외 총 {len(urls) - len(sold_out_urls_to_rescrape)}개 URL 대상) ===")
-        tasks = []
-        for i, url in enumerate(urls, 0):
-            # 이미 'Sold Out' 재스크래핑에서 처리된 URL은 건너뛰기
-            if url in sold_out_urls_to_rescrape:
-                continue
+    # 중단된 이전 실행의 체크포인트 로그(샤드별 로그 포함)가 있으면 이미 완료된 URL은 다시 스크래핑하지 않음
+    checkpoint_files = existing_checkpoint_files()
+    resumed_urls = set()
+    for checkpoint_file in checkpoint_files:
+        resumed_urls.update(load_checkpoint(checkpoint_file))
+    if resumed_urls:
+        print(f"체크포인트 {len(checkpoint_files)}개에서 {len(resumed_urls)}개 완료 제품을 발견했습니다. 이어서 진행합니다.")
+        sold_out_urls_to_rescrape -= resumed_urls
+        urls = [url for url in urls if url not in resumed_urls]
 
-            proxy = proxies[i % len(proxies)] # 라운드 로빈 방식으로 프록시 할당
-            tasks.append(process_url(browser, url, proxy, semaphore, all_products_data))
-        
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True) # 예외 발생 시에도 결과 반환
-            completed_other_count = 0
-            for result in results:
-                if isinstance(result, Exception):
-                    print(f"❗️ 일반 스크래핑 중 오류 발생: {result}")
-                elif result:
-                    all_products_data[result["제품_URL"]] = result
-                    completed_other_count += 1
-            print(f"\n=== 나머지 및 신규 제품 스크래핑 완료. {completed_other_count}/{len(tasks)}개 처리. ===")
-        else:
-            print("Sold Out 제품을 제외하고 추가로 스크래핑할 제품이 없습니다.")
-        
-        await browser.close() # 모든 작업 후 브라우저 종료
-    
-    # 모든 데이터를 하나의 JSON 파일로 저장
-    if all_products_data:
-        final_data = {
-            "추출_시간": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "총_제품_수": len(all_products_data),
-            "제품_목록": list(all_products_data.values())
-        }
-        
-        filename = f"makeship_all_products_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        
+    # 재수집 일정: 종료 후 확정된 제품은 건너뛰고, 진행 중 캠페인은 종료일에 가까울수록 자주 수집
+    scheduler = FreshnessScheduler.load()
+    if args.retry_dead_letters:
+        sold_out_urls_to_rescrape &= set(urls) # 데드레터 URL만 처리 (일정과 무관하게 모두 처리)
+    elif args.ignore_schedule:
+        print("--ignore-schedule: 재수집 일정을 무시하고 전체 URL을 처리합니다.")
+    elif args.discover:
+        print("재수집 일정은 목록에서 발견한 URL마다 적용합니다.")
+        sold_out_urls_to_rescrape = set(scheduler.filter_due(sorted(sold_out_urls_to_rescrape), all_products_data))
+    else:
+        counts = scheduler.summary(urls, all_products_data)
+        print(f"재수집 일정: 신규 {counts['신규']}개, 수집 예정 {counts['수집_예정']}개, "
+              f"대기 {counts['대기']}개, 고정(종료 확정) {counts['고정']}개")
+        urls = scheduler.filter_due(urls, all_products_data)
+        sold_out_urls_to_rescrape = set(scheduler.filter_due(sorted(sold_out_urls_to_rescrape), all_products_data))
+
+    batches = build_work_batches(urls, all_products_data, sold_out_urls_to_rescrape)
+    route_url = None
+    if args.discover:
+        route_url = make_url_router(all_products_data, sold_out_urls_to_rescrape, resumed_urls, scheduler,
+                                    args.ignore_schedule)
+    if args.shards > 1:
+        # 여러 프로세스로 나누어 실행 (프로세스마다 브라우저와 프록시 일부를 따로 사용)
+        await asyncio.to_thread(run_sharded, batches, proxies, args.shards, args.snapshot)
+    else:
+        checkpoint = CheckpointWriter(CHECKPOINT_FILE)
+        dead_letters = CheckpointWriter(DEAD_LETTER_FILE)
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(final_data, f, ensure_ascii=False, indent=2)
-            print(f"\n=== 완료 ===")
-            print(f"총 {len(all_products_data)}개 제품의 데이터가 '{filename}' 파일로 저장되었습니다.")
+            await run_scraping(batches, proxies, checkpoint, dead_letters, save_snapshots=args.snapshot,
+                               route_url=route_url)
+        finally:
+            checkpoint.close() # 중단(Ctrl-C 등) 시에도 대기 중인 레코드를 모두 기록
+            dead_letters.close()
+            print(f"체크포인트에 이번 실행에서 {checkpoint.written_count}개 제품을 기록했습니다.")
+
+    # 체크포인트 로그(들)의 레코드를 제품 DB에 반영 (compaction)
+    checkpoint_files = existing_checkpoint_files()
+    completed_records = []
+    for checkpoint_file in checkpoint_files:
+        completed_records.extend(load_checkpoint(checkpoint_file).values())
+    completed_urls = {record["제품_URL"] for record in completed_records}
+    if completed_records:
+        # 이번 실행에서 수집한 제품의 다음 수집 시각 갱신
+        scraped_at = datetime.now()
+        for record in completed_records:
+            scheduler.record_scraped(record, scraped_at)
+        scheduler.save()
+    dead_letter_files = existing_dead_letter_files()
+    if dead_letter_files:
+        # 이번 실행에서 성공한 URL은 데드레터에서 제거
+        remaining = prune_dead_letters(dead_letter_files, completed_urls)
+        print(f"데드레터에 {remaining}개 URL이 남아 있습니다. (--retry-dead-letters로 다시 처리)")
+    if completed_records:
+        try:
+            filename = save_to_store(completed_records, "retry_dead_letters" if args.retry_dead_letters else "scrape",
+                                     run_started, args.export_json)
+            for checkpoint_file in checkpoint_files:
+                os.remove(checkpoint_file) # DB 반영 후 로그 삭제 (다음 실행은 처음부터)
+            print("\n=== 완료 ===")
+            if filename:
+                print(f"전체 제품 데이터가 '{filename}' 파일로 저장되었습니다.")
         except Exception as e:
-            print(f"\nJSON 파일 저장 중 오류 발생: {e}")
+            print(f"\n제품 DB 저장 중 오류 발생: {e} (체크포인트 파일은 보존됩니다)")
     else:
         print("\n추출된 데이터가 없습니다.")
 
+def existing_checkpoint_files():
+    """단일 실행 로그와 샤드별 로그 중 현재 존재하는 체크포인트 파일 목록"""
+    return sorted(set(glob.glob(CHECKPOINT_FILE) + glob.glob(SHARD_CHECKPOINT_PATTERN.format(index='*'))))
+
+def existing_dead_letter_files():
+    """단일 실행과 샤드별 데드레터 파일 중 현재 존재하는 파일 목록"""
+    return sorted(set(glob.glob(DEAD_LETTER_FILE) + glob.glob(SHARD_DEAD_LETTER_PATTERN.format(index='*'))))
+
+def shard_of(url, shard_count):
+    """URL을 샤드 번호에 고정 배정합니다. (재시작해도 같은 샤드로 배정되도록 crc32 사용)"""
+    return zlib.crc32(url.encode('utf-8')) % shard_count
+
+def split_into_shards(batches, proxies, shard_count):
+    """작업 묶음과 프록시를 샤드별로 나눕니다. 프록시가 샤드 수보다 적으면 모든 샤드가 전체 프록시를 공유합니다."""
+    shards = []
+    for index in range(shard_count):
+        shard_batches = [
+            (priority, [url for url in batch_urls if shard_of(url, shard_count) == index], is_rescrape)
+            for priority, batch_urls, is_rescrape in batches
+        ]
+        shard_proxies = proxies[index::shard_count] if len(proxies) >= shard_count else list(proxies)
+        shards.append((shard_batches, shard_proxies))
+    return shards
+
+def run_shard(shard_index, shard_count, batches, proxies, save_snapshots=False, log_settings=None):
+    """샤드 프로세스의 진입점. 자체 이벤트 루프와 브라우저로 배정된 URL을 처리합니다."""
+    setup_logging(**(log_settings or {})) # spawn으로 시작한 프로세스이므로 로깅을 다시 설정
+    checkpoint = CheckpointWriter(SHARD_CHECKPOINT_PATTERN.format(index=shard_index))
+    dead_letters = CheckpointWriter(SHARD_DEAD_LETTER_PATTERN.format(index=shard_index))
+    try:
+        asyncio.run(run_scraping(batches, proxies, checkpoint, dead_letters, shard_count=shard_count,
+                                 save_snapshots=save_snapshots, shard_index=shard_index))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        checkpoint.close()
+        dead_letters.close()
+        shutdown_logging()
+        print(f"[샤드 {shard_index}] 체크포인트에 {checkpoint.written_count}개 제품을 기록했습니다.")
+
+def run_sharded(batches, proxies, shard_count, save_snapshots=False):
+    """URL을 shard_count개의 프로세스로 나누어 동시에 스크래핑하고 모두 끝날 때까지 기다립니다."""
+    mp_context = multiprocessing.get_context("spawn") # 스레드(체크포인트 기록기)와 이벤트 루프가 있으므로 fork 대신 spawn
+    processes = []
+    for index, (shard_batches, shard_proxies) in enumerate(split_into_shards(batches, proxies, shard_count)):
+        url_count = sum(len(batch_urls) for _, batch_urls, _ in shard_batches)
+        print(f"[샤드 {index}] URL {url_count}개, 프록시 {len(shard_proxies)}개")
+        process = mp_context.Process(target=run_shard, args=(index, shard_count, shard_batches, shard_proxies, save_snapshots, current_settings()), name=f"shard-{index}")
+        process.start()
+        processes.append(process)
+    for process in processes:
+        process.join()
+        if process.exitcode != 0:
+            print(f"❗️ {process.name} 비정상 종료 (exit code {process.exitcode}) - 완료된 레코드는 체크포인트에 남아 있습니다.")
+
+def write_metrics(shard_index=None):
+    """지표를 Prometheus textfile과 JSON 요약으로 저장합니다. 샤드 모드에서는 샤드별 파일로 저장합니다."""
+    suffix = f".shard{shard_index}" if shard_index is not None else ""
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    try:
+        prom_file = metrics.write_prometheus(METRICS_PROM_FILE.replace(".prom", f"{suffix}.prom"))
+        json_file = metrics.write_json(METRICS_JSON_PATTERN.format(timestamp=timestamp + suffix))
+        print(f"지표가 '{prom_file}', '{json_file}' 파일로 저장되었습니다.")
+    except OSError as e:
+        print(f"지표 저장 중 오류 발생: {e}")
+
+# 작업 큐 항목의 순번 (같은 우선순위 안에서는 넣은 순서대로 처리, 재시도 항목도 같은 순번을 사용)
+work_sequence = itertools.count()
+
+async def produce_work(work_queue, batches, worker_count, discovery_task=None):
+    """
+    (우선순위, URL 목록, 재스크래핑 여부) 묶음을 순서대로 작업 큐에 넣습니다.
+    큐 크기가 제한되어 있으므로 작업자가 처리하는 속도에 맞춰 조금씩 채워집니다.
+    discovery_task(목록 수집)가 있으면 그 작업이 URL을 모두 넣을 때까지 종료 신호를 보내지 않습니다.
+    작업 큐 항목: (우선순위, 순번, URL, 재스크래핑 여부, 시도 횟수, 실패한 프록시 목록)
+    """
+    for priority, batch_urls, is_rescrape in batches:
+        for url in batch_urls:
+            await work_queue.put((priority, next(work_sequence), url, is_rescrape, 1, ()))
+    if discovery_task:
+        await discovery_task
+    # 재시도 대기 중인 항목까지 모두 끝난 뒤 작업자 수만큼 종료 신호 전달
+    await work_queue.join()
+    for _ in range(worker_count):
+        await work_queue.put((PRIORITY_STOP, next(work_sequence), None, False, 0, ()))
+
+async def requeue_later(work_queue, delay, item):
+    """delay초 후 실패한 항목을 작업 큐에 다시 넣습니다. 원래 항목의 task_done()은 다시 넣은 뒤에 호출합니다."""
+    try:
+        await asyncio.sleep(delay)
+        await work_queue.put(item)
+    finally:
+        work_queue.task_done()
+
+def record_outcome_metrics(result, error):
+    """처리 결과를 지표 카운터에 반영합니다. (성공/오류 유형별, Sold Out, 누락 필드)"""
+    if not result:
+        metrics.count(error.kind)
+        return
+    metrics.count("success")
+    if result.get("판매량") == "Sold Out":
+        metrics.count("sold_out")
+    missing = [key for key, value in result.items() if isinstance(value, str) and "찾을 수 없습니다" in value]
+    for key in missing:
+        metrics.count_missing_field(key)
+    if missing:
+        metrics.count("missing_field")
+
+def new_worker_stats():
+    return {"완료": 0, "실패": 0, "재시도": 0}
+
+async def scrape_worker(work_queue, controller, context_pool, proxy_manager, http_fetcher, checkpoint, dead_letters, retry_tasks, stats,
+                        snapshot_store=None):
+    """
+    작업 큐에서 URL을 하나씩 꺼내 처리하는 작업자. 종료 신호를 받으면 끝납니다.
+    실패한 URL은 오류 유형별 정책에 따라 지터가 적용된 백오프 후 다른 프록시로 다시 시도하며,
+    시도 횟수를 모두 쓰면 데드레터 파일에 기록합니다.
+    """
+    while True:
+        priority, _, url, is_rescrape, attempt, failed_proxies = await work_queue.get()
+        requeued = False
+        try:
+            if url is None:
+                return
+            async with controller.slot(): # 현재 허용된 동시 실행 수만큼만 처리
+                # 상태 점수에 비례하여 프록시 선택 (격리 중인 프록시, 이 URL에서 이미 실패한 프록시 제외)
+                proxy = await proxy_manager.acquire(exclude=failed_proxies)
+                started = time.monotonic()
+                result, error = await process_url(context_pool, url, proxy, is_rescrape=is_rescrape, http_fetcher=http_fetcher,
+                                                   checkpoint=checkpoint, snapshot_store=snapshot_store)
+                latency = time.monotonic() - started
+                controller.record(latency, bool(result), kind=error.kind if error else None)
+            metrics.observe(STAGE_TOTAL, latency, proxy)
+            record_outcome_metrics(result, error)
+            counts = stats.setdefault(priority, new_worker_stats())
+            if result:
+                proxy_manager.report_success(proxy, latency)
+                counts["완료"] += 1
+                continue
+
+            if error.kind == ERROR_MISSING_TITLE:
+                proxy_manager.release(proxy) # 페이지 자체의 문제이므로 프록시 점수에 반영하지 않음
+            else:
+                proxy_manager.report_failure(proxy, f"{error.kind}: {error}")
+            failed_proxies = failed_proxies + (proxy,)
+            if attempt < max_attempts(error.kind):
+                delay = backoff_delay(error.kind, attempt)
+                logger.info(f"🔁 재시도 예약 ({error.kind}, {attempt}회 실패, {delay:.1f}초 후 다른 프록시로): {url}")
+                item = (priority, next(work_sequence), url, is_rescrape, attempt + 1, failed_proxies)
+                task = asyncio.create_task(requeue_later(work_queue, delay, item))
+                retry_tasks.add(task)
+                task.add_done_callback(retry_tasks.discard)
+                requeued = True
+                counts["재시도"] += 1
+                metrics.count("retry")
+            else:
+                logger.warning(f"❌ 재시도 한도 초과 ({error.kind}, {attempt}회 시도) → 데드레터 기록: {url}")
+                dead_letters.write(dead_letter_record(url, error.kind, error, attempt, failed_proxies, is_rescrape))
+                counts["실패"] += 1
+                metrics.count("dead_letter")
+        except Exception as e:
+            logger.error(f"❗️ 작업자 처리 중 오류 발생 ({url}): {e}")
+            stats.setdefault(priority, new_worker_stats())["실패"] += 1
+        finally:
+            if not requeued:
+                work_queue.task_done()
+
+def make_url_router(all_products_data, sold_out_urls_to_rescrape, resumed_urls, scheduler, ignore_schedule):
+    """
+    --discover에서 목록에서 발견한 URL의 작업 큐 우선순위를 정하는 함수를 만듭니다. (build_work_batches와 같은 기준)
+    이미 큐에 넣었거나 체크포인트로 완료된 URL, 재수집 일정이 되지 않은 URL은 None(건너뜀)을 반환합니다.
+    """
+    seen = set(sold_out_urls_to_rescrape) | set(resumed_urls)
+    now = datetime.now()
+
+    def route_url(url):
+        if url in seen:
+            return None
+        seen.add(url)
+        product = all_products_data.get(url)
+        if not ignore_schedule and not scheduler.is_due(url, product, now):
+            return None
+        return PRIORITY_NEW if product is None else PRIORITY_STALE
+    return route_url
+
+async def stream_discovered_urls(browser, setup_context, work_queue, route_url, discovery_stats):
+    """
+    카테고리 목록 페이지를 스크래핑과 같은 브라우저/이벤트 루프에서 스크롤하며, 새로 발견한 URL을 바로 작업 큐에 넣습니다.
+    발견한 전체 URL은 다음 실행(--discover 없이)에서도 쓸 수 있도록 makeship_unique_products_*.txt로 저장합니다.
+    """
+    discovered = set()
+
+    async def on_links(category_name, links):
+        for url in links:
+            if url in discovered:
+                continue
+            discovered.add(url)
+            priority = route_url(url)
+            if priority is None:
+                discovery_stats["건너뜀"] += 1
+                continue
+            await work_queue.put((priority, next(work_sequence), url, False, 1, ()))
+            discovery_stats["대기열"] += 1
+            if discovery_stats["대기열"] == 1:
+                logger.info(f"목록 수집 시작 {time.monotonic() - discovery_stats['시작']:.1f}초 만에 첫 URL을 작업 큐에 넣었습니다.")
+
+    context = await browser.new_context() # 목록 페이지는 프록시 없이 직접 연결 (complete_infinite_extractor.py와 동일)
+    try:
+        await setup_context(context)
+        await discover_categories_async(context, CATEGORY_CONFIGS, on_links, HostPoliteness())
+    except Exception as e:
+        logger.error(f"❗️ 목록 수집 중 오류 발생: {e} (이미 발견한 URL은 계속 처리합니다)")
+    finally:
+        await context.close()
+        discovery_stats["발견"] = len(discovered)
+        discovery_stats["소요_초"] = time.monotonic() - discovery_stats["시작"]
+        if discovered:
+            filename = f"makeship_unique_products_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write("\n".join(sorted(discovered)) + "\n")
+            discovery_stats["파일"] = filename
+
+def build_work_batches(urls, all_products_data, sold_out_urls_to_rescrape):
+    """작업 큐에 넣을 (우선순위, URL 목록, 재스크래핑 여부) 묶음을 만듭니다."""
+    new_urls = [url for url in urls if url not in all_products_data and url not in sold_out_urls_to_rescrape]
+    stale_urls = [url for url in urls if url in all_products_data and url not in sold_out_urls_to_rescrape]
+    return [
+        (PRIORITY_SOLD_OUT, sorted(sold_out_urls_to_rescrape), True),
+        (PRIORITY_NEW, new_urls, False),
+        (PRIORITY_STALE, stale_urls, False),
+    ]
+
+async def run_scraping(batches, proxies, checkpoint, dead_letters, shard_count=1, save_snapshots=False, shard_index=None,
+                       route_url=None):
+    """
+    'Sold Out' 재확인, 신규 URL, 기존(stale) URL을 하나의 우선순위 작업 큐로 처리합니다.
+    고정된 수의 작업자가 큐를 공유하므로 단계 사이에 쉬는 구간이 없고, URL 수와 무관하게 메모리 사용량이 일정합니다.
+    완료된 레코드는 checkpoint에, 재시도 한도를 넘긴 URL은 dead_letters에 기록됩니다.
+    save_snapshots가 True이면 추출한 원본 필드를 스냅샷 저장소에도 기록합니다.
+    route_url(make_url_router)을 넘기면 같은 브라우저로 카테고리 목록을 수집하면서 발견한 URL을 바로 큐에 넣습니다. (--discover)
+    """
+    # 동시 실행 상한은 사용 가능한 메모리와 MAX_CONCURRENCY 중 작은 값 (샤드 모드에서는 프로세스 수로 나눔)
+    ceiling = memory_ceiling(memory_per_page_mb=MEMORY_PER_PAGE_MB, hard_max=MAX_CONCURRENCY) // shard_count
+    controller = AIMDController(initial=INITIAL_CONCURRENCY, minimum=MIN_CONCURRENCY, ceiling=ceiling)
+    counts = [len(batch_urls) for _, batch_urls, _ in batches]
+    url_count = sum(counts)
+    get_stealth_script(metrics) # 작업자 시작 전에 stealth 스크립트를 미리 생성
+    logger.info(f"=== 스크래핑 시작: Sold Out 재확인 {counts[0]}개, 신규 {counts[1]}개, 기존 {counts[2]}개 (동시 실행 {controller.limit}개로 시작, 상한 {controller.ceiling}개) ===")
+
+    async with async_playwright() as p, NextDataFetcher() as http_fetcher:
+        if not USE_HTTP_FETCH:
+            http_fetcher = None
+        browser = await p.chromium.launch(headless=True) # 브라우저를 헤드리스 모드로 한 번만 실행 (속도 향상)
+        # 프록시별 컨텍스트 풀 (URL마다 컨텍스트를 새로 만들지 않음)
+        first_party_domains = DEFAULT_FIRST_PARTY_DOMAINS + ((site_hostname(),) if is_simulated() else ())
+        resource_policy = ResourcePolicy(enabled=BLOCK_HEAVY_RESOURCES, allowed_types=ALLOWED_RESOURCE_TYPES,
+                                         first_party_domains=first_party_domains)
+        context_pool = ContextPool(browser, max_pages_per_context=CONTEXT_MAX_PAGES, setup_context=make_context_setup(resource_policy))
+
+        # 크기가 제한된 우선순위 큐 + 상한 개수만큼의 작업자 (실제 동시 실행 수는 AIMD 제어기가 결정)
+        worker_count = controller.ceiling
+        work_queue = asyncio.PriorityQueue(maxsize=worker_count * 4)
+        proxy_manager = ProxyManager(proxies)
+        stats = {}
+        retry_tasks = set() # 백오프 후 다시 큐에 넣을 대기 중인 재시도
+        snapshot_store = SnapshotStore(SNAPSHOT_DIR) if save_snapshots else None
+        workers = [
+            asyncio.create_task(scrape_worker(work_queue, controller, context_pool, proxy_manager, http_fetcher,
+                                              checkpoint, dead_letters, retry_tasks, stats, snapshot_store))
+            for _ in range(worker_count)
+        ]
+        discovery_stats = {"발견": 0, "대기열": 0, "건너뜀": 0, "시작": time.monotonic()}
+        discovery_task = None
+        if route_url:
+            discovery_task = asyncio.create_task(stream_discovered_urls(browser, context_pool.setup_context, work_queue,
+                                                                        route_url, discovery_stats))
+        try:
+            await produce_work(work_queue, batches, worker_count, discovery_task)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers + list(retry_tasks) + ([discovery_task] if discovery_task else []):
+                task.cancel()
+
+        drain_logging() # 요약은 print로 출력하므로 남은 로그를 먼저 모두 출력
+        priority_names = {PRIORITY_SOLD_OUT: "Sold Out 재확인", PRIORITY_NEW: "신규", PRIORITY_STALE: "기존"}
+        print("\n=== 스크래핑 완료 ===")
+        for priority, name in priority_names.items():
+            counts = stats.get(priority, new_worker_stats())
+            print(f"{name}: {counts['완료']}개 완료, {counts['실패']}개 실패 (데드레터), 재시도 {counts['재시도']}회")
+        if discovery_task:
+            print(f"목록 수집: {discovery_stats['발견']}개 URL 발견, {discovery_stats['대기열']}개 작업 큐 투입, "
+                  f"{discovery_stats['건너뜀']}개 건너뜀 (이미 큐에 있음/완료/일정 전), {discovery_stats.get('소요_초', 0):.1f}초")
+            if discovery_stats.get("파일"):
+                print(f"발견한 URL 목록이 '{discovery_stats['파일']}' 파일로 저장되었습니다.")
+            url_count += discovery_stats["대기열"]
+
+        controller.print_summary()
+        proxy_manager.print_summary()
+        proxy_stats_file = proxy_manager.export_stats(f"proxy_stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        print(f"프록시별 통계가 '{proxy_stats_file}' 파일로 저장되었습니다.")
+        print(f"컨텍스트 풀: {context_pool.created_count}개 생성, {context_pool.recycled_count}개 교체")
+        if http_fetcher:
+            http_fetcher.print_summary()
+        resource_policy.print_summary()
+        report_stealth_overhead(url_count)
+        readiness_stats.print_summary()
+        if snapshot_store:
+            snapshot_store.print_summary()
+        metrics.print_summary()
+        write_metrics(shard_index)
+        await context_pool.close()
+        await browser.close() # 모든 작업 후 브라우저 종료
+
 if __name__ == '__main__':
-    asyncio.run(main())
\ No newline at end of file
+    args = parse_args()
+    setup_logging(level=args.log_level, log_format=args.log_format, quiet=args.quiet)
+    try:
+        asyncio.run(main(args))
+    finally:
+        shutdown_logging()
\ No newline at end of file
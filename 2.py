@@ -3,16 +3,67 @@ import pandas as pd
 import os
 from datetime import datetime
 import glob
-import re
+from product_store import ProductStore, DEFAULT_DB_FILE
+from makeship_parsing import convert_to_numeric, normalize_stored_date # 공용 파싱 (캐시 사용)
 
-def load_json_files():
-    """현재 폴더의 Makeship 관련 JSON 파일들을 로드"""
+def convert_product_fields(product):
+    """제품 데이터의 날짜/숫자 필드 형식을 엑셀용으로 변환합니다."""
+    if '프로젝트_종료일' in product: # 프로젝트 종료일 날짜 형식 변환
+        product['프로젝트_종료일'] = normalize_stored_date(product['프로젝트_종료일'])
+    if '배송_시작일' in product: # 배송 시작일 날짜 형식 변환
+        product['배송_시작일'] = normalize_stored_date(product['배송_시작일'])
+    if '판매량' in product: # 판매량 숫자 형식 변환
+        product['판매량'] = convert_to_numeric(product['판매량'])
+    if '달성률' in product: # 달성률 숫자 형식 변환
+        product['달성률'] = convert_to_numeric(product['달성률'])
+    # 판매량이 0이면 매출도 0으로 처리
+    if '판매량' in product and '매출' in product:
+        if product['판매량'] == 0:
+            product['매출'] = 0
+    return product
+
+def find_json_files():
+    """현재 폴더의 Makeship 관련 JSON 파일 목록"""
     # 'makeship_all_products_YYYYMMDD_HHMMSS.json' 패턴과 'makeship_[카테고리]_[타임스탬프].json' 패턴의 파일들을 모두 찾음
     json_files = glob.glob('makeship_all_products_*.json') + \
                  glob.glob('makeship_*_*.json') # 모든 makeship_로 시작하는 json 파일 포함 (카테고리별 파일 포함)
     
     # 중복 제거 및 정렬
-    json_files = sorted(list(set(json_files)))
+    return sorted(list(set(json_files)))
+
+def load_products_from_store(db_file=DEFAULT_DB_FILE):
+    """1.py가 관리하는 제품 DB에서 URL별 최신 제품 데이터를 로드 (이미 URL 기준으로 중복 제거됨)"""
+    with ProductStore(db_file) as store:
+        products = [convert_product_fields(product) for product in store.iter_products()]
+    print(f"제품 DB '{db_file}': {len(products)}개 제품")
+    return products
+
+def run_excel_filename(run_id, source, started_at):
+    timestamp = datetime.strptime(started_at, '%Y-%m-%d %H:%M:%S').strftime('%Y%m%d_%H%M%S')
+    return f"makeship_run{run_id}_{source}_{timestamp}.xlsx"
+
+def create_run_excel_files(db_file=DEFAULT_DB_FILE):
+    """
+    제품 DB의 실행(runs)별 기록(snapshots)으로 개별 엑셀 파일 생성
+    이미 만든 실행의 엑셀은 다시 만들지 않으므로 실행 기록이 쌓여도 새 실행만 처리합니다. 전체 실행 파일 수를 반환합니다.
+    """
+    print("\n=== 실행별 엑셀 파일 생성 ===")
+    with ProductStore(db_file) as store:
+        runs = store.iter_runs()
+        created = 0
+        for run_id, source, started_at, _ in runs:
+            excel_filename = run_excel_filename(run_id, source, started_at)
+            if os.path.exists(excel_filename):
+                continue
+            products = [convert_product_fields(product) for product in store.run_products(run_id)]
+            create_excel_from_products(products, excel_filename)
+            created += 1
+    print(f"실행 {len(runs)}개 중 {created}개 엑셀 새로 생성 (나머지는 이전에 생성됨)")
+    return len(runs)
+
+def load_json_files():
+    """현재 폴더의 Makeship 관련 JSON 파일들을 로드"""
+    json_files = find_json_files()
 
     all_data = []
     
@@ -34,18 +85,7 @@ def load_json_files():
 
             # 각 제품 데이터에 대해 형식 변환 적용
             for product in products:
-                if '프로젝트_종료일' in product: # 프로젝트 종료일 날짜 형식 변환
-                    product['프로젝트_종료일'] = normalize_date(product['프로젝트_종료일'])
-                if '배송_시작일' in product: # 배송 시작일 날짜 형식 변환
-                    product['배송_시작일'] = normalize_date(product['배송_시작일'])
-                if '판매량' in product: # 판매량 숫자 형식 변환
-                    product['판매량'] = convert_to_numeric(product['판매량'])
-                if '달성률' in product: # 달성률 숫자 형식 변환
-                    product['달성률'] = convert_to_numeric(product['달성률'])
-                # 판매량이 0이면 매출도 0으로 처리
-                if '판매량' in product and '매출' in product:
-                    if product['판매량'] == 0:
-                        product['매출'] = 0
+                convert_product_fields(product)
             
             all_data.extend(products)
                 
@@ -54,82 +94,6 @@ def load_json_files():
     
     return all_data, json_files
 
-def normalize_date(date_str):
-    """
-    다양한 날짜 문자열 형식을 'YYYY-MM-DD' 형식으로 변환합니다.
-    - 'YYYY-MM-DD' (이미 정규화된 형식)
-    - 'July 1, 5:00AM GMT+9 / Ships September 23, 2025'
-    - 'September 17, 2022'
-    - 'July 1, 2022'
-    - '해당 없음'
-    등을 처리할 수 있도록 개선합니다.
-    """
-    if not date_str or date_str in ['정보 없음', '해당 없음', '상태 확인 중 오류']:
-        return date_str if date_str else '정보 없음'
-
-    # 1. 이미 YYYY-MM-DD 형식인 경우 그대로 반환
-    if isinstance(date_str, str) and re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
-        return date_str
-
-    # 2. ' / ' 기준으로 나누어 프로젝트 종료일과 배송 시작일 분리
-    parts = date_str.split(' / ')
-    
-    # 프로젝트 종료일 처리 (첫 번째 부분)
-    project_end_date_part = parts[0].strip()
-    try:
-        # '5:00AM GMT+9'와 같은 시간/GMT 정보 제거
-        project_end_date_clean = ' '.join(project_end_date_part.split(' ')[:3])
-        # 'July 1, 2022' 형식 파싱
-        dt_object = datetime.strptime(project_end_date_clean.replace(',', ''), '%B %d %Y')
-        return dt_object.strftime('%Y-%m-%d')
-    except ValueError:
-        pass # 파싱 실패 시 다음 형식 시도
-
-    # 3. 'Ships September 23, 2025' 같은 형식 처리
-    if 'Ships ' in date_str:
-        ship_date_part = date_str.split('Ships ')[-1].strip()
-        try:
-            # 'September 23, 2025' 형식 파싱
-            dt_object = datetime.strptime(ship_date_part.replace(',', ''), '%B %d %Y')
-            return dt_object.strftime('%Y-%m-%d')
-        except ValueError:
-            pass # 파싱 실패 시 다음 형식 시도
-    
-    # 4. Fallback: 일반적인 날짜 형식 시도
-    try:
-        dt_object = datetime.strptime(date_str.replace(',', ''), '%B %d %Y')
-        return dt_object.strftime('%Y-%m-%d')
-    except ValueError:
-        # 변환 실패 시 원본 반환
-        return date_str
-
-def convert_to_numeric(value_str):
-    """문자열에서 숫자만 추출하여 정수 또는 실수로 변환합니다."""
-    # 이미 숫자인 경우 그대로 반환
-    if isinstance(value_str, (int, float)):
-        return value_str
-    
-    if not value_str or value_str == '정보 없음':
-        return 0
-    
-    # 문자열이 아닌 경우 0 반환
-    if not isinstance(value_str, str):
-        return 0
-
-    clean_value = value_str.replace(',', '').replace(' sold', '').strip()
-    try:
-        # 달성률 (%)가 포함된 경우
-        if '%' in clean_value:
-            return float(clean_value.replace('%', ''))
-        else:
-            # 정수 또는 실수로 변환 시도
-            if '.' in clean_value:
-                return float(clean_value)
-            else:
-                return int(clean_value)
-    except ValueError:
-        return 0
-
 def remove_duplicates_by_url(products):
     """제품 URL로 중복 제거 (최신 데이터 유지)"""
     unique_products = {}
@@ -258,18 +222,7 @@ def create_individual_excel_files(json_files):
             
             # 각 제품 데이터에 대해 형식 변환 적용
             for product in products:
-                if '프로젝트_종료일' in product:
-                    product['프로젝트_종료일'] = normalize_date(product['프로젝트_종료일'])
-                if '배송_시작일' in product:
-                    product['배송_시작일'] = normalize_date(product['배송_시작일'])
-                if '판매량' in product:
-                    product['판매량'] = convert_to_numeric(product['판매량'])
-                if '달성률' in product:
-                    product['달성률'] = convert_to_numeric(product['달성률'])
-                # 판매량이 0이면 매출도 0으로 처리
-                if '판매량' in product and '매출' in product:
-                    if product['판매량'] == 0:
-                        product['매출'] = 0
+                convert_product_fields(product)
             
             # 엑셀 파일명 생성
             excel_filename = json_file.replace('.json', '.xlsx')
@@ -284,9 +237,14 @@ def main():
     print("=== Makeship JSON to Excel 변환기 ===")
     print(f"실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # 1. JSON 파일들 로드
-    print("\n1. JSON 파일 로드 중...")
-    all_products, json_files = load_json_files()
+    # 1. 제품 DB가 있으면 DB에서, 없으면 JSON 파일들에서 로드
+    if os.path.exists(DEFAULT_DB_FILE):
+        print("\n1. 제품 DB 로드 중...")
+        all_products = load_products_from_store()
+        json_files = None # 개별 엑셀은 JSON 파일 대신 DB의 실행 기록으로 생성
+    else:
+        print("\n1. JSON 파일 로드 중...")
+        all_products, json_files = load_json_files()
     
     if not all_products:
         print("❌ 변환할 데이터가 없습니다.")
@@ -307,12 +265,16 @@ def main():
     
     # 4. 개별 엑셀 파일 생성
     print("\n4. 개별 엑셀 파일 생성 중...")
-    create_individual_excel_files(json_files)
+    if json_files is None:
+        individual_count = create_run_excel_files()
+    else:
+        create_individual_excel_files(json_files)
+        individual_count = len(json_files)
     
     # 5. 완료 보고
     print(f"\n=== 변환 완료 ===")
     print(f"📊 통합 엑셀: {integrated_filename}")
-    print(f"📁 개별 엑셀: {len(json_files)}개 파일")
+    print(f"📁 개별 엑셀: {individual_count}개 파일")
     print(f"🔢 총 제품 수: {len(unique_products)}개 (중복 제거 후)")
 
 if __name__ == '__main__':
@@ -1,5 +1,9 @@
+import argparse
+import asyncio
+import threading
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -9,15 +13,27 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from makeship_site import site_url # MAKESHIP_BASE_URL 지정 시 로컬 시뮬레이터로 요청
+from host_politeness import HostPoliteness, DEFAULT_MIN_INTERVAL, DEFAULT_PER_HOST_LIMIT # 호스트별 동시 요청/간격 제한
+from listing_api import capture_listing_endpoint, discover_listings, load_endpoints, save_endpoints # 목록 API 직접 호출
+from scrape_logging import setup_logging, shutdown_logging # 목록 수집 진행 로그
+from listing_discovery import CATEGORY_CONFIGS, COLLECT_NEW_LINKS_SCRIPT, normalize_product_href # 카테고리 목록, 페이지 내 링크 수집기
 
-def extract_category_with_infinite_scroll(category_name, url, max_products=1000):
+# ChromeDriverManager().install() 결과 (병렬 모드에서도 한 번만 설치/확인)
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+def get_driver_path():
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+    return _driver_path
+
+def create_driver():
     """
-    특정 카테고리에서 무한 스크롤을 통해 모든 상품을 추출하는 함수
+    헤드리스 Chrome 드라이버를 만듭니다.
     """
-    print(f"\n=== {category_name} 카테고리 처리 중 ===")
-    print(f"URL: {url}")
-    
     # Chrome 옵션 설정
     chrome_options = Options()
     chrome_options.add_argument("--headless")  # 백그라운드 실행
@@ -28,16 +44,38 @@ def extract_category_with_infinite_scroll(category_name, url, max_products=1000)
     chrome_options.add_experimental_option('useAutomationExtension', False)
     chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
     
-    driver = None
+    driver = webdriver.Chrome(service=Service(get_driver_path()), options=chrome_options)
     
+    # 자동화 감지 방지
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
+def is_driver_alive(driver):
     try:
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        # 자동화 감지 방지
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        driver.current_url
+        return True
+    except WebDriverException:
+        return False
+
+def extract_category_with_infinite_scroll(category_name, url, max_products=1000, driver=None, politeness=None):
+    """
+    특정 카테고리에서 무한 스크롤을 통해 모든 상품을 추출하는 함수
+    driver를 넘기면 그 브라우저를 재사용하고 종료하지 않습니다. (병렬 모드)
+    politeness(HostPoliteness)를 넘기면 페이지 이동과 스크롤 로딩 전에 호스트별 요청 간격을 지킵니다.
+    """
+    print(f"\n=== {category_name} 카테고리 처리 중 ===")
+    print(f"URL: {url}")
+    
+    owns_driver = driver is None
+    target_url = site_url(url)
+    
+    try:
+        if owns_driver:
+            driver = create_driver()
         
-        driver.get(url)
+        if politeness:
+            politeness.wait_turn(target_url)
+        driver.get(target_url)
         time.sleep(3)
         
         all_discovered_links = set()
@@ -49,14 +87,14 @@ def extract_category_with_infinite_scroll(category_name, url, max_products=1000)
         while scroll_cycle < max_cycles and consecutive_no_change < max_no_change:
             scroll_cycle += 1
             
-            # 현재 페이지의 상품 링크 수집
-            current_links = get_current_product_links(driver)
+            # 지난 사이클 이후 페이지에 추가된 상품 링크만 수집
+            added_links, current_count = collect_new_product_links(driver)
             
-            # 새로 발견된 링크 추가
-            new_links = current_links - all_discovered_links
-            all_discovered_links.update(current_links)
+            # 새로 발견된 링크 추가 (페이지가 초기화되어 다시 붙은 링크는 제외됨)
+            new_links = added_links - all_discovered_links
+            all_discovered_links.update(new_links)
             
-            print(f"  사이클 {scroll_cycle}: 현재 {len(current_links)}개, 누적 {len(all_discovered_links)}개, 신규 {len(new_links)}개")
+            print(f"  [{category_name}] 사이클 {scroll_cycle}: 현재 {current_count if current_count is not None else '?'}개, 누적 {len(all_discovered_links)}개, 신규 {len(new_links)}개")
             
             # 목표 상품 수에 도달하거나 새로운 링크가 없으면
             if len(all_discovered_links) >= max_products:
@@ -70,11 +108,13 @@ def extract_category_with_infinite_scroll(category_name, url, max_products=1000)
                 consecutive_no_change = 0
             
             # 현재 상품 수가 급격히 줄어들면 (초기화 감지) 종료
-            if len(current_links) < 20 and len(all_discovered_links) > 100:
+            if current_count is not None and current_count < 20 and len(all_discovered_links) > 100:
                 print(f"  → 페이지 초기화 감지, 수집 종료")
                 break
             
-            # 스크롤 동작
+            # 스크롤 동작 (다음 목록을 불러오는 요청이 발생하므로 호스트별 요청 간격을 지킴)
+            if politeness:
+                politeness.wait_turn(target_url)
             try:
                 body = driver.find_element(By.TAG_NAME, 'body')
                 
@@ -109,64 +149,25 @@ def extract_category_with_infinite_scroll(category_name, url, max_products=1000)
         print(f"  ❌ {category_name} 오류: {e}")
         return []
     finally:
-        if driver:
+        if owns_driver and driver:
             driver.quit()
 
-def get_current_product_links(driver):
+def collect_new_product_links(driver):
     """
-    현재 페이지에서 상품 링크들을 추출하는 함수
+    지난 호출 이후 페이지에 새로 추가된 상품 링크들과 현재 페이지의 상품 링크 수를 반환하는 함수
+    (오류 시 현재 상품 수는 None)
     """
     try:
-        page_source = driver.page_source
-        soup = BeautifulSoup(page_source, 'html.parser')
-        
-        product_links = set()
-        
-        # 다양한 패턴으로 상품 링크 찾기
-        patterns = [
-            'a[href*="/products/"]',
-            '.product-card a',
-            '.product-item a',
-            '.campaign-card a',
-            '.grid-item a',
-            '[data-product] a'
-        ]
-        
-        for pattern in patterns:
-            links = soup.select(pattern)
-            for link in links:
-                href = link.get('href')
-                if href and '/products/' in href:
-                    if href.startswith('/'):
-                        full_url = f"https://www.makeship.com{href}"
-                    elif href.startswith('http'):
-                        full_url = href
-                    else:
-                        continue
-                    
-                    # 쿼리 파라미터 제거하여 정리
-                    clean_url = full_url.split('?')[0]
-                    product_links.add(clean_url)
-        
-        # 백업 방법: 모든 a 태그 검사
-        all_links = soup.find_all('a', href=True)
-        for link in all_links:
-            href = link['href']
-            if '/products/' in href:
-                if href.startswith('/'):
-                    full_url = f"https://www.makeship.com{href}"
-                elif href.startswith('http'):
-                    full_url = href
-                else:
-                    continue
-                
-                clean_url = full_url.split('?')[0]
-                product_links.add(clean_url)
-        
-        return product_links
-        
-    except Exception as e:
-        return set()
+        result = driver.execute_script(COLLECT_NEW_LINKS_SCRIPT)
+    except Exception:
+        return set(), None
+    
+    new_links = set()
+    for href in result.get('added', []):
+        clean_url = normalize_product_href(href)
+        if clean_url:
+            new_links.add(clean_url)
+    return new_links, result.get('current')
 
 def save_links_clean(links, filename):
     """
@@ -203,94 +204,181 @@ def save_category_results(all_results, timestamp):
     
     return len(all_unique_links)
 
+def extract_categories_parallel(category_configs, max_browsers, politeness):
+    """
+    카테고리들을 최대 max_browsers개의 브라우저로 동시에 수집합니다.
+    브라우저는 필요할 때만 만들어 여러 카테고리에 재사용하고, 같은 호스트의 동시 수집 수와 요청 간격은 politeness로 제한합니다.
+    결과는 category_configs 순서의 {카테고리명: 링크 목록} 딕셔너리입니다.
+    """
+    idle_drivers = [] # 쉬고 있는 브라우저 (호스트 제한으로 대기하는 스레드가 브라우저를 미리 만들지 않도록 공유)
+    drivers = []
+    drivers_lock = threading.Lock()
+
+    def crawl(category_name, config):
+        with politeness.slot(site_url(config["url"])):
+            with drivers_lock:
+                driver = idle_drivers.pop() if idle_drivers else None
+            if driver is not None and not is_driver_alive(driver):
+                print(f"  ⚠️ [{category_name}] 브라우저가 응답하지 않아 새로 시작합니다.")
+                try:
+                    driver.quit()
+                except WebDriverException:
+                    pass
+                driver = None
+            if driver is None:
+                driver = create_driver()
+                with drivers_lock:
+                    drivers.append(driver)
+            try:
+                return extract_category_with_infinite_scroll(category_name, config["url"], config["max_products"],
+                                                             driver=driver, politeness=politeness)
+            finally:
+                with drivers_lock:
+                    idle_drivers.append(driver)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_browsers, thread_name_prefix="category") as executor:
+            futures = {name: executor.submit(crawl, name, config) for name, config in category_configs.items()}
+            results = {}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    print(f"  ❌ {name} 오류: {e}")
+                    results[name] = []
+            return results
+    finally:
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+
+def ensure_listing_endpoints(urls, politeness, recapture=False):
+    """
+    목록 페이지 URL들의 API 엔드포인트를 반환하는 함수
+    저장된 기록이 없는 URL만(recapture=True면 전부) 브라우저로 한 번 캡처해 저장합니다. (캡처하지 못한 URL은 결과에 없음)
+    """
+    endpoints = load_endpoints()
+    missing = [url for url in urls if recapture or url not in endpoints]
+    if missing:
+        print(f"목록 API 요청 캡처 중... ({len(missing)}개 카테고리)")
+        driver = create_driver()
+        try:
+            for url in missing:
+                politeness.wait_turn(site_url(url))
+                try:
+                    endpoint = capture_listing_endpoint(driver, url)
+                except WebDriverException as e:
+                    print(f"  ❌ {url} 캡처 오류: {e}")
+                    continue
+                if endpoint:
+                    endpoints[url] = endpoint
+                    print(f"  → {url}: {endpoint['url']} ({endpoint['param']})")
+                else:
+                    print(f"  ⚠️ {url}: 목록 API 요청을 찾지 못했습니다. (무한 스크롤로 수집)")
+        finally:
+            driver.quit()
+        save_endpoints(endpoints)
+    return endpoints
+
+def extract_categories_via_api(category_configs, politeness, recapture=False):
+    """
+    목록 API 모드: 스크롤 대신 목록 페이지가 불러오는 JSON API를 직접 호출해 상품 링크를 수집하는 함수
+    기록된 엔드포인트가 없는 카테고리만 브라우저로 한 번 캡처하고, API로 수집하지 못한 카테고리는 무한 스크롤로 대체합니다.
+    """
+    endpoints = ensure_listing_endpoints([config["url"] for config in category_configs.values()], politeness, recapture)
+    
+    targets = [(name, config["url"], config["max_products"]) for name, config in category_configs.items()]
+    api_results = asyncio.run(discover_listings(targets, endpoints, politeness))
+    
+    results = {}
+    for name, config in category_configs.items():
+        if api_results[name] is not None:
+            results[name] = api_results[name][0]
+        else:
+            results[name] = extract_category_with_infinite_scroll(name, config["url"], config["max_products"],
+                                                                  politeness=politeness)
+    return results
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Makeship 전체 카테고리 무한 스크롤 추출기")
+    parser.add_argument("--parallel", type=int, default=1,
+                        help="동시에 사용할 브라우저 수 (기본값 1: 카테고리를 하나씩 순서대로 처리)")
+    parser.add_argument("--mode", choices=("scroll", "api"), default="scroll",
+                        help="scroll: 브라우저 무한 스크롤 (기본값), api: 목록 페이지가 호출하는 JSON API를 직접 페이지 단위로 요청")
+    parser.add_argument("--recapture", action="store_true",
+                        help="api 모드에서 저장된 엔드포인트를 무시하고 목록 API 요청을 다시 캡처")
+    parser.add_argument("--full-past", action="store_true",
+                        help="지난 상품을 805개 한계 없이 필터/정렬 파티션으로 나눠 전체 수집 (past_catalog.py)")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST_LIMIT,
+                        help=f"같은 호스트에서 동시에 수집할 카테고리/API 요청 수 상한 (병렬/api 모드, 기본값 {DEFAULT_PER_HOST_LIMIT})")
+    parser.add_argument("--min-interval", type=float, default=DEFAULT_MIN_INTERVAL,
+                        help=f"같은 호스트로 보내는 페이지 이동/스크롤/API 요청 사이 최소 간격(초) (병렬/api 모드, 기본값 {DEFAULT_MIN_INTERVAL})")
+    return parser.parse_args()
+
 def main():
     """
     메인 실행 함수 - 모든 카테고리에 무한 스크롤 적용
     """
+    args = parse_args()
     print("🚀 Makeship 전체 카테고리 무한 스크롤 추출기")
     print("모든 카테고리에 무한 스크롤을 적용하여 최대한 많은 상품을 수집합니다.")
     print("="*70)
     
     # 카테고리 URL 목록 (past는 805개 한계 적용)
-    category_configs = {
-        "후디": {
-            "url": "https://www.makeship.com/shop/hoodies", 
-            "max_products": 200
-        },
-        "니트 크루넥": {
-            "url": "https://www.makeship.com/shop/knitted-crewnecks", 
-            "max_products": 100
-        },
-        "티셔츠": {
-            "url": "https://www.makeship.com/shop/t-shirts", 
-            "max_products": 100
-        },
-        "에나멜 핀": {
-            "url": "https://www.makeship.com/shop/enamel-pins", 
-            "max_products": 200
-        },
-        "비닐 피규어": {
-            "url": "https://www.makeship.com/shop/vinyl-figures", 
-            "max_products": 200
-        },
-        "플러시": {
-            "url": "https://www.makeship.com/shop/plushies", 
-            "max_products": 300
-        },
-        "롱보이": {
-            "url": "https://www.makeship.com/shop/longbois", 
-            "max_products": 100
-        },
-        "도우보이": {
-            "url": "https://www.makeship.com/shop/doughbois", 
-            "max_products": 100
-        },
-        "점보 플러시": {
-            "url": "https://www.makeship.com/shop/jumbo-plushies", 
-            "max_products": 100
-        },
-        "키체인 플러시": {
-            "url": "https://www.makeship.com/shop/keychain-plushies", 
-            "max_products": 200
-        },
-        "인기 상품": {
-            "url": "https://www.makeship.com/shop/top", 
-            "max_products": 200
-        },
-        "신상품": {
-            "url": "https://www.makeship.com/shop/new", 
-            "max_products": 200
-        },
-        "출시 예정": {
-            "url": "https://www.makeship.com/shop/comingsoon", 
-            "max_products": 200
-        },
-        "지난 상품": {
-            "url": "https://www.makeship.com/shop/past", 
-            "max_products": 805  # Past는 805개 한계
-        }
-    }
+    category_configs = {name: dict(config) for name, config in CATEGORY_CONFIGS.items()}
     
     timestamp = time.strftime('%Y%m%d_%H%M%S')
     all_results = {}
+    past_config = category_configs.pop("지난 상품") if args.full_past else None
     
     start_time = time.time()
     
-    for category_name, config in category_configs.items():
-        category_links = extract_category_with_infinite_scroll(
-            category_name, 
-            config["url"], 
-            config["max_products"]
-        )
-        
-        all_results[category_name] = category_links
-        
-        # 각 카테고리별로 개별 파일도 저장
-        category_filename = f"makeship_{category_name.replace(' ', '_')}_{timestamp}.txt"
-        save_links_clean(category_links, category_filename)
-        
-        # 잠시 대기 (서버 부하 방지)
-        time.sleep(2)
+    if args.mode == "api":
+        # 목록 API 모드: 기록해 둔 JSON API를 aiohttp로 직접 호출 (고정 대기 없이 카테고리당 요청 몇 번)
+        politeness = HostPoliteness(per_host_limit=args.per_host, min_interval=args.min_interval)
+        all_results = extract_categories_via_api(category_configs, politeness, recapture=args.recapture)
+        for category_name, category_links in all_results.items():
+            category_filename = f"makeship_{category_name.replace(' ', '_')}_{timestamp}.txt"
+            save_links_clean(category_links, category_filename)
+        politeness.print_summary()
+    elif args.parallel > 1:
+        # 병렬 모드: 브라우저 여러 개로 카테고리를 동시에 수집 (ChromeDriver 설치 확인은 한 번만)
+        print(f"병렬 모드: 브라우저 최대 {args.parallel}개")
+        get_driver_path()
+        politeness = HostPoliteness(per_host_limit=args.per_host, min_interval=args.min_interval)
+        all_results = extract_categories_parallel(category_configs, args.parallel, politeness)
+        for category_name, category_links in all_results.items():
+            category_filename = f"makeship_{category_name.replace(' ', '_')}_{timestamp}.txt"
+            save_links_clean(category_links, category_filename)
+        politeness.print_summary()
+    else:
+        for category_name, config in category_configs.items():
+            category_links = extract_category_with_infinite_scroll(
+                category_name, 
+                config["url"], 
+                config["max_products"]
+            )
+            
+            all_results[category_name] = category_links
+            
+            # 각 카테고리별로 개별 파일도 저장
+            category_filename = f"makeship_{category_name.replace(' ', '_')}_{timestamp}.txt"
+            save_links_clean(category_links, category_filename)
+            
+            # 잠시 대기 (서버 부하 방지)
+            time.sleep(2)
+    
+    if past_config:
+        # 지난 상품은 파티션으로 나눠 전체 수집 (805개 초기화 한계 회피)
+        from past_catalog import enumerate_past_catalog, print_coverage
+        past_politeness = HostPoliteness(per_host_limit=args.per_host, min_interval=args.min_interval)
+        past_links, past_report = enumerate_past_catalog(past_politeness, use_api=args.mode == "api",
+                                                         max_browsers=max(args.parallel, 1), recapture=args.recapture)
+        print_coverage(past_report)
+        all_results["지난 상품"] = past_links
+        save_links_clean(past_links, f"makeship_지난_상품_{timestamp}.txt")
     
     # 전체 결과 저장
     total_unique = save_category_results(all_results, timestamp)
@@ -318,4 +406,8 @@ def main():
     print(f"  - makeship_[카테고리]_{timestamp}.txt (카테고리별 개별 파일)")
 
 if __name__ == "__main__":
-    main()
+    setup_logging()
+    try:
+        main()
+    finally:
+        shutdown_logging()
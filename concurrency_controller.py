@@ -0,0 +1,145 @@
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+from scrape_logging import get_logger
+
+try:
+    import psutil
+except ImportError:  # psutil이 없으면 /proc/meminfo 또는 sysconf 사용
+    psutil = None
+
+logger = get_logger("concurrency")
+
+
+def available_memory_mb():
+    """사용 가능한 메모리(MB)를 반환합니다. 확인할 수 없으면 None을 반환합니다."""
+    if psutil is not None:
+        return psutil.virtual_memory().available / (1024 * 1024)
+    try:
+        with open("/proc/meminfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def memory_ceiling(memory_per_page_mb=150, hard_max=64, reserve_ratio=0.2):
+    """Chromium 페이지 하나당 필요한 메모리를 기준으로 동시 실행 상한을 계산합니다."""
+    available = available_memory_mb()
+    if available is None:
+        return hard_max
+    usable = available * (1 - reserve_ratio)
+    return max(1, min(hard_max, int(usable // memory_per_page_mb)))
+
+
+class AIMDController:
+    """
+    AIMD(Additive Increase / Multiplicative Decrease) 방식의 동시 실행 수 제어기.
+
+    - window개의 결과마다 p95 지연시간과 오류율을 확인하여, 정상이면 동시 실행 수를 increase_step만큼 늘립니다.
+    - 타임아웃/차단 페이지가 발생하거나, 오류율이 error_threshold를 넘거나, p95가 기준 대비 latency_tolerance배 이상
+      늘어나면 동시 실행 수를 decrease_factor배로 줄입니다. (감소 후 cooldown초 동안은 추가 감소하지 않음)
+    - 동시 실행 수는 minimum 이상, ceiling(메모리 기반 상한) 이하로 유지됩니다.
+
+    asyncio.Semaphore 대신 `async with controller.slot():` 형태로 사용합니다.
+    """
+
+    def __init__(self, initial=10, minimum=2, ceiling=64, window=20, error_threshold=0.1,
+                 latency_tolerance=2.0, increase_step=1, decrease_factor=0.5, cooldown=10.0):
+        self.ceiling = max(minimum, ceiling)
+        self.minimum = minimum
+        self.limit = max(minimum, min(initial, self.ceiling))
+        self.window = window
+        self.error_threshold = error_threshold
+        self.latency_tolerance = latency_tolerance
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+
+        self.active = 0
+        self._condition = asyncio.Condition()
+        self._samples = deque(maxlen=window)  # (지연시간, 성공 여부)
+        self._since_adjust = 0
+        self._baseline_p95 = None  # 지금까지 관측된 가장 낮은 구간 p95
+        self._last_decrease = 0.0
+        self.history = [(0.0, self.limit)]  # (경과 시간, 동시 실행 수) 변경 기록
+        self._started = time.monotonic()
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.active -= 1
+                self._condition.notify_all()
+
+    def record(self, latency, ok, kind=None):
+        """
+        페이지 처리 결과를 기록합니다.
+        kind가 'timeout' 또는 'block'이면 구간을 기다리지 않고 즉시 동시 실행 수를 줄입니다.
+        """
+        self._samples.append((latency, ok))
+        self._since_adjust += 1
+        if kind in ("timeout", "block"):
+            self._decrease(f"{kind} 발생")
+            return
+        if self._since_adjust >= self.window:
+            self._adjust()
+
+    def _p95(self):
+        latencies = sorted(latency for latency, ok in self._samples if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    def _adjust(self):
+        self._since_adjust = 0
+        errors = sum(1 for _, ok in self._samples if not ok)
+        error_rate = errors / len(self._samples)
+        p95 = self._p95()
+        if p95 is not None and (self._baseline_p95 is None or p95 < self._baseline_p95):
+            self._baseline_p95 = p95
+
+        if error_rate > self.error_threshold:
+            self._decrease(f"오류율 {error_rate:.0%}")
+        elif p95 is not None and p95 > self._baseline_p95 * self.latency_tolerance:
+            self._decrease(f"p95 {p95:.1f}초 (기준 {self._baseline_p95:.1f}초)")
+        elif self.limit < self.ceiling:
+            self._set_limit(self.limit + self.increase_step)
+
+    def _decrease(self, reason):
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._since_adjust = 0
+        new_limit = max(self.minimum, int(self.limit * self.decrease_factor))
+        if new_limit < self.limit:
+            logger.info(f"동시 실행 수 감소 {self.limit} → {new_limit} ({reason})")
+            self._set_limit(new_limit)
+
+    def _set_limit(self, new_limit):
+        self.limit = new_limit
+        self.history.append((round(time.monotonic() - self._started, 1), new_limit))
+        # 한도가 늘어나면 대기 중인 작업자를 깨움
+        asyncio.get_running_loop().create_task(self._notify())
+
+    async def _notify(self):
+        async with self._condition:
+            self._condition.notify_all()
+
+    def print_summary(self):
+        peak = max(limit for _, limit in self.history)
+        print(f"동시 실행 수: 최종 {self.limit}, 최대 {peak}, 상한 {self.ceiling}, 조정 {len(self.history) - 1}회")
@@ -0,0 +1,127 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from scrape_logging import get_logger
+
+logger = get_logger("context_pool")
+
+
+class _PooledContext:
+    """풀에서 관리하는 단일 BrowserContext와 그 상태"""
+
+    def __init__(self, context):
+        self.context = context
+        self.idle_pages = []   # 재사용 가능한 페이지 목록
+        self.in_use = 0        # 현재 사용 중인 페이지 수
+        self.pages_served = 0  # 지금까지 내어준 페이지 수
+        self.retiring = False  # True이면 새 페이지를 내어주지 않고, 사용 중인 페이지가 모두 반환되면 종료
+
+
+class ContextPool:
+    """
+    프록시별로 워밍된 BrowserContext를 유지하면서 페이지를 내어주는 풀.
+
+    - 컨텍스트는 프록시당 하나씩 생성되며, 생성 시 setup_context 콜백(stealth 적용 등)이 한 번만 실행됩니다.
+    - 쿠키와 프록시를 통한 HTTP 연결이 유지되므로 URL마다 TLS 핸드셰이크를 반복하지 않습니다.
+    - max_pages_per_context개의 페이지를 내어준 컨텍스트, 또는 오류가 발생한 컨텍스트는 교체(recycle)됩니다.
+    """
+
+    def __init__(self, browser, max_pages_per_context=50, setup_context=None):
+        self.browser = browser
+        self.max_pages_per_context = max_pages_per_context
+        self.setup_context = setup_context
+        self._contexts = {}  # proxy -> _PooledContext
+        self._locks = {}     # proxy -> asyncio.Lock (동시 생성 방지)
+        self.created_count = 0
+        self.recycled_count = 0
+
+    async def _create_context(self, proxy):
+        context_args = {}
+        if proxy:
+            context_args['proxy'] = {"server": f"http://{proxy}"}
+        context = await self.browser.new_context(**context_args)
+        try:
+            if self.setup_context:
+                await self.setup_context(context)
+        except Exception:
+            await context.close()
+            raise
+        self.created_count += 1
+        return _PooledContext(context)
+
+    async def _close_entry(self, entry):
+        try:
+            await entry.context.close()
+        except Exception as e:
+            logger.debug(f"컨텍스트 종료 중 오류 (무시): {e}")
+
+    async def acquire(self, proxy):
+        """프록시에 해당하는 워밍된 컨텍스트에서 페이지를 하나 꺼냅니다."""
+        lock = self._locks.setdefault(proxy, asyncio.Lock())
+        async with lock:
+            entry = self._contexts.get(proxy)
+            if entry is None or entry.retiring:
+                entry = await self._create_context(proxy)
+                self._contexts[proxy] = entry
+
+            entry.in_use += 1
+            entry.pages_served += 1
+            if entry.pages_served >= self.max_pages_per_context:
+                # 이번 페이지를 마지막으로 교체 예정 (다음 요청부터는 새 컨텍스트 사용)
+                self._retire(proxy, entry)
+
+        try:
+            page = entry.idle_pages.pop() if entry.idle_pages else await entry.context.new_page()
+        except Exception:
+            await self.release(proxy, entry, None, failed=True)
+            raise
+        return entry, page
+
+    def _retire(self, proxy, entry):
+        if not entry.retiring:
+            entry.retiring = True
+            self.recycled_count += 1
+        if self._contexts.get(proxy) is entry:
+            del self._contexts[proxy]
+
+    async def release(self, proxy, entry, page, failed=False):
+        """페이지를 반환합니다. failed=True이면 해당 컨텍스트를 교체 대상으로 표시합니다."""
+        entry.in_use -= 1
+        if failed:
+            self._retire(proxy, entry)
+
+        if page is not None:
+            if entry.retiring or page.is_closed():
+                try:
+                    if not page.is_closed():
+                        await page.close()
+                except Exception:
+                    pass
+            else:
+                entry.idle_pages.append(page)
+
+        if entry.retiring and entry.in_use == 0:
+            await self._close_entry(entry)
+
+    @asynccontextmanager
+    async def page(self, proxy):
+        """
+        async with pool.page(proxy) as page: 형태로 사용합니다.
+        블록 안에서 예외가 발생하면 컨텍스트가 교체됩니다.
+        """
+        entry, page = await self.acquire(proxy)
+        failed = False
+        try:
+            yield page
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            await self.release(proxy, entry, page, failed=failed)
+
+    async def close(self):
+        """풀에 남아 있는 모든 컨텍스트를 종료합니다."""
+        entries = list(self._contexts.values())
+        self._contexts.clear()
+        for entry in entries:
+            await self._close_entry(entry)
@@ -1,170 +1,11 @@
-from playwright.async_api import async_playwright, TimeoutError
-from playwright_stealth import Stealth
+from playwright.async_api import async_playwright
 import asyncio
 import json
-import os
 import re
-from datetime import datetime
-from urllib.parse import urlparse
-
-# --- 1.py에서 복사해온 상수 시작 ---
-
-# 제품군별 가격 매핑 (달러 기준)
-CATEGORY_PRICES = {
-    "hoodies": 59.99,
-    "knitted crewnecks": 59.99,
-    "t-shirts": 29.99,
-    "enamel pins": 19.99,
-    "vinyl figures": 29.99,
-    "plushies": 29.99,
-    "longbois": 36.99,
-    "doughbois": 39.99,
-    "jumbo plushies": 39.99,
-    "keychain plushies": 15.99,
-    "sweatpants": 54.99,
-    "ball cap": 24.99,
-    # 한국어 제품군명도 추가 (혹시 모를 경우를 대비)
-    "후디": 59.99,
-    "니트 크루넥": 59.99,
-    "티셔츠": 29.99,
-    "에나멜 핀": 19.99,
-    "비닐 피규어": 29.99,
-    "플러시": 29.99,
-    "롱보이": 36.99,
-    "도우보이": 39.99,
-    "점보 플러시": 39.99,
-    "키체인 플러시": 15.99,
-    "스웨트팬츠": 54.99,
-    "볼 캡": 24.99
-}
-
-# --- 1.py에서 복사해온 상수 끝 ---
-
-def get_category_price(category):
-    if not category or category == "제품군을 찾을 수 없습니다.":
-        return 0.0
-    category_lower = category.lower()
-    if category_lower in CATEGORY_PRICES:
-        return CATEGORY_PRICES[category_lower]
-    for key in CATEGORY_PRICES:
-        if key in category_lower or category_lower in key:
-            return CATEGORY_PRICES[key]
-    print(f"경고: 제품군 '{category}'에 대한 가격 정보를 찾을 수 없습니다.")
-    return 29.99
-
-def calculate_revenue(sales_volume, category, product_price):
-    try:
-        # 판매량이 정보 없음인 경우만 0 반환
-        if not sales_volume or sales_volume == "판매량 정보를 찾을 수 없습니다.":
-            return 0.0
-        
-        # Sold Out인 경우 최소 목표 수량(200개)로 가정하여 매출 계산
-        if sales_volume == "Sold Out":
-            sales_count = 200  # Sold Out은 최소 목표 달성을 의미하므로 200개로 가정
-            
-            # 실제 크롤링한 가격이 있으면 사용, 없으면 제품군별 하드코딩 가격 사용
-            actual_price = 0.0
-            if product_price and product_price != "가격을 찾을 수 없습니다.":
-                price_match = re.search(r'(\d+\.?\d*)', str(product_price).replace(',', ''))
-                if price_match:
-                    actual_price = float(price_match.group(1))
-            
-            if actual_price == 0.0:
-                actual_price = get_category_price(category)
-            
-            revenue = sales_count * actual_price
-            print(f"'Sold Out' 제품 - 최소 {sales_count}개 판매 가정, 가격: ${actual_price}, 매출: ${revenue:.2f}")
-            return round(revenue, 2)
-        
-        sales_match = re.search(r'(\d+)', str(sales_volume).replace(',', ''))
-        if sales_match:
-            sales_count = int(sales_match.group(1))
-            actual_price = 0.0
-            if product_price and product_price != "가격을 찾을 수 없습니다.":
-                price_match = re.search(r'(\d+\.?\d*)', str(product_price).replace(',', ''))
-                if price_match:
-                    actual_price = float(price_match.group(1))
-            if actual_price == 0.0:
-                actual_price = get_category_price(category)
-
-            revenue = sales_count * actual_price
-            return round(revenue, 2)
-        else:
-            return 0.0
-    except Exception as e:
-        print(f"매출 계산 중 오류: {e}")
-        return 0.0
-
-def process_sales_data(sales_raw_text, funded_raw_text):
-    processed_sales = "판매량 정보를 찾을 수 없습니다."
-    processed_rate = "달성률 정보를 찾을 수 없습니다."
-
-    # 1. 판매량 파싱
-    if sales_raw_text and sales_raw_text != "정보 없음":
-        sold_of_pattern = r'([0-9,]+)\s+of\s+([0-9,]+)\s+sold'
-        sold_of_match = re.search(sold_of_pattern, sales_raw_text, re.IGNORECASE)
-        if sold_of_match:
-            processed_sales = sold_of_match.group(1).replace(',', '')
-        else:
-            sold_only_pattern = r'([0-9,]+)\s+sold'
-            sold_only_match = re.search(sold_only_pattern, sales_raw_text, re.IGNORECASE)
-            if sold_only_match:
-                processed_sales = sold_only_match.group(1).replace(',', '')
-            elif "Sold Out" in sales_raw_text:
-                processed_sales = "Sold Out"
-
-    # 2. 달성률 파싱
-    if funded_raw_text and funded_raw_text != "정보 없음":
-        funded_pattern = r'([0-9,]+%)(?:\s*\+)?\s+Funded' # '+' 기호 처리 추가
-        funded_match = re.search(funded_pattern, funded_raw_text, re.IGNORECASE)
-        if funded_match:
-            processed_rate = funded_match.group(1).replace(',', '')
-        elif "Sold Out" in funded_raw_text:
-            processed_rate = "Sold Out"
-
-    # 3. 판매량 기반 달성률 계산 (X of Y sold -> X/Y 비율) - 명시적인 달성률이 없을 때만 시도
-    if processed_rate == "달성률 정보를 찾을 수 없습니다." and processed_sales != "판매량 정보를 찾을 수 없습니다." and processed_sales != "Sold Out" and "of" in sales_raw_text:
-        sold_of_pattern = r'([0-9,]+)\s+of\s+([0-9,]+)\s+sold'
-        sold_of_match = re.search(sold_of_pattern, sales_raw_text, re.IGNORECASE)
-        if sold_of_match:
-            x_val = int(sold_of_match.group(1).replace(',', ''))
-            y_val_str = sold_of_match.group(2).replace(',', '')
-            y_val = int(y_val_str) if y_val_str.isdigit() else 0
-            if y_val > 0:
-                processed_rate = f"{(x_val / y_val * 100):.1f}%"
-            else:
-                processed_rate = "0.0%"
-
-    # 모든 정보가 없을 경우 최종적으로 Sold Out 처리
-    if processed_sales == "판매량 정보를 찾을 수 없습니다." and processed_rate == "달성률 정보를 찾을 수 없습니다." and ("Sold Out" in sales_raw_text or "Sold Out" in funded_raw_text):
-        processed_sales = "Sold Out"
-        processed_rate = "Sold Out"
-
-    return processed_sales, processed_rate
-
-def normalize_date(date_str):
-    if not date_str or date_str == '정보 없음':
-        return '정보 없음'
-    parts = date_str.split(' / ')
-    project_end_date_part = parts[0].strip()
-    try:
-        project_end_date_clean = ' '.join(project_end_date_part.split(' ')[:3])
-        dt_object = datetime.strptime(project_end_date_clean.replace(',', ''), '%B %d %Y')
-        return dt_object.strftime('%Y-%m-%d')
-    except ValueError:
-        pass
-    if 'Ships ' in date_str:
-        ship_date_part = date_str.split('Ships ')[-1].strip()
-        try:
-            dt_object = datetime.strptime(ship_date_part.replace(',', ''), '%B %d %Y')
-            return dt_object.strftime('%Y-%m-%d')
-        except ValueError:
-            pass
-    try:
-        dt_object = datetime.strptime(date_str.replace(',', ''), '%B %d %Y')
-        return dt_object.strftime('%Y-%m-%d')
-    except ValueError:
-        return '정보 없음'
+from page_readiness import wait_for_product_ready
+from stealth_script import apply_stealth # stealth 스크립트는 한 번만 생성해 프록시 시도마다 재사용
+from makeship_site import is_simulated, site_url # MAKESHIP_BASE_URL 지정 시 로컬 시뮬레이터로 요청
+from makeship_parsing import calculate_revenue, get_category_price, normalize_date, process_sales_data # 1.py와 같은 파싱 로직
 
 def load_proxies_from_file(filename="proxy.txt"):
     proxies = []
@@ -189,7 +30,7 @@ async def debug_page_structure(url: str):
     proxies = load_proxies_from_file('proxy.txt')
     async with async_playwright() as p:
         browser = None
-        proxy_list = [None] + proxies 
+        proxy_list = [None] if is_simulated() else [None] + proxies # 시뮬레이터는 직접 연결만 사용
         
         for proxy in proxy_list:
             context = None
@@ -207,17 +48,17 @@ async def debug_page_structure(url: str):
 
                 context = await browser.new_context(**context_args)
                 
-                stealth_instance = Stealth()
-                await stealth_instance.apply_stealth_async(context)
+                await apply_stealth(context) # 프록시마다 Stealth()를 새로 만들지 않음
 
                 page = await context.new_page()
 
                 print(f"페이지 로딩: {url}")
-                await page.goto(url, wait_until='domcontentloaded', timeout=60000)
+                await page.goto(site_url(url), wait_until='domcontentloaded', timeout=60000)
 
                 print("페이지 로드 완료. 제품 타이틀 셀렉터 대기 중...")
                 await page.wait_for_selector('[class*="ProductDetails__ProductTitle"]', timeout=30000)
-                await asyncio.sleep(2)
+                readiness = await wait_for_product_ready(page)
+                print(f"페이지 준비 완료: 사유={readiness['사유']}, 대기={readiness['대기_ms']:.0f}ms, 누락 필드={readiness['누락_필드']}")
                 print("\n--- 데이터 추출 시도 및 디버그 정보 ---")
 
                 # (All data extraction logic needs to be inside this try block)
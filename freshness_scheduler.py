@@ -0,0 +1,159 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+# 제품별 마지막 수집 시각과 다음 수집 예정 시각을 저장하는 파일
+DEFAULT_SCHEDULE_FILE = "makeship_schedule.json"
+
+# 종료 후 최종 판매량/달성률이 확정될 때까지 기다리는 기간 (이후 한 번 수집하면 고정)
+FINAL_GRACE = timedelta(days=2)
+
+# 진행 중 캠페인의 남은 기간별 재수집 간격 (종료가 가까울수록 자주)
+LIVE_POLL_INTERVALS = (
+    (timedelta(days=1), timedelta(hours=1)),
+    (timedelta(days=3), timedelta(hours=3)),
+    (timedelta(days=7), timedelta(hours=12)),
+)
+LIVE_DEFAULT_INTERVAL = timedelta(hours=24)
+# 종료일을 알 수 없는 진행 중 캠페인 / 추출 실패 레코드의 재수집 간격
+UNKNOWN_END_INTERVAL = timedelta(hours=12)
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        return None
+
+
+def _has_final_numbers(product):
+    """판매량/달성률이 정상적으로 추출된 레코드인지 확인합니다."""
+    for key in ("판매량", "달성률"):
+        value = product.get(key)
+        if value in (None, "", "정보 없음") or (isinstance(value, str) and "찾을 수 없습니다" in value):
+            return False
+    return True
+
+
+def compute_next_due(product, last_scraped, now=None):
+    """
+    제품 레코드와 마지막 수집 시각으로 다음 수집 예정 시각을 계산합니다.
+    더 이상 수집할 필요가 없는(고정된) 제품이면 None을 반환합니다.
+    last_scraped가 None이면 이전 JSON에서 불러온 레코드(수집 시각 미상)로 간주합니다.
+    """
+    now = now or datetime.now()
+    if not _has_final_numbers(product):
+        return last_scraped + UNKNOWN_END_INTERVAL if last_scraped else now
+
+    status = product.get("진행_여부")
+    end_date = _parse_date(product.get("프로젝트_종료일"))
+
+    if status == "종료":
+        # 종료 상태로 수집된 레코드: 종료일과 수집 시각을 모두 알고, 종료 후 충분히 지난 뒤 수집했을 때만 고정
+        # (종료일이 추출되지 않으면 진행_여부가 기본값 '종료'가 되므로, 종료일 미상은 진행 중일 수 있음)
+        if end_date is None:
+            return last_scraped + UNKNOWN_END_INTERVAL if last_scraped else now
+        if last_scraped is None:
+            return now  # 이전 JSON에서 불러온 레코드: 확정 여부를 모르므로 한 번 다시 수집
+        if last_scraped >= end_date + FINAL_GRACE:
+            return None
+        return end_date + FINAL_GRACE
+
+    if status == "진행 중":
+        base = last_scraped or now
+        if end_date is None:
+            return base + UNKNOWN_END_INTERVAL if last_scraped else now
+        if now >= end_date:
+            # 종료일이 지났으면 종료 상태와 최종 수치를 확인하기 위해 다시 수집
+            # (확정 시점 이후에도 진행 중으로 표시되면 연장된 캠페인으로 보고 주기적으로 확인)
+            if last_scraped and last_scraped >= end_date + FINAL_GRACE:
+                return last_scraped + UNKNOWN_END_INTERVAL
+            return now
+        remaining = end_date - now
+        interval = LIVE_DEFAULT_INTERVAL
+        for threshold, poll_interval in LIVE_POLL_INTERVALS:
+            if remaining <= threshold:
+                interval = poll_interval
+                break
+        return min(base + interval, end_date + FINAL_GRACE)
+
+    # 상태를 알 수 없는 레코드는 다음 실행에서 다시 수집
+    return now
+
+
+class FreshnessScheduler:
+    """
+    진행_여부와 프로젝트_종료일을 기준으로 제품별 다음 수집 시각을 관리합니다.
+    - 처음 보는 URL은 즉시 수집
+    - 진행 중 캠페인은 종료일이 가까울수록 자주 수집
+    - 종료된 캠페인은 종료 후 FINAL_GRACE가 지난 시점에 한 번 수집한 뒤 고정
+    """
+
+    def __init__(self, path=DEFAULT_SCHEDULE_FILE):
+        self.path = path
+        self.entries = {}  # url -> {"마지막_수집": str, "다음_수집": str | None}
+
+    @classmethod
+    def load(cls, path=DEFAULT_SCHEDULE_FILE):
+        scheduler = cls(path)
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    scheduler.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"스케줄 파일 '{path}' 로드 중 오류 발생 (새로 시작): {e}")
+        return scheduler
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _last_scraped(self, url):
+        entry = self.entries.get(url)
+        if entry and entry.get("마지막_수집"):
+            return datetime.strptime(entry["마지막_수집"], TIME_FORMAT)
+        return None
+
+    def is_due(self, url, product, now=None):
+        """지금 수집해야 하는 URL인지 판단합니다. product가 None이면 처음 보는 URL입니다."""
+        now = now or datetime.now()
+        if product is None:
+            return True
+        next_due = compute_next_due(product, self._last_scraped(url), now)
+        return next_due is not None and next_due <= now
+
+    def filter_due(self, urls, known_products, now=None):
+        """urls 중 지금 수집해야 하는 URL만 반환합니다. (순서 유지)"""
+        now = now or datetime.now()
+        return [url for url in urls if self.is_due(url, known_products.get(url), now)]
+
+    def record_scraped(self, product, scraped_at=None):
+        """수집 완료된 레코드를 반영하여 다음 수집 시각을 갱신합니다."""
+        scraped_at = scraped_at or datetime.now()
+        next_due = compute_next_due(product, scraped_at, scraped_at)
+        self.entries[product["제품_URL"]] = {
+            "마지막_수집": scraped_at.strftime(TIME_FORMAT),
+            "다음_수집": next_due.strftime(TIME_FORMAT) if next_due else None,
+        }
+
+    def summary(self, urls, known_products, now=None):
+        """URL 목록을 신규 / 수집 예정 / 대기 / 고정으로 분류한 개수를 반환합니다."""
+        now = now or datetime.now()
+        counts = {"신규": 0, "수집_예정": 0, "대기": 0, "고정": 0}
+        for url in urls:
+            product = known_products.get(url)
+            if product is None:
+                counts["신규"] += 1
+                continue
+            next_due = compute_next_due(product, self._last_scraped(url), now)
+            if next_due is None:
+                counts["고정"] += 1
+            elif next_due <= now:
+                counts["수집_예정"] += 1
+            else:
+                counts["대기"] += 1
+        return counts
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+import weakref
+from collections import defaultdict
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlparse
+
+# 같은 호스트에 동시에 보내는 요청 수와 요청 간 최소 간격 (목록 수집기 기본값)
+DEFAULT_PER_HOST_LIMIT = 2
+DEFAULT_MIN_INTERVAL = 1.0
+
+
+class HostPoliteness:
+    """
+    호스트별 예의(politeness) 제한. 여러 스레드(브라우저)가 같은 사이트를 동시에 수집할 때 사용합니다.
+
+    - per_host_limit: 한 호스트에서 동시에 진행 중인 작업(카테고리 수집 등) 수 상한
+    - min_interval: 같은 호스트로 보내는 요청(페이지 이동, 스크롤 로딩) 사이의 최소 간격(초)
+
+    사용 예:
+        with politeness.slot(url):          # 호스트별 동시 작업 수 제한
+            politeness.wait_turn(url)       # 요청 직전마다 호출 (최소 간격 보장)
+            driver.get(url)
+
+    비동기 코드에서는 async_slot / wait_turn_async를 사용합니다. (요청 간격 예약은 스레드 쪽과 공유)
+    """
+
+    def __init__(self, per_host_limit=DEFAULT_PER_HOST_LIMIT, min_interval=DEFAULT_MIN_INTERVAL):
+        self.per_host_limit = max(1, per_host_limit)
+        self.min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._semaphores = defaultdict(lambda: threading.BoundedSemaphore(self.per_host_limit))
+        self._async_semaphores = weakref.WeakKeyDictionary()  # 이벤트 루프 -> 호스트 -> asyncio.Semaphore (asyncio.run마다 새 루프)
+        self._next_allowed = defaultdict(float)  # 호스트 -> 다음 요청을 보낼 수 있는 시각 (monotonic)
+        self.waited_seconds = 0.0
+
+    @staticmethod
+    def host_of(url):
+        return urlparse(url).hostname or ""
+
+    @contextmanager
+    def slot(self, url):
+        with self._lock:
+            semaphore = self._semaphores[self.host_of(url)]
+        with semaphore:
+            yield
+
+    @asynccontextmanager
+    async def async_slot(self, url):
+        semaphores = self._async_semaphores.setdefault(asyncio.get_running_loop(), {})
+        host = self.host_of(url)
+        if host not in semaphores:
+            semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        async with semaphores[host]:
+            yield
+
+    def _reserve(self, url):
+        """같은 호스트의 다음 요청 시각을 예약하고, 지금부터 기다려야 하는 시간(초)을 반환합니다."""
+        host = self.host_of(url)
+        with self._lock:
+            now = time.monotonic()
+            scheduled = max(now, self._next_allowed[host])
+            self._next_allowed[host] = scheduled + self.min_interval
+            delay = scheduled - now
+            if delay > 0:
+                self.waited_seconds += delay
+        return delay
+
+    def wait_turn(self, url):
+        """같은 호스트의 직전 요청으로부터 min_interval이 지날 때까지 기다립니다. (요청 순서대로 간격을 예약)"""
+        delay = self._reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_turn_async(self, url):
+        """wait_turn의 비동기 버전 (이벤트 루프를 막지 않고 기다림)"""
+        delay = self._reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def print_summary(self):
+        print(f"호스트별 제한: 동시 {self.per_host_limit}개, 요청 간격 {self.min_interval}초 (대기 합계 {self.waited_seconds:.1f}초)")
@@ -0,0 +1,154 @@
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+
+# 1.py가 실행 중에 완료된 제품을 한 줄씩 기록하는 로그 파일
+DEFAULT_CHECKPOINT_FILE = "makeship_checkpoint.jsonl"
+
+_STOP = object()
+
+
+class CheckpointWriter:
+    """
+    완료된 제품 레코드를 JSONL 파일에 즉시 추가하는 기록기.
+
+    write()는 큐에 넣기만 하므로 이벤트 루프를 막지 않으며, 실제 파일 쓰기와 flush는
+    백그라운드 스레드에서 flush_every개 또는 flush_interval초마다 일괄 처리됩니다.
+    """
+
+    def __init__(self, path=DEFAULT_CHECKPOINT_FILE, flush_every=20, flush_interval=2.0, fsync=False):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.written_count = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, record):
+        """레코드를 기록 대기열에 추가합니다. (논블로킹)"""
+        self._queue.put(record)
+
+    def _ends_with_newline(self):
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return True
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _run(self):
+        needs_newline = not self._ends_with_newline()
+        with open(self.path, "a", encoding="utf-8") as f:
+            if needs_newline:
+                f.write("\n") # 중단으로 잘린 마지막 줄과 새 레코드가 붙지 않도록 줄바꿈 추가
+            pending = 0
+            last_flush = time.monotonic()
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    item = None
+
+                if item is _STOP:
+                    break
+                if item is not None:
+                    f.write(json.dumps(item, ensure_ascii=False) + "\n")
+                    pending += 1
+                    self.written_count += 1
+
+                if pending and (pending >= self.flush_every or time.monotonic() - last_flush >= self.flush_interval):
+                    self._flush(f)
+                    pending = 0
+                    last_flush = time.monotonic()
+
+            # 종료 전에 남은 레코드를 모두 기록
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    f.write(json.dumps(item, ensure_ascii=False) + "\n")
+                    self.written_count += 1
+            self._flush(f)
+
+    def _flush(self, f):
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    def close(self):
+        """남은 레코드를 모두 기록하고 백그라운드 스레드를 종료합니다."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+
+def iter_checkpoint(path=DEFAULT_CHECKPOINT_FILE):
+    """체크포인트 로그의 레코드를 순서대로 반환합니다. 중단으로 잘린 마지막 줄은 건너뜁니다."""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                print(f"체크포인트 {line_no}번째 줄을 읽을 수 없어 건너뜁니다. (중단 시 잘린 줄)")
+
+
+def load_checkpoint(path=DEFAULT_CHECKPOINT_FILE):
+    """체크포인트 로그를 URL별 최신 레코드 딕셔너리로 로드합니다."""
+    records = {}
+    for record in iter_checkpoint(path):
+        url = record.get("제품_URL")
+        if url:
+            records[url] = record
+    return records
+
+
+def compact_checkpoint(path=DEFAULT_CHECKPOINT_FILE, base_records=None, output_filename=None):
+    """
+    체크포인트 로그를 기존 결과(base_records)와 병합하여 makeship_all_products_<ts>.json 형식으로 저장합니다.
+    path에는 로그 파일 하나 또는 여러 개(샤드별 로그)의 목록을 지정할 수 있습니다.
+    로그에 있는 레코드가 같은 URL의 기존 레코드보다 우선합니다. 저장된 파일명을 반환합니다.
+    """
+    paths = [path] if isinstance(path, str) else list(path)
+    merged = dict(base_records or {})
+    for log_path in paths:
+        merged.update(load_checkpoint(log_path))
+
+    final_data = {
+        "추출_시간": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "총_제품_수": len(merged),
+        "제품_목록": list(merged.values())
+    }
+    if output_filename is None:
+        output_filename = f"makeship_all_products_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+    tmp_filename = output_filename + ".tmp"
+    with open(tmp_filename, "w", encoding="utf-8") as f:
+        json.dump(final_data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_filename, output_filename)
+    return output_filename
+
+
+def main():
+    """중단된 실행의 체크포인트 로그를 JSON 결과 파일로 변환합니다."""
+    paths = [path for path in (sys.argv[1:] or [DEFAULT_CHECKPOINT_FILE]) if os.path.exists(path)]
+    if not paths:
+        print("체크포인트 파일이 없습니다.")
+        return
+    record_count = sum(len(load_checkpoint(path)) for path in paths)
+    filename = compact_checkpoint(paths)
+    print(f"{len(paths)}개 체크포인트의 {record_count}개 레코드를 '{filename}' 파일로 저장했습니다.")
+
+
+if __name__ == "__main__":
+    main()
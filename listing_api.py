@@ -0,0 +1,264 @@
+import asyncio
+import json
+import os
+import re
+import time
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import aiohttp
+
+from makeship_site import CANONICAL_BASE_URL, canonical_url, site_url
+from next_data_fetcher import USER_AGENT
+from scrape_logging import get_logger
+
+# 목록 페이지(/shop/...)가 스크롤할 때 불러오는 JSON 요청을 한 번 기록해 두고, 이후에는 그 API를 직접 페이지 단위로 호출합니다.
+#   1) capture_listing_endpoint: 브라우저로 목록 페이지를 열고 맨 아래로 스크롤해 fetch/XHR 요청 중 페이지 파라미터가 있는 것을 찾음
+#   2) ListingApiClient.discover: aiohttp 세션 하나로 offset/page/cursor를 넘기며 상품 링크 수집
+# 기록한 엔드포인트는 DEFAULT_ENDPOINT_FILE에 저장되므로 다음 실행부터는 브라우저를 띄우지 않습니다.
+
+logger = get_logger("discovery")
+
+# 2.py의 제품 결과 파일 패턴(makeship_*_*.json)에 걸리지 않는 이름을 사용
+DEFAULT_ENDPOINT_FILE = "listing_endpoints.json"
+# 예전 파일명 (처음 읽을 때 DEFAULT_ENDPOINT_FILE로 옮김)
+LEGACY_ENDPOINT_FILE = "makeship_listing_endpoints.json"
+
+# 페이지를 넘기는 쿼리 파라미터 -> 넘기는 방식
+PAGING_PARAMS = {
+    "offset": "offset", "skip": "offset", "start": "offset", "from": "offset",
+    "page": "page",
+    "cursor": "cursor", "after": "cursor",
+}
+# 응답 JSON에서 다음 페이지 위치 / 전체 개수를 찾을 때 사용하는 키 후보 (앞에 있을수록 우선)
+NEXT_KEYS = ("nextCursor", "endCursor", "cursor", "next")
+TOTAL_KEYS = ("total", "totalCount", "total_count", "totalProducts")
+
+PRODUCT_PATH_PATTERN = re.compile(r'/products/([A-Za-z0-9][A-Za-z0-9_-]*)')
+
+# 전체 개수를 알 때 한 번에 동시에 요청하는 페이지 수 (한 묶음에서 새 링크가 없으면 중단)
+PAGE_BATCH_SIZE = 8
+
+# 캡처할 때 스크롤 후 요청이 기록될 때까지 기다리는 최대 시간(초)
+CAPTURE_TIMEOUT = 10
+
+# 페이지에서 지금까지 발생한 fetch/XHR 요청 URL 목록
+RESOURCE_REQUESTS_SCRIPT = """
+return performance.getEntriesByType('resource')
+    .filter((entry) => entry.initiatorType === 'fetch' || entry.initiatorType === 'xmlhttprequest')
+    .map((entry) => entry.name);
+"""
+
+
+def find_paging_endpoint(request_urls):
+    """
+    기록된 요청 URL 중 페이지 파라미터(offset/page/cursor 등)가 있는 마지막 요청을 엔드포인트로 고릅니다.
+    반환값: {"url": 실제 사이트 기준 URL, "param": 파라미터 이름, "kind": offset|page|cursor} 또는 None
+    """
+    for url in reversed(request_urls):
+        for name, _ in parse_qsl(urlparse(url).query, keep_blank_values=True):
+            if name in PAGING_PARAMS:
+                return {"url": canonical_url(url), "param": name, "kind": PAGING_PARAMS[name]}
+    return None
+
+
+def capture_listing_endpoint(driver, listing_url, timeout=CAPTURE_TIMEOUT):
+    """
+    브라우저로 목록 페이지를 열고 맨 아래로 스크롤해, 다음 목록을 불러오는 API 요청을 기록합니다. (찾지 못하면 None)
+    driver는 get / execute_script만 사용하므로 Selenium 드라이버를 그대로 넘기면 됩니다.
+    """
+    driver.get(site_url(listing_url))
+    time.sleep(2)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        time.sleep(1)
+        endpoint = find_paging_endpoint(driver.execute_script(RESOURCE_REQUESTS_SCRIPT) or [])
+        if endpoint:
+            endpoint["captured_at"] = time.strftime('%Y-%m-%d %H:%M:%S')
+            return endpoint
+    return None
+
+
+def load_endpoints(filename=DEFAULT_ENDPOINT_FILE):
+    """목록 페이지 URL -> 기록된 엔드포인트"""
+    if filename == DEFAULT_ENDPOINT_FILE and not os.path.exists(filename) and os.path.exists(LEGACY_ENDPOINT_FILE):
+        os.replace(LEGACY_ENDPOINT_FILE, filename)
+        logger.info(f"엔드포인트 파일을 '{LEGACY_ENDPOINT_FILE}'에서 '{filename}'(으)로 옮겼습니다.")
+    if not os.path.exists(filename):
+        return {}
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"엔드포인트 파일을 읽지 못했습니다 ({filename}): {e}")
+        return {}
+
+
+def save_endpoints(endpoints, filename=DEFAULT_ENDPOINT_FILE):
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(endpoints, f, ensure_ascii=False, indent=2)
+
+
+def page_url(endpoint, value):
+    """엔드포인트 URL의 페이지 파라미터만 value로 바꾼 요청 URL (요청은 site_url 기준)"""
+    parsed = urlparse(site_url(endpoint["url"]))
+    query = [(name, str(value) if name == endpoint["param"] else current)
+             for name, current in parse_qsl(parsed.query, keep_blank_values=True)]
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+
+def start_value(endpoint):
+    """캡처한 URL과 상관없이 첫 페이지부터 시작하도록 페이지 파라미터의 시작 값을 정합니다."""
+    if endpoint["kind"] == "offset":
+        return 0
+    if endpoint["kind"] == "page":
+        current = dict(parse_qsl(urlparse(endpoint["url"]).query)).get(endpoint["param"], "1")
+        return 0 if current == "0" else 1  # 0부터 세는 API인지 1부터 세는 API인지 캡처한 값으로 추정
+    return ""
+
+
+def _find_key(node, keys, max_depth=3):
+    """응답 JSON의 위쪽 몇 단계에서 keys 중 하나에 해당하는 값을 찾습니다."""
+    if max_depth < 0 or not isinstance(node, dict):
+        return None
+    for key in keys:
+        if node.get(key) not in (None, ""):
+            return node[key]
+    for child in node.values():
+        found = _find_key(child, keys, max_depth - 1)
+        if found is not None:
+            return found
+    return None
+
+
+def extract_product_links(data):
+    """응답 JSON 안의 문자열(HTML 조각 포함)과 handle 값에서 상품 링크를 찾습니다. (실제 사이트 기준 URL)"""
+    handles = []
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            handle = node.get("handle")
+            if isinstance(handle, str) and handle:
+                handles.append(handle)
+            stack.extend(value for key, value in node.items() if key != "handle")
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, str) and '/products/' in node:
+            handles.extend(PRODUCT_PATH_PATTERN.findall(node))
+    return {f"{CANONICAL_BASE_URL}/products/{handle}" for handle in handles}
+
+
+class ListingApiClient:
+    """
+    기록한 목록 API를 직접 호출해 상품 링크를 모으는 비동기 HTTP 수집기.
+    하나의 aiohttp 세션(커넥션 풀)을 공유하고, 요청마다 HostPoliteness의 호스트별 동시 요청 수/간격을 지킵니다.
+    """
+
+    def __init__(self, politeness, max_connections=10, timeout=15):
+        self.politeness = politeness
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.session = None
+        self.requests = 0
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": USER_AGENT, "Accept": "application/json"},
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def fetch_page(self, endpoint, value):
+        url = page_url(endpoint, value)
+        async with self.politeness.async_slot(url):
+            await self.politeness.wait_turn_async(url)
+            self.requests += 1
+            async with self.session.get(url) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+
+    async def discover(self, endpoint, max_products=1000):
+        """
+        엔드포인트를 첫 페이지부터 넘기며 상품 링크를 모읍니다.
+        반환값: (정렬된 링크 목록 - 최대 max_products개, 응답에 표시된 전체 개수 또는 None)
+        offset/page 방식이고 첫 응답에 전체 개수가 있으면 나머지 페이지는 PAGE_BATCH_SIZE개씩 동시에 요청합니다.
+        (동시 수는 politeness가 제한, 목록이 중간에 끊기는 API면 빈 묶음에서 중단)
+        """
+        value = start_value(endpoint)
+        first = await self.fetch_page(endpoint, value)
+        links = extract_product_links(first)
+        total = _find_key(first, TOTAL_KEYS)
+        total = int(total) if isinstance(total, (int, float)) or str(total).isdigit() else None
+        page_size = len(links)
+        if not links:
+            return [], total
+
+        limit = min(total, max_products) if total is not None else max_products
+        if endpoint["kind"] != "cursor" and total is not None:
+            if endpoint["kind"] == "offset":
+                values = range(value + page_size, limit, page_size)
+            else:
+                values = range(value + 1, value + (limit + page_size - 1) // page_size)
+            for start in range(0, len(values), PAGE_BATCH_SIZE):
+                pages = await asyncio.gather(*(self.fetch_page(endpoint, v)
+                                               for v in values[start:start + PAGE_BATCH_SIZE]))
+                before = len(links)
+                for page in pages:
+                    links.update(extract_product_links(page))
+                if len(links) == before:
+                    break
+            return sorted(links)[:limit], total
+
+        # 전체 개수를 모르거나 cursor 방식: 빈 페이지/다음 위치 없음/목표 수 도달까지 순서대로 요청
+        page = first
+        while len(links) < limit:
+            next_value = _find_key(page, NEXT_KEYS)
+            if endpoint["kind"] == "cursor":
+                if next_value in (None, "", False):
+                    break
+                value = next_value
+            elif endpoint["kind"] == "offset":
+                value = next_value if isinstance(next_value, int) else value + page_size
+            else:
+                value += 1
+            page = await self.fetch_page(endpoint, value)
+            new_links = extract_product_links(page) - links
+            if not new_links:
+                break
+            links.update(new_links)
+        return sorted(links)[:limit], total
+
+
+async def discover_listings(targets, endpoints, politeness):
+    """
+    targets: [(이름, 목록 페이지 URL, 최대 상품 수)]
+    endpoints: 목록 페이지 URL -> 기록된 엔드포인트
+    반환값: 이름 -> (링크 목록, 전체 개수) / API로 수집하지 못한 카테고리는 None (스크롤 방식으로 대체)
+    """
+    async with ListingApiClient(politeness) as client:
+        async def run(name, url, max_products):
+            endpoint = endpoints.get(url)
+            if not endpoint:
+                return None
+            try:
+                links, total = await client.discover(endpoint, max_products)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.warning(f"  ❌ [{name}] API 수집 실패: {e}")
+                return None
+            if not links:
+                logger.warning(f"  ⚠️ [{name}] API 응답에서 상품 링크를 찾지 못했습니다.")
+                return None
+            logger.info(f"  ✅ [{name}] API로 {len(links)}개 수집" + (f" (전체 {total}개)" if total is not None else ""))
+            return links, total
+
+        results = await asyncio.gather(*(run(name, url, max_products) for name, url, max_products in targets))
+        print(f"목록 API 요청 수: {client.requests}회")
+    return {name: result for (name, _, _), result in zip(targets, results)}
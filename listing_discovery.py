@@ -0,0 +1,234 @@
+import asyncio
+
+from makeship_site import CANONICAL_BASE_URL, canonical_url, site_url
+from scrape_logging import get_logger
+
+# 카테고리 목록 페이지에서 상품 링크를 찾는 공용 코드.
+# complete_infinite_extractor.py(Selenium)와 1.py --discover(Playwright, 스크래핑과 같은 이벤트 루프)가 함께 사용합니다.
+
+logger = get_logger("discovery")
+
+# 카테고리 URL 목록 (past는 805개 한계 적용)
+CATEGORY_CONFIGS = {
+    "후디": {
+        "url": "https://www.makeship.com/shop/hoodies",
+        "max_products": 200
+    },
+    "니트 크루넥": {
+        "url": "https://www.makeship.com/shop/knitted-crewnecks",
+        "max_products": 100
+    },
+    "티셔츠": {
+        "url": "https://www.makeship.com/shop/t-shirts",
+        "max_products": 100
+    },
+    "에나멜 핀": {
+        "url": "https://www.makeship.com/shop/enamel-pins",
+        "max_products": 200
+    },
+    "비닐 피규어": {
+        "url": "https://www.makeship.com/shop/vinyl-figures",
+        "max_products": 200
+    },
+    "플러시": {
+        "url": "https://www.makeship.com/shop/plushies",
+        "max_products": 300
+    },
+    "롱보이": {
+        "url": "https://www.makeship.com/shop/longbois",
+        "max_products": 100
+    },
+    "도우보이": {
+        "url": "https://www.makeship.com/shop/doughbois",
+        "max_products": 100
+    },
+    "점보 플러시": {
+        "url": "https://www.makeship.com/shop/jumbo-plushies",
+        "max_products": 100
+    },
+    "키체인 플러시": {
+        "url": "https://www.makeship.com/shop/keychain-plushies",
+        "max_products": 200
+    },
+    "인기 상품": {
+        "url": "https://www.makeship.com/shop/top",
+        "max_products": 200
+    },
+    "신상품": {
+        "url": "https://www.makeship.com/shop/new",
+        "max_products": 200
+    },
+    "출시 예정": {
+        "url": "https://www.makeship.com/shop/comingsoon",
+        "max_products": 200
+    },
+    "지난 상품": {
+        "url": "https://www.makeship.com/shop/past",
+        "max_products": 805  # Past는 805개 한계
+    }
+}
+
+
+# 페이지 안에서 상품 링크를 모으는 스크립트. 처음 호출 때 MutationObserver를 설치해 새로 추가된 a 태그만 기록하고,
+# 호출할 때마다 지난 호출 이후 추가된 href 목록과 현재 DOM의 상품 링크 수(중복/쿼리 제외)만 돌려줍니다.
+# 현재 링크 수도 관찰자가 추가/제거/href 변경 때마다 갱신하므로 호출마다 DOM 전체를 다시 조회하지 않습니다.
+# (page_source 전체를 넘겨받아 다시 파싱하지 않으므로 사이클당 비용이 새로 로드된 상품 수에 비례)
+# 페이지를 이동하면 window 객체가 새로 만들어지므로 다음 호출 때 다시 설치됩니다.
+COLLECT_NEW_LINKS_SCRIPT = """
+if (!window.__makeshipLinkCollector) {
+    // anchors: DOM에 붙어 있는 상품 a 태그 -> 쿼리를 뺀 href, live: 쿼리를 뺀 href -> 그 href를 가진 a 태그 수
+    const state = {pending: [], seen: new Set(), anchors: new Map(), live: new Map()};
+    const count = (key, delta) => {
+        const total = (state.live.get(key) || 0) + delta;
+        if (total > 0) state.live.set(key, total); else state.live.delete(key);
+    };
+    const track = (anchor) => {
+        const href = anchor.getAttribute('href');
+        const key = anchor.isConnected && href && href.includes('/products/') ? href.split('?')[0] : null;
+        const previous = state.anchors.has(anchor) ? state.anchors.get(anchor) : null;
+        if (key === previous) return;
+        if (previous !== null) count(previous, -1);
+        if (key === null) {
+            state.anchors.delete(anchor);
+        } else {
+            state.anchors.set(anchor, key);
+            count(key, 1);
+        }
+    };
+    const add = (anchor) => {
+        const href = anchor.getAttribute('href');
+        if (href && href.includes('/products/') && !state.seen.has(href)) {
+            state.seen.add(href);
+            state.pending.push(href);
+        }
+        track(anchor);
+    };
+    const scan = (node) => {
+        if (node.nodeType !== 1) return;
+        if (node.tagName === 'A') add(node);
+        node.querySelectorAll('a[href]').forEach(add);
+    };
+    const unscan = (node) => {
+        if (node.nodeType !== 1) return;
+        if (node.tagName === 'A') track(node);
+        node.querySelectorAll('a').forEach(track);
+    };
+    scan(document.body);
+    state.observer = new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            if (mutation.type === 'attributes') {
+                if (mutation.target.tagName === 'A') add(mutation.target);
+            } else {
+                mutation.removedNodes.forEach(unscan);
+                mutation.addedNodes.forEach(scan);
+            }
+        }
+    });
+    state.observer.observe(document.body, {childList: true, subtree: true, attributes: true, attributeFilter: ['href']});
+    window.__makeshipLinkCollector = state;
+}
+const state = window.__makeshipLinkCollector;
+const added = state.pending;
+state.pending = [];
+return {added: added, current: state.live.size};
+"""
+
+
+def normalize_product_href(href):
+    """
+    a 태그의 href를 쿼리 파라미터를 제거한 상품 URL로 바꾸는 함수 (상품 링크가 아니면 None)
+    시뮬레이터 주소의 절대 링크도 실제 사이트 URL로 바꾸므로 저장된 제품_URL과 같은 키로 비교됩니다.
+    """
+    if not href or '/products/' not in href:
+        return None
+    if href.startswith('/'):
+        full_url = CANONICAL_BASE_URL + href
+    elif href.startswith('http'):
+        full_url = canonical_url(href)
+    else:
+        return None
+    return full_url.split('?')[0]
+
+
+# 스크롤 후 새 링크가 붙을 때까지 기다리는 최대 시간(ms). 고정 sleep 대신 수집기에 새 링크가 생기는 즉시 다음 사이클로 진행
+SCROLL_WAIT_MS = 5000
+# 연속으로 새 링크가 없으면 목록 끝으로 판단하는 횟수
+MAX_NO_CHANGE = 3
+MAX_SCROLL_CYCLES = 200
+
+# 지난 호출 이후 추가된 링크가 있는지 (page.wait_for_function 조건)
+PENDING_LINKS_CONDITION = "() => !!window.__makeshipLinkCollector && window.__makeshipLinkCollector.pending.length > 0"
+
+
+async def collect_new_product_links_async(page):
+    """collect_new_product_links(Selenium)의 Playwright 버전: (새로 추가된 상품 링크 집합, 현재 상품 링크 수 또는 None)"""
+    try:
+        result = await page.evaluate(f"() => {{{COLLECT_NEW_LINKS_SCRIPT}}}")
+    except Exception:
+        return set(), None
+    links = {normalize_product_href(href) for href in result.get('added', [])}
+    links.discard(None)
+    return links, result.get('current')
+
+
+async def scroll_category_async(page, category_name, url, max_products, on_links, politeness=None):
+    """
+    목록 페이지를 끝까지 스크롤하며 새로 발견한 상품 링크를 사이클마다 on_links(카테고리 이름, 링크 목록)로 넘깁니다.
+    반환값: 이 카테고리에서 발견한 링크 집합
+    """
+    target_url = site_url(url)
+    if politeness:
+        await politeness.wait_turn_async(target_url)
+    await page.goto(target_url, wait_until="domcontentloaded")
+
+    discovered = set()
+    no_change = 0
+    for cycle in range(1, MAX_SCROLL_CYCLES + 1):
+        added, current_count = await collect_new_product_links_async(page)
+        new_links = added - discovered
+        discovered.update(new_links)
+        logger.debug(f"  [{category_name}] 사이클 {cycle}: 현재 {current_count}개, 누적 {len(discovered)}개, 신규 {len(new_links)}개")
+        if new_links:
+            no_change = 0
+            await on_links(category_name, sorted(new_links))
+        else:
+            no_change += 1
+
+        if len(discovered) >= max_products or no_change >= MAX_NO_CHANGE:
+            break
+        if current_count is not None and current_count < 20 and len(discovered) > 100:
+            logger.info(f"  [{category_name}] 페이지 초기화 감지, 수집 종료")
+            break
+
+        # 맨 아래로 스크롤해 다음 목록을 불러오고, 새 링크가 붙을 때까지만 기다림
+        if politeness:
+            await politeness.wait_turn_async(target_url)
+        await page.evaluate("() => window.scrollTo(0, document.body.scrollHeight)")
+        try:
+            await page.wait_for_function(PENDING_LINKS_CONDITION, timeout=SCROLL_WAIT_MS)
+        except Exception:
+            pass  # 시간 안에 새 링크가 없으면 다음 사이클에서 '변화 없음'으로 집계
+    return discovered
+
+
+async def discover_categories_async(context, category_configs, on_links, politeness):
+    """
+    카테고리 목록 페이지들을 한 브라우저 컨텍스트에서 동시에 스크롤합니다. (호스트별 동시 수/간격은 politeness가 제한)
+    반환값: 카테고리 이름 -> 발견한 링크 수
+    """
+    async def run(category_name, config):
+        async with politeness.async_slot(site_url(config["url"])):
+            page = await context.new_page()
+            try:
+                links = await scroll_category_async(page, category_name, config["url"], config["max_products"],
+                                                    on_links, politeness)
+                logger.info(f"  ✅ [{category_name}] 목록 수집 완료: {len(links)}개")
+                return len(links)
+            except Exception as e:
+                logger.warning(f"  ❌ [{category_name}] 목록 수집 오류: {e}")
+                return 0
+            finally:
+                await page.close()
+
+    counts = await asyncio.gather(*(run(name, config) for name, config in category_configs.items()))
+    return dict(zip(category_configs, counts))
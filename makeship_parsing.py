@@ -0,0 +1,291 @@
+import calendar
+import re
+from functools import lru_cache
+
+from scrape_logging import get_logger
+
+# 판매량/달성률/가격/날짜 파싱 공용 모듈 (1.py, 2.py, debug_page.py, 과거/fix_sales_data.py에서 사용)
+# 정규식은 모두 모듈 로드 시 한 번만 컴파일하고, 같은 문자열이 반복되는 값(날짜, 판매량 등)은 결과를 캐시합니다.
+# 문자열 하나당 처리 비용은 parsing_benchmark.py로 확인할 수 있습니다.
+
+logger = get_logger("parsing")
+
+NOT_AVAILABLE = "정보 없음"
+SALES_NOT_FOUND = "판매량 정보를 찾을 수 없습니다."
+RATE_NOT_FOUND = "달성률 정보를 찾을 수 없습니다."
+PRICE_NOT_FOUND = "가격을 찾을 수 없습니다."
+CATEGORY_NOT_FOUND = "제품군을 찾을 수 없습니다."
+SOLD_OUT = "Sold Out"
+
+# 2.py가 날짜로 바꾸지 않고 그대로 두는 값
+PASSTHROUGH_DATE_VALUES = (NOT_AVAILABLE, "해당 없음", "상태 확인 중 오류")
+
+# 'Sold Out' 제품은 최소 목표 수량만큼 판매된 것으로 가정
+SOLD_OUT_ASSUMED_SALES = 200
+
+# 캐시 크기 (과거 레코드 수만 건을 다시 정규화해도 서로 다른 값은 이보다 훨씬 적음)
+PARSE_CACHE_SIZE = 65536
+
+# 제품군별 가격 매핑 (달러 기준)
+CATEGORY_PRICES = {
+    "hoodies": 59.99,
+    "knitted crewnecks": 59.99,
+    "t-shirts": 29.99,
+    "enamel pins": 19.99,
+    "vinyl figures": 29.99,
+    "plushies": 29.99,
+    "longbois": 36.99,
+    "doughbois": 39.99,
+    "jumbo plushies": 39.99,
+    "keychain plushies": 15.99,
+    "sweatpants": 54.99,
+    "ball cap": 24.99,
+    # 한국어 제품군명도 추가 (혹시 모를 경우를 대비)
+    "후디": 59.99,
+    "니트 크루넥": 59.99,
+    "티셔츠": 29.99,
+    "에나멜 핀": 19.99,
+    "비닐 피규어": 29.99,
+    "플러시": 29.99,
+    "롱보이": 36.99,
+    "도우보이": 39.99,
+    "점보 플러시": 39.99,
+    "키체인 플러시": 15.99,
+    "스웨트팬츠": 54.99,
+    "볼 캡": 24.99
+}
+DEFAULT_CATEGORY_PRICE = 29.99  # 매칭되지 않으면 플러시 가격 사용
+
+# 판매량/달성률
+SOLD_OF_PATTERN = re.compile(r'([0-9,]+)\s+of\s+([0-9,]+)\s+sold', re.IGNORECASE)  # "1,000 of 1,000 sold"
+SOLD_ONLY_PATTERN = re.compile(r'([0-9,]+)\s+sold', re.IGNORECASE)                # "716 sold"
+FUNDED_PATTERN = re.compile(r'([0-9,]+%)(?:\s*\+)?\s+Funded', re.IGNORECASE)       # "143% Funded", "1,000%+ Funded"
+FUNDED_TEXT_PATTERN = re.compile(r'\d+% Funded', re.IGNORECASE)                   # 화면 텍스트 폴백에서 달성률 문구 판별
+EXCEL_FUNDED_PATTERN = re.compile(r'([0-9,]+%)\s+Funded', re.IGNORECASE)          # 과거/fix_sales_data.py 기준 ('+' 미처리)
+
+# 가격 / 숫자
+INTEGER_PATTERN = re.compile(r'(\d+)')
+DECIMAL_PATTERN = re.compile(r'(\d+\.?\d*)')
+DOLLAR_PRICE_PATTERN = re.compile(r'\$?(\d+\.?\d*)')
+TOTAL_PRICE_PATTERN = re.compile(r'\$[0-9,.]+')
+
+# 날짜
+ISO_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+MONTH_NAMES = ("january", "february", "march", "april", "may", "june", "july", "august", "september", "october",
+               "november", "december")
+MONTH_NUMBERS = {name: number for number, name in enumerate(MONTH_NAMES, start=1)}
+# datetime.strptime(text, '%B %d %Y')와 같은 규칙 (전체 일치, 월 이름 대소문자 무시, 공백은 1개 이상)
+MONTH_DAY_YEAR_PATTERN = re.compile(
+    r'(' + '|'.join(MONTH_NUMBERS) + r')\s+(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])\s+(\d{4})', re.IGNORECASE)
+DATE_IN_TEXT_PATTERN = re.compile(r'([A-Za-z]+\s+\d{1,2},\s+\d{4})')              # "Ships July 1, 2025." 등에서 날짜 부분
+
+# 제품군 텍스트
+VISIT_STORE_PATTERN = re.compile(r'^Visit\s+.*\s+Store$', re.IGNORECASE)
+FIRST_WORD_PATTERN = re.compile(r'([A-Za-z]+)')
+
+
+def parse_month_day_year(text):
+    """
+    'July 1 2025' 형식(쉼표 제거 후)을 'YYYY-MM-DD'로 바꿉니다. 형식이 맞지 않거나 없는 날짜면 None을 반환합니다.
+    strptime과 결과는 같지만 실패할 때 예외를 만들지 않습니다.
+    """
+    match = MONTH_DAY_YEAR_PATTERN.fullmatch(text)
+    if match is None:
+        return None
+    month = MONTH_NUMBERS[match.group(1).lower()]
+    day = int(match.group(2))
+    year = int(match.group(3))
+    if year < 1 or day > calendar.monthrange(year, month)[1]:
+        return None
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_date_text(date_str):
+    """종료일/배송일 문자열에서 날짜를 찾아 'YYYY-MM-DD'로 반환합니다. 찾지 못하면 None."""
+    # 1. ' / ' 앞부분(프로젝트 종료일)의 앞 세 단어 ('July 1, 5:00AM GMT+9'의 시간/GMT 정보 제거)
+    project_end_date_part = date_str.split(' / ')[0].strip()
+    parsed = parse_month_day_year(' '.join(project_end_date_part.split(' ')[:3]).replace(',', ''))
+    if parsed:
+        return parsed
+    # 2. 'Ships September 23, 2025' 형식
+    if 'Ships ' in date_str:
+        parsed = parse_month_day_year(date_str.split('Ships ')[-1].strip().replace(',', ''))
+        if parsed:
+            return parsed
+    # 3. 문자열 전체
+    return parse_month_day_year(date_str.replace(',', ''))
+
+
+def normalize_date(date_str):
+    """스크래퍼용 날짜 정규화. 날짜를 찾지 못하면 '정보 없음'을 반환합니다."""
+    if not date_str or date_str == NOT_AVAILABLE:
+        return NOT_AVAILABLE
+    return _parse_date_text(date_str) or NOT_AVAILABLE
+
+
+def normalize_stored_date(date_str):
+    """
+    저장된 레코드(엑셀 변환)용 날짜 정규화.
+    이미 'YYYY-MM-DD'이거나 '해당 없음' 같은 안내 문구면 그대로 두고, 날짜를 찾지 못하면 원본을 반환합니다.
+    """
+    if not date_str or date_str in PASSTHROUGH_DATE_VALUES:
+        return date_str if date_str else NOT_AVAILABLE
+    if not isinstance(date_str, str) or ISO_DATE_PATTERN.match(date_str):
+        return date_str
+    return _parse_date_text(date_str) or date_str
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def process_sales_data(sales_raw_text, funded_raw_text):
+    """화면의 판매량/달성률 원문을 (판매량, 달성률)로 정리합니다. 예: ('716 sold', '143% Funded') -> ('716', '143%')"""
+    processed_sales = SALES_NOT_FOUND
+    processed_rate = RATE_NOT_FOUND
+    sold_of_match = None
+
+    # 1. 판매량 파싱
+    if sales_raw_text and sales_raw_text != NOT_AVAILABLE:
+        sold_of_match = SOLD_OF_PATTERN.search(sales_raw_text)
+        if sold_of_match:
+            processed_sales = sold_of_match.group(1).replace(',', '')
+        else:
+            sold_only_match = SOLD_ONLY_PATTERN.search(sales_raw_text)
+            if sold_only_match:
+                processed_sales = sold_only_match.group(1).replace(',', '')
+            elif SOLD_OUT in sales_raw_text:
+                processed_sales = SOLD_OUT
+
+    # 2. 달성률 파싱
+    if funded_raw_text and funded_raw_text != NOT_AVAILABLE:
+        funded_match = FUNDED_PATTERN.search(funded_raw_text)
+        if funded_match:
+            processed_rate = funded_match.group(1).replace(',', '')
+        elif SOLD_OUT in funded_raw_text:
+            processed_rate = SOLD_OUT
+
+    # 3. 판매량 기반 달성률 계산 (X of Y sold -> X/Y 비율) - 명시적인 달성률이 없을 때만 시도
+    if processed_rate == RATE_NOT_FOUND and sold_of_match and "of" in sales_raw_text:
+        x_val = int(sold_of_match.group(1).replace(',', ''))
+        y_val_str = sold_of_match.group(2).replace(',', '')
+        y_val = int(y_val_str) if y_val_str.isdigit() else 0
+        if y_val > 0:
+            processed_rate = f"{(x_val / y_val * 100):.1f}%"
+        else:
+            processed_rate = "0.0%"
+
+    # 모든 정보가 없을 경우 최종적으로 Sold Out 처리
+    if processed_sales == SALES_NOT_FOUND and processed_rate == RATE_NOT_FOUND and (SOLD_OUT in sales_raw_text or SOLD_OUT in funded_raw_text):
+        processed_sales = SOLD_OUT
+        processed_rate = SOLD_OUT
+
+    return processed_sales, processed_rate
+
+
+def process_excel_sales_data(sales_volume, funded_rate):
+    """
+    엑셀 수정용 판매량/달성률 처리 (과거/fix_sales_data.py)
+    1. "1000 of 1000 sold" -> 판매량: "1000", 달성률: "1000 of 1000 sold"
+    2. 단위 제거: "716 sold" -> "716", "143% Funded" -> "143%"
+    """
+    processed_sales = sales_volume
+    processed_rate = funded_rate
+
+    sold_match = SOLD_OF_PATTERN.search(sales_volume)
+    if sold_match:
+        sold_count = sold_match.group(1).replace(',', '')
+        total_count = sold_match.group(2).replace(',', '')
+        return sold_count, f"{sold_count} of {total_count} sold"
+
+    sold_only_match = SOLD_ONLY_PATTERN.search(sales_volume)
+    if sold_only_match:
+        processed_sales = sold_only_match.group(1).replace(',', '')
+
+    funded_match = EXCEL_FUNDED_PATTERN.search(funded_rate)
+    if funded_match:
+        processed_rate = funded_match.group(1).replace(',', '')
+
+    return processed_sales, processed_rate
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_numeric_text(value_str):
+    clean_value = value_str.replace(',', '').replace(' sold', '').strip()
+    try:
+        # 달성률 (%)가 포함된 경우
+        if '%' in clean_value:
+            return float(clean_value.replace('%', ''))
+        if '.' in clean_value:
+            return float(clean_value)
+        return int(clean_value)
+    except ValueError:
+        return 0
+
+
+def convert_to_numeric(value_str):
+    """문자열에서 숫자만 추출하여 정수 또는 실수로 변환합니다. (예: '1,234' -> 1234, '143%' -> 143.0)"""
+    # 이미 숫자인 경우 그대로 반환
+    if isinstance(value_str, (int, float)):
+        return value_str
+    if not value_str or value_str == NOT_AVAILABLE or not isinstance(value_str, str):
+        return 0
+    return _parse_numeric_text(value_str)
+
+
+@lru_cache(maxsize=None)
+def get_category_price(category):
+    """제품군에 따른 가격을 반환합니다. (제품군별로 한 번만 계산하므로 매칭 실패 경고도 한 번만 출력)"""
+    if not category or category == CATEGORY_NOT_FOUND:
+        return 0.0
+
+    # 소문자로 변환하여 매칭
+    category_lower = category.lower()
+
+    # 직접 매칭 시도
+    if category_lower in CATEGORY_PRICES:
+        return CATEGORY_PRICES[category_lower]
+
+    # 부분 매칭 시도 (예: "Hoodies" -> "hoodies")
+    for key in CATEGORY_PRICES:
+        if key in category_lower or category_lower in key:
+            return CATEGORY_PRICES[key]
+
+    logger.warning(f"경고: 제품군 '{category}'에 대한 가격 정보를 찾을 수 없습니다.")
+    return DEFAULT_CATEGORY_PRICE
+
+
+def parse_price(product_price):
+    """크롤링한 가격 문자열에서 숫자를 꺼냅니다. 가격이 없으면 0.0"""
+    if product_price and product_price != PRICE_NOT_FOUND:
+        price_match = DECIMAL_PATTERN.search(str(product_price).replace(',', ''))
+        if price_match:
+            return float(price_match.group(1))
+    return 0.0
+
+
+def calculate_revenue(sales_volume, category, product_price):
+    """판매량, 제품군, 실제 제품 가격을 기반으로 매출을 계산합니다."""
+    try:
+        # 판매량이 정보 없음인 경우만 0 반환
+        if not sales_volume or sales_volume == SALES_NOT_FOUND:
+            return 0.0
+
+        if sales_volume == SOLD_OUT:
+            sales_count = SOLD_OUT_ASSUMED_SALES
+        else:
+            sales_match = INTEGER_PATTERN.search(str(sales_volume).replace(',', ''))
+            if not sales_match:
+                return 0.0
+            sales_count = int(sales_match.group(1))
+
+        # 실제 크롤링한 가격이 있으면 사용, 없거나 0이면 제품군별 하드코딩 가격 사용
+        actual_price = parse_price(product_price)
+        if actual_price == 0.0:
+            actual_price = get_category_price(category)
+
+        revenue = sales_count * actual_price
+        if sales_volume == SOLD_OUT:
+            logger.debug(f"'Sold Out' 제품 - 최소 {sales_count}개 판매 가정, 가격: ${actual_price}, 매출: ${revenue:.2f}")
+        return round(revenue, 2)
+    except Exception as e:
+        logger.warning(f"매출 계산 중 오류: {e}")
+        return 0.0
@@ -0,0 +1,518 @@
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from snapshot_store import SnapshotStore
+
+# 스크래퍼가 실제로 사용하는 DOM 구조(클래스명)를 그대로 재현하는 로컬 makeship 사이트.
+# 네트워크 없이 1.py / complete_infinite_extractor.py / debug_page.py의 처리량 측정과 회귀 확인에 사용합니다.
+#   python makeship_simulator.py --port 8765 --latency-ms 150 --error-rate 0.02
+#   MAKESHIP_BASE_URL=http://127.0.0.1:8765 python 1.py
+
+CANONICAL_BASE_URL = "https://www.makeship.com"
+
+# /shop/<slug> 카테고리 (complete_infinite_extractor.py의 category_configs와 동일)
+PRODUCT_CATEGORIES = {
+    "hoodies": "Hoodie",
+    "knitted-crewnecks": "Knitted Crewneck",
+    "t-shirts": "T-Shirt",
+    "enamel-pins": "Enamel Pin",
+    "vinyl-figures": "Vinyl Figure",
+    "plushies": "Plush",
+    "longbois": "Longboi",
+    "doughbois": "Doughboi",
+    "jumbo-plushies": "Jumbo Plush",
+    "keychain-plushies": "Keychain Plush",
+}
+VIEW_CATEGORIES = ("top", "new", "comingsoon", "past")
+CATEGORY_PRICES = {
+    "Hoodie": 64.99, "Knitted Crewneck": 69.99, "T-Shirt": 34.99, "Enamel Pin": 14.99, "Vinyl Figure": 39.99,
+    "Plush": 29.99, "Longboi": 39.99, "Doughboi": 34.99, "Jumbo Plush": 59.99, "Keychain Plush": 19.99,
+}
+CATEGORY_WEIGHTS = (2, 1, 1, 2, 2, 6, 1, 1, 1, 3)
+
+LISTING_PAGE_SIZE = 24
+# /shop/past는 약 805개를 불러오면 목록이 처음으로 초기화됨 (실제 사이트 동작)
+# 목록 API도 같은 위치 이후로는 빈 페이지를 돌려주므로, 전체를 보려면 필터/정렬로 목록을 나눠야 함
+PAST_RESET_AFTER = 805
+PAST_RESET_KEEP = 12
+
+# 목록 필터 쿼리: ?type=<카테고리 slug> (제품군), ?sort=newest|oldest (지난 상품 정렬)
+FILTER_TYPE_PARAM = "type"
+FILTER_SORT_PARAM = "sort"
+
+ASSET_CHUNK_KB = 100
+
+NAME_WORDS = ("Bun", "Mochi", "Frog", "Cat", "Dragon", "Ghost", "Bee", "Axolotl", "Slime", "Knight", "Duck", "Fox",
+              "Moth", "Bear", "Shark", "Mushroom", "Witch", "Robot", "Bat", "Penguin")
+NAME_PREFIXES = ("Sleepy", "Tiny", "Cosmic", "Grumpy", "Happy", "Spooky", "Royal", "Fluffy", "Pixel", "Golden")
+
+
+class SiteProfile:
+    """
+    시뮬레이터 응답 특성 (지연시간, 오류/차단 비율, 페이지 무게, 하이드레이션 지연)
+    recorded_dir을 지정하면 스냅샷 저장소(1.py --snapshot, SNAPSHOT_SAVE_HTML=True)에 저장된 실제 HTML을 그대로 응답합니다.
+    """
+
+    def __init__(self, products=2000, seed=42, latency_ms=0, jitter_ms=0, error_rate=0.0, block_rate=0.0,
+                 page_weight_kb=0, hydrate_delay_ms=0, next_data=True, recorded_dir=None):
+        self.products = products
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.block_rate = block_rate
+        self.page_weight_kb = page_weight_kb
+        self.hydrate_delay_ms = hydrate_delay_ms
+        self.next_data = next_data
+        self.recorded_dir = recorded_dir
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+
+def _format_date(dt):
+    return f"{dt:%B} {dt.day}, {dt.year}"
+
+
+def build_catalog(count, seed=42, now=None):
+    """seed로 고정된 가상 제품 목록을 만듭니다. 같은 seed면 항상 같은 목록이 만들어집니다."""
+    rng = random.Random(seed)
+    now = now or datetime(2025, 7, 1)
+    slugs = list(PRODUCT_CATEGORIES)
+    catalog = []
+    for index in range(count):
+        slug = rng.choices(slugs, weights=CATEGORY_WEIGHTS, k=1)[0]
+        product_type = PRODUCT_CATEGORIES[slug]
+        name = f"{rng.choice(NAME_PREFIXES)} {rng.choice(NAME_WORDS)} {product_type}"
+        handle = f"{name.lower().replace(' ', '-')}-{index}"
+        creator = f"Creator{rng.randint(1, count // 4 + 1)}"
+        # 약 30%는 진행 중(또는 출시 예정), 나머지는 지난 캠페인
+        days_ago = rng.randint(-10, 20) if rng.random() < 0.3 else rng.randint(22, 1200)
+        launched = now - timedelta(days=days_ago)
+        end_date = launched + timedelta(days=21)
+        goal = rng.choice((200, 250, 300, 500))
+        sold = int(goal * rng.uniform(0.1, 6.0))
+        limit = rng.choice((None, None, None, 500, 1000))
+        if limit:
+            sold = min(sold, limit)
+        catalog.append({
+            "handle": handle,
+            "title": name,
+            "vendor": creator,
+            "slug": slug,
+            "productType": product_type,
+            "price": CATEGORY_PRICES[product_type],
+            "launched": launched,
+            "campaignEndDate": end_date,
+            "estimatedShipDate": end_date + timedelta(days=rng.randint(60, 120)),
+            "moq": goal,
+            "totalSold": sold,
+            "limitedQuantity": limit,
+            "soldOut": bool(limit and sold >= limit),
+            "creatorUrl": f"https://www.youtube.com/@{creator.lower()}",
+            "coming_soon": launched > now,
+            "ended": end_date <= now,
+        })
+    return catalog
+
+
+def category_products(catalog, category, product_type=None, sort=None):
+    """
+    /shop/<category> 목록에 표시할 제품 (카테고리 또는 top/new/comingsoon/past 보기)
+    product_type(카테고리 slug)과 sort(oldest)는 목록 필터 쿼리입니다.
+    """
+    if product_type:
+        catalog = [p for p in catalog if p["slug"] == product_type]
+    if category == "past":
+        items = [p for p in catalog if p["ended"]]
+        return sorted(items, key=lambda p: p["campaignEndDate"], reverse=sort != "oldest")
+    live = [p for p in catalog if not p["ended"] and not p["coming_soon"]]
+    if category == "top":
+        return sorted(live, key=lambda p: p["totalSold"], reverse=True)
+    if category == "new":
+        return sorted(live, key=lambda p: p["launched"], reverse=True)
+    if category == "comingsoon":
+        return [p for p in catalog if p["coming_soon"]]
+    return [p for p in live if p["slug"] == category]
+
+
+def render_next_data(product):
+    data = {"props": {"pageProps": {"product": {
+        "title": product["title"],
+        "handle": product["handle"],
+        "vendor": product["vendor"],
+        "productType": product["productType"],
+        "campaignEndDate": product["campaignEndDate"].isoformat() + "Z",
+        "estimatedShipDate": product["estimatedShipDate"].isoformat() + "Z",
+        "totalSold": product["totalSold"],
+        "moq": product["moq"],
+        "limitedQuantity": product["limitedQuantity"],
+        "soldOut": product["soldOut"],
+        "creatorUrl": product["creatorUrl"],
+        "price": product["price"],
+    }}}}
+    return f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script>'
+
+
+def render_progress(product):
+    """종료일 / 판매량 / 달성률 블록 (ProductInfo 루트의 3번째 div 안쪽)"""
+    end_text = _format_date(product["campaignEndDate"])
+    if product["ended"]:
+        date_html = f"<p>Ended: {end_text}</p>"
+    else:
+        date_html = (f"<p>Ends on {end_text}</p>"
+                     f'<p class="ProductPageCountdown__CountdownDate-sc-1q2w3e-1 kLmNoP">Ends on {end_text}</p>')
+
+    if product["soldOut"]:
+        progress_html = "<p>Sold Out</p>"
+    elif product["limitedQuantity"]:
+        sold_text = f"{product['totalSold']:,} of {product['limitedQuantity']:,} sold"
+        row_class = ("ProgressBarContainer__PastLimitedCampaignRow-sc-1slgn8k-3 bLtdCY" if product["ended"]
+                     else "ProgressBarContainer__ProgressRow-sc-1slgn8k-2 cbQHDc")
+        progress_html = f'<div class="{row_class}"><p>{sold_text}</p></div>'
+    else:
+        funded = int(product["totalSold"] / product["moq"] * 100)
+        progress_html = (f'<div class="ProgressBarContainer__ProgressRow-sc-1slgn8k-2 cbQHDc">'
+                         f'<p>{product["totalSold"]:,} sold</p><div><p>{funded}% Funded</p></div></div>')
+    return f"<div>{date_html}{progress_html}</div>"
+
+
+def render_product_page(product, profile):
+    title = escape(product["title"])
+    assets = "".join(f'<img src="/assets/{product["handle"]}-{i}.jpg" width="600" height="600">'
+                     for i in range(-(-profile.page_weight_kb // ASSET_CHUNK_KB)))
+    progress = render_progress(product)
+    if profile.hydrate_delay_ms:
+        # 판매량/종료일 블록을 클라이언트 렌더링처럼 늦게 삽입 (준비 상태 대기 로직 확인용)
+        progress_slot = (f'<div id="progress-slot"></div><template id="progress-late">{progress}</template>'
+                         f'<script>setTimeout(() => {{ const t = document.getElementById("progress-late");'
+                         f' document.getElementById("progress-slot").replaceWith(t.content.cloneNode(true)); }},'
+                         f' {profile.hydrate_delay_ms});</script>')
+        progress_block = f"<div>{progress_slot}</div>"
+    else:
+        progress_block = f"<div>{progress}</div>"
+
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title} | Makeship</title>
+{'<link rel="stylesheet" href="/assets/app.css">' if profile.page_weight_kb else ''}
+</head><body>
+<div id="__next"><div class="_app__ContainerWrapper-sc-meusgd-0 fdDSJw"><div>
+<div class="_app__ContentWrapper-sc-meusgd-2 iURiPk"><div><div>
+<div class="handle__ProductImageWrapper-sc-1y81hk8-1 aBcDe">{assets}</div>
+<div class="handle__ProductInfoWrapper-sc-1y81hk8-2 kYqEeP"><div>
+  <div class="ProductInfo__ProductHeaderWrapper-sc-pdgh6r-2 jUpShe">
+    <div><div><p class="ProductInfo__Price-sc-pdgh6r-5 hGfEdC">${product['price']:.2f}</p></div>
+    <a href="/shop/{product['slug']}"><p>{escape(product['productType'])}</p></a>
+    <h1 class="ProductDetails__ProductTitle-sc-8ihs6f-0 qWeRt">{title}</h1>
+    <a href="/creators/{escape(product['vendor'].lower())}">By: {escape(product['vendor'])}</a></div>
+  </div>
+  <div><p>Designed by {escape(product['vendor'])}. Made in limited campaign runs.</p></div>
+  {progress_block}
+  <div class="ProductInfo__PostPurchaseDetailsWrapper-sc-pdgh6r-9 jthCJt"><div><div>
+    <p>Ships {_format_date(product['estimatedShipDate'])}</p>
+  </div></div></div>
+  <div class="CreatorMessage__CreatorMessageWrapper-sc-5t6y7u-0 zXcVb">
+    <p>Thanks for supporting me!</p><a href="{product['creatorUrl']}">Visit my channel</a>
+  </div>
+</div></div>
+</div></div></div>
+</div></div></div>
+{render_next_data(product) if profile.next_data else ''}
+</body></html>"""
+
+
+def render_listing_page(category, first_items, total, filters=None):
+    cards = "".join(render_card(product) for product in first_items)
+    reset_after = PAST_RESET_AFTER if category == "past" else 0
+    filter_query = f"&{urlencode(filters)}" if filters else ""
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Shop {escape(category)} | Makeship</title>
+<style>.product-card {{ height: 320px; margin: 8px; }}</style>
+</head><body>
+<div id="__next"><h1>{escape(category)}</h1><p class="result-count">{total:,} products</p><div class="grid" id="grid">{cards}</div><div id="sentinel"></div></div>
+<script>
+(() => {{
+  const category = {json.dumps(category)};
+  const resetAfter = {reset_after};
+  const resetKeep = {PAST_RESET_KEEP};
+  const filterQuery = {json.dumps(filter_query)};
+  let offset = {len(first_items)};
+  let loaded = offset;
+  let total = {total};
+  let loading = false;
+  const grid = document.getElementById("grid");
+  async function loadMore() {{
+    if (loading || offset >= total) return;
+    loading = true;
+    try {{
+      if (resetAfter && loaded >= resetAfter) {{
+        // 지난 상품 목록: 일정 개수를 넘으면 목록이 처음 일부만 남기고 초기화됨
+        grid.innerHTML = "";
+        offset = 0;
+        loaded = 0;
+        const response = await fetch(`/api/shop/${{category}}?offset=0&limit=${{resetKeep}}${{filterQuery}}`);
+        const data = await response.json();
+        grid.insertAdjacentHTML("beforeend", data.html);
+        offset = data.next;
+        loaded = data.count;
+        return;
+      }}
+      const response = await fetch(`/api/shop/${{category}}?offset=${{offset}}&limit={LISTING_PAGE_SIZE}${{filterQuery}}`);
+      if (!response.ok) return;
+      const data = await response.json();
+      grid.insertAdjacentHTML("beforeend", data.html);
+      offset = data.next;
+      loaded += data.count;
+      total = data.total;
+    }} finally {{
+      loading = false;
+    }}
+  }}
+  window.addEventListener("scroll", () => {{
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 400) loadMore();
+  }});
+}})();
+</script>
+</body></html>"""
+
+
+def is_known_category(category):
+    return category in PRODUCT_CATEGORIES or category in VIEW_CATEGORIES
+
+
+def listing_filters(query):
+    """목록 URL 쿼리에서 시뮬레이터가 지원하는 필터만 꺼냅니다."""
+    values = parse_qs(query)
+    return {key: values[key][0] for key in (FILTER_TYPE_PARAM, FILTER_SORT_PARAM) if values.get(key)}
+
+
+def render_card(product):
+    return (f'<div class="product-card"><a href="/products/{product["handle"]}">'
+            f'<p>{escape(product["title"])}</p></a></div>')
+
+
+class SimulatorState:
+    """카탈로그와 요청 통계 (여러 요청 스레드에서 공유)"""
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.catalog = build_catalog(profile.products, profile.seed)
+        self.by_handle = {product["handle"]: product for product in self.catalog}
+        self.recorded_store, self.recorded = (load_recorded_pages(profile.recorded_dir) if profile.recorded_dir
+                                              else (None, {}))
+        self.listings = {}
+        self.rng = random.Random(profile.seed)
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.statuses = Counter()
+        self.bytes_sent = 0
+        self.started_at = time.time()
+
+    def listing(self, category, product_type=None, sort=None):
+        key = (category, product_type, sort)
+        with self.lock:
+            if key not in self.listings:
+                self.listings[key] = category_products(self.catalog, category, product_type, sort)
+            return self.listings[key]
+
+    def roll(self):
+        """이번 요청의 지연시간과 오류/차단 여부를 정합니다."""
+        with self.lock:
+            delay = max(0.0, self.profile.latency_ms + self.rng.uniform(-1, 1) * self.profile.jitter_ms) / 1000
+            value = self.rng.random()
+        if value < self.profile.block_rate:
+            return delay, "block"
+        if value < self.profile.block_rate + self.profile.error_rate:
+            return delay, "error"
+        return delay, None
+
+    def record(self, kind, status, size):
+        with self.lock:
+            self.requests[kind] += 1
+            self.statuses[status] += 1
+            if kind != "stats":  # /__stats 조회는 전송량에서 제외 (벤치마크가 측정 전후로 조회함)
+                self.bytes_sent += size
+
+    def stats(self):
+        with self.lock:
+            return {
+                "실행_시간_초": round(time.time() - self.started_at, 1),
+                "요청": dict(self.requests),
+                "상태_코드": {str(status): count for status, count in self.statuses.items()},
+                "전송_바이트": self.bytes_sent,
+                "설정": self.profile.to_dict(),
+            }
+
+
+class SimulatorHandler(BaseHTTPRequestHandler):
+    server_version = "MakeshipSimulator/1.0"
+    state = None  # make_server에서 SimulatorState로 지정
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 출력하지 않음 (/__stats로 확인)
+
+    def _send(self, kind, status, body, content_type="text/html; charset=utf-8"):
+        data = body if isinstance(body, bytes) else body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.state.record(kind, status, len(data))
+
+    def _apply_profile(self, kind):
+        """지연시간을 적용하고, 오류/차단 응답을 보냈으면 True를 반환합니다."""
+        delay, failure = self.state.roll()
+        if delay:
+            time.sleep(delay)
+        if failure == "block":
+            self._send(kind, 403, "<html><head><title>Access Denied</title></head>"
+                                 "<body><h1>Access Denied</h1><p>Request blocked.</p></body></html>")
+            return True
+        if failure == "error":
+            self._send(kind, 500, "<html><body><h1>Internal Server Error</h1></body></html>")
+            return True
+        return False
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        path = parsed.path.rstrip("/") or "/"
+        parts = path.strip("/").split("/")
+
+        if path == "/__stats":
+            self._send("stats", 200, json.dumps(self.state.stats(), ensure_ascii=False), "application/json")
+        elif parts[0] == "assets":
+            # 페이지 무게 재현용 이미지/CSS (지연/오류 없이 고정 크기 응답)
+            self._send("asset", 200, b"\0" * (ASSET_CHUNK_KB * 1024),
+                       "text/css" if path.endswith(".css") else "image/jpeg")
+        elif parts[0] == "products" and len(parts) == 2:
+            if self._apply_profile("product"):
+                return
+            product = self.state.by_handle.get(parts[1])
+            if parts[1] in self.state.recorded:
+                self._send("product", 200, self.state.recorded_store.load_html(self.state.recorded[parts[1]]))
+            elif product is None:
+                self._send("product", 404, "<html><head><title>Page not found</title></head><body></body></html>")
+            else:
+                self._send("product", 200, render_product_page(product, self.state.profile))
+        elif parts[0] in ("shop", "api") and not is_known_category(parts[-1]):
+            self._send("other", 404, "<html><head><title>Page not found</title></head><body></body></html>")
+        elif parts[0] == "shop" and len(parts) == 2:
+            if self._apply_profile("listing"):
+                return
+            filters = listing_filters(parsed.query)
+            items = self.state.listing(parts[1], filters.get(FILTER_TYPE_PARAM), filters.get(FILTER_SORT_PARAM))
+            self._send("listing", 200, render_listing_page(parts[1], items[:LISTING_PAGE_SIZE], len(items), filters))
+        elif parts[:2] == ["api", "shop"] and len(parts) == 3:
+            if self._apply_profile("listing_api"):
+                return
+            query = parse_qs(parsed.query)
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", [str(LISTING_PAGE_SIZE)])[0])
+            filters = listing_filters(parsed.query)
+            items = self.state.listing(parts[2], filters.get(FILTER_TYPE_PARAM), filters.get(FILTER_SORT_PARAM))
+            end = offset + limit
+            if parts[2] == "past":
+                end = min(end, PAST_RESET_AFTER)
+            page = items[offset:end]
+            body = {"html": "".join(render_card(p) for p in page), "count": len(page),
+                    "next": offset + len(page), "total": len(items)}
+            self._send("listing_api", 200, json.dumps(body), "application/json")
+        else:
+            self._send("other", 404, "<html><body>Not found</body></html>")
+
+
+def make_server(profile, host="127.0.0.1", port=8765):
+    """시뮬레이터 서버를 만듭니다. port=0이면 빈 포트를 사용합니다. (server.server_address로 확인)"""
+    state = SimulatorState(profile)
+    handler = type("BoundSimulatorHandler", (SimulatorHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.state = state
+    return server
+
+
+def start_in_background(profile, host="127.0.0.1", port=0):
+    """백그라운드 스레드에서 시뮬레이터를 실행하고 (server, base_url)을 반환합니다. 종료는 server.shutdown()."""
+    server = make_server(profile, host, port)
+    thread = threading.Thread(target=server.serve_forever, name="makeship-simulator", daemon=True)
+    thread.start()
+    return server, f"http://{server.server_address[0]}:{server.server_address[1]}"
+
+
+def load_recorded_pages(recorded_dir):
+    """스냅샷 저장소에서 HTML이 있는 최신 스냅샷을 제품 handle별로 찾아 (저장소, {handle: 색인 항목})을 반환합니다."""
+    store = SnapshotStore(recorded_dir)
+    pages = {}
+    for url, entry in store.latest_entries().items():
+        if entry.get("HTML_해시"):
+            pages[urlparse(url).path.rstrip("/").split("/")[-1]] = entry
+    return store, pages
+
+
+def recorded_urls(state):
+    """녹화된 페이지의 실제 사이트 URL 목록"""
+    return [f"{CANONICAL_BASE_URL}/products/{handle}" for handle in sorted(state.recorded)]
+
+
+def write_url_file(catalog, filename):
+    """1.py가 읽는 makeship_unique_products_*.txt 형식으로 전체 제품 URL을 저장합니다."""
+    with open(filename, "w", encoding="utf-8") as f:
+        for product in catalog:
+            f.write(f"{CANONICAL_BASE_URL}/products/{product['handle']}\n")
+    return filename
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="로컬 makeship 사이트 시뮬레이터")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--products", type=int, default=2000, help="가상 제품 수")
+    parser.add_argument("--seed", type=int, default=42, help="카탈로그/오류 발생 시드 (같으면 같은 결과)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="페이지 응답 지연 평균 (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="지연 변동 폭 (±ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 오류 비율")
+    parser.add_argument("--block-rate", type=float, default=0.0, help="403 차단 페이지 비율")
+    parser.add_argument("--page-weight-kb", type=int, default=0, help="제품 페이지마다 추가할 이미지/CSS 용량 (KB)")
+    parser.add_argument("--hydrate-delay-ms", type=int, default=0, help="판매량/종료일 블록을 늦게 삽입하는 시간 (ms)")
+    parser.add_argument("--no-next-data", action="store_true", help="__NEXT_DATA__를 넣지 않음 (Playwright 경로 측정용)")
+    parser.add_argument("--recorded", metavar="DIR", help="스냅샷 저장소에 녹화된 실제 제품 HTML을 응답 (없는 제품은 생성한 페이지)")
+    parser.add_argument("--write-urls", metavar="FILE", help="전체 제품 URL을 1.py용 URL 파일로 저장")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    profile = SiteProfile(products=args.products, seed=args.seed, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                          error_rate=args.error_rate, block_rate=args.block_rate, page_weight_kb=args.page_weight_kb,
+                          hydrate_delay_ms=args.hydrate_delay_ms, next_data=not args.no_next_data,
+                          recorded_dir=args.recorded)
+    server = make_server(profile, args.host, args.port)
+    base_url = f"http://{args.host}:{server.server_address[1]}"
+    if args.write_urls:
+        write_url_file(server.state.catalog, args.write_urls)
+        print(f"{len(server.state.catalog)}개 제품 URL을 '{args.write_urls}' 파일로 저장했습니다.")
+    if server.state.recorded:
+        print(f"녹화된 제품 페이지 {len(server.state.recorded)}개를 '{args.recorded}'에서 불러왔습니다.")
+    past_count = len(server.state.listing("past"))
+    print(f"🧪 makeship 시뮬레이터 실행 중: {base_url} (제품 {profile.products}개, 지난 상품 {past_count}개)")
+    print(f"   사용 예: MAKESHIP_BASE_URL={base_url} python 1.py")
+    print(f"   요청 통계: {base_url}/__stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
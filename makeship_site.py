@@ -0,0 +1,34 @@
+import os
+from urllib.parse import urlparse
+
+# 실제 사이트 주소 (제품_URL, DB 키, URL 파일은 항상 이 주소 기준)
+CANONICAL_BASE_URL = "https://www.makeship.com"
+
+# 실제 요청을 보낼 주소. 로컬 시뮬레이터(makeship_simulator.py)를 쓰려면 환경 변수로 지정합니다.
+#   MAKESHIP_BASE_URL=http://127.0.0.1:8765 python 1.py
+BASE_URL = os.environ.get("MAKESHIP_BASE_URL", CANONICAL_BASE_URL).rstrip("/")
+
+
+def is_simulated():
+    """실제 사이트가 아닌 다른 주소(시뮬레이터 등)로 요청하는지 여부"""
+    return BASE_URL != CANONICAL_BASE_URL
+
+
+def site_url(url):
+    """실제 사이트 URL(또는 '/products/...' 경로)을 요청할 주소로 바꿉니다."""
+    if url.startswith("/"):
+        return BASE_URL + url
+    if url.startswith(CANONICAL_BASE_URL):
+        return BASE_URL + url[len(CANONICAL_BASE_URL):]
+    return url
+
+
+def canonical_url(url):
+    """요청한 주소를 실제 사이트 URL로 되돌립니다. (시뮬레이터 결과도 같은 키로 저장되도록)"""
+    if is_simulated() and url.startswith(BASE_URL):
+        return CANONICAL_BASE_URL + url[len(BASE_URL):]
+    return url
+
+
+def site_hostname():
+    return urlparse(BASE_URL).hostname or ""
@@ -0,0 +1,259 @@
+import json
+import re
+from datetime import datetime, timezone
+
+import aiohttp
+
+from scrape_logging import get_logger
+
+logger = get_logger("http")
+
+# 제품 페이지 HTML에 포함된 Next.js 데이터 스크립트
+NEXT_DATA_PATTERN = re.compile(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+
+# __NEXT_DATA__ 안에서 각 필드를 찾을 때 사용하는 키 후보 (앞에 있을수록 우선)
+# 사이트 구조가 바뀌면 이 목록만 수정하면 됩니다.
+FIELD_KEYS = {
+    "title": ("title", "name"),
+    "vendor": ("vendor", "creatorName", "creator_name"),
+    "product_type": ("productType", "product_type", "type"),
+    "end_date": ("campaignEndDate", "endDate", "endsAt", "end_date", "ends_at"),
+    "ship_date": ("estimatedShipDate", "shipDate", "ship_date", "shipsOn"),
+    "sold": ("totalSold", "unitsSold", "soldCount", "sold", "totalInventorySold"),
+    "goal": ("moq", "goal", "campaignGoal", "target"),
+    "limit": ("limitedQuantity", "inventoryLimit", "limit"),
+    "funded_percent": ("fundedPercent", "percentFunded", "funded_percentage"),
+    "sold_out": ("soldOut", "isSoldOut", "sold_out"),
+    "creator_link": ("creatorUrl", "creatorLink", "storeUrl", "creatorStoreUrl"),
+    "price": ("price", "amount", "minPrice"),
+}
+
+# Playwright 폴백 없이 사용하기 위해 반드시 있어야 하는 원본 필드
+REQUIRED_RAW_FIELDS = ("title", "ipName", "category", "endDatePrimary", "priceGeneral")
+
+
+def extract_next_data(html):
+    """HTML에서 __NEXT_DATA__ JSON을 추출합니다. 없으면 None을 반환합니다."""
+    match = NEXT_DATA_PATTERN.search(html)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except ValueError:
+        return None
+
+
+def _find_product_object(data):
+    """__NEXT_DATA__에서 제품 객체(제목과 handle/variants/productType을 가진 dict)를 너비 우선으로 찾습니다."""
+    queue = [data.get("props", {}).get("pageProps", data)]
+    while queue:
+        node = queue.pop(0)
+        if isinstance(node, dict):
+            if "title" in node and any(key in node for key in ("handle", "variants", "productType")):
+                return node
+            queue.extend(node.values())
+        elif isinstance(node, list):
+            queue.extend(node)
+    return None
+
+
+def _find_value(node, keys, max_depth=4):
+    """중첩된 dict/list에서 keys 중 하나에 해당하는 첫 스칼라 값을 찾습니다."""
+    if max_depth < 0:
+        return None
+    if isinstance(node, dict):
+        for key in keys:
+            value = node.get(key)
+            if value not in (None, "", [], {}):
+                if isinstance(value, dict):
+                    nested = _find_value(value, ("amount", "value"), 0)
+                    if nested is not None:
+                        return nested
+                elif not isinstance(value, list):
+                    return value
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+    for child in children:
+        if isinstance(child, (dict, list)):
+            found = _find_value(child, keys, max_depth - 1)
+            if found is not None:
+                return found
+    return None
+
+
+def _parse_datetime(value):
+    if isinstance(value, (int, float)):
+        # 초 또는 밀리초 단위 타임스탬프
+        return datetime.fromtimestamp(value / 1000 if value > 1e11 else value, tz=timezone.utc)
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _format_date(dt):
+    """페이지에 표시되는 것과 같은 'Month D, YYYY' 형식으로 변환합니다."""
+    return f"{dt:%B} {dt.day}, {dt.year}"
+
+
+def map_next_data_to_raw(next_data, base_url="https://www.makeship.com"):
+    """
+    __NEXT_DATA__를 1.py의 EXTRACT_FIELDS_JS와 같은 형태의 원본 필드 dict로 변환합니다.
+    찾지 못한 필드는 None으로 남기므로, 1.py의 build_product_data로 동일하게 후처리할 수 있습니다.
+    """
+    product = _find_product_object(next_data) if next_data else None
+    if not product:
+        return None
+
+    def value(field):
+        return _find_value(product, FIELD_KEYS[field])
+
+    raw = {
+        "title": value("title"),
+        "ipName": None,
+        "category": value("product_type"),
+        "endDatePrimary": None,
+        "endDateCountdown": None,
+        "salesCandidates": [],
+        "fundedCandidates": [],
+        "visibleSalesText": None,
+        "shippingPrimary": None,
+        "shippingHybrid": None,
+        "shippingGeneral": None,
+        "ipLink": None,
+        "pricePrimary": None,
+        "priceGeneral": None,
+        "priceTotal": None,
+    }
+
+    vendor = value("vendor")
+    if vendor:
+        raw["ipName"] = f"By: {vendor}"
+
+    end_dt = _parse_datetime(value("end_date")) if value("end_date") else None
+    if end_dt:
+        prefix = "Ends on" if end_dt > datetime.now(timezone.utc) else "Ended:"
+        raw["endDatePrimary"] = f"{prefix} {_format_date(end_dt)}"
+
+    ship_dt = _parse_datetime(value("ship_date")) if value("ship_date") else None
+    if ship_dt:
+        raw["shippingGeneral"] = f"Ships {_format_date(ship_dt)}"
+
+    # 판매량: 한정 수량 캠페인은 'X of Y sold', 일반 캠페인은 'X sold' (페이지 표시 형식과 동일)
+    sold = value("sold")
+    limit = value("limit")
+    if value("sold_out") is True:
+        raw["salesCandidates"].append(["__NEXT_DATA__ soldOut", "Sold Out"])
+    elif sold is not None:
+        sales_text = f"{sold} of {limit} sold" if limit else f"{sold} sold"
+        raw["salesCandidates"].append(["__NEXT_DATA__ sold", sales_text])
+
+    # 달성률: 명시적인 값이 없으면 목표 수량(MOQ) 대비 판매량으로 계산
+    funded = value("funded_percent")
+    goal = value("goal")
+    if funded is None and sold is not None and goal:
+        try:
+            funded = int(float(sold) / float(goal) * 100)
+        except (TypeError, ValueError, ZeroDivisionError):
+            funded = None
+    if funded is not None:
+        raw["fundedCandidates"].append(["__NEXT_DATA__ funded", f"{funded}% Funded"])
+
+    link = value("creator_link")
+    if link:
+        raw["ipLink"] = link if not str(link).startswith("/") else f"{base_url}{link}"
+
+    price = value("price")
+    if price is not None:
+        raw["priceGeneral"] = f"${price}"
+
+    return raw
+
+
+def missing_raw_fields(raw):
+    """Playwright 폴백이 필요한지 판단하기 위해 누락된 필수 필드 목록을 반환합니다."""
+    if not raw:
+        return list(REQUIRED_RAW_FIELDS) + ["판매량/달성률"]
+    missing = [field for field in REQUIRED_RAW_FIELDS if not raw.get(field)]
+    if not raw.get("salesCandidates") and not raw.get("fundedCandidates"):
+        missing.append("판매량/달성률")
+    return missing
+
+
+class NextDataFetcher:
+    """
+    브라우저 없이 제품 페이지 HTML을 받아 __NEXT_DATA__를 파싱하는 비동기 HTTP 수집기.
+    하나의 aiohttp 세션(커넥션 풀)을 공유하며, 요청마다 proxy.txt의 프록시를 지정합니다.
+    """
+
+    def __init__(self, max_connections=50, timeout=15):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.session = None
+        self.hits = 0       # JSON만으로 완성된 제품 수
+        self.fallbacks = 0  # Playwright 폴백이 필요했던 제품 수
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def start(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"},
+        )
+
+    async def close(self):
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def fetch_html(self, url, proxy=None):
+        proxy_url = f"http://{proxy}" if proxy else None
+        async with self.session.get(url, proxy=proxy_url) as response:
+            response.raise_for_status()
+            return await response.text()
+
+    async def fetch_raw(self, url, proxy=None):
+        """
+        제품 페이지의 원본 필드를 HTTP 요청 한 번으로 가져옵니다.
+        반환값: (raw, missing) - raw가 None이거나 missing이 비어 있지 않으면 Playwright 폴백이 필요합니다.
+        완료/폴백 집계는 후처리까지 끝난 뒤 호출하는 쪽에서 record_result로 한 번만 남깁니다.
+        """
+        try:
+            html = await self.fetch_html(url, proxy)
+        except Exception as e:
+            # 연결/타임아웃 오류뿐 아니라 디코딩 오류(UnicodeDecodeError 등)도 Playwright로 다시 시도
+            logger.warning(f"HTTP 수집 실패 ({url}): {e!r}")
+            return None, list(REQUIRED_RAW_FIELDS)
+
+        try:
+            raw = map_next_data_to_raw(extract_next_data(html))
+        except Exception as e:
+            # 구조가 예상과 다른 __NEXT_DATA__ (잘못된 JSON, 타입이 다른 값 등)는 실패가 아니라 Playwright 폴백
+            logger.warning(f"__NEXT_DATA__ 파싱 실패 ({url}): {e!r}")
+            return None, list(REQUIRED_RAW_FIELDS)
+        return raw, missing_raw_fields(raw)
+
+    def record_result(self, completed):
+        """제품 하나의 HTTP 경로 결과를 집계합니다. (completed=False면 Playwright 폴백)"""
+        if completed:
+            self.hits += 1
+        else:
+            self.fallbacks += 1
+
+    def print_summary(self):
+        total = self.hits + self.fallbacks
+        if total:
+            print(f"HTTP(__NEXT_DATA__) 수집: {self.hits}/{total}개 완료, {self.fallbacks}개 Playwright 폴백")
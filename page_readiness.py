@@ -0,0 +1,107 @@
+import time
+
+# 준비 완료 판정에 사용하는 대상 필드.
+# 필드별로 (셀렉터, 텍스트 패턴 또는 None) 대안 목록을 가지며, 대안 중 하나라도 만족하면 해당 필드가 준비된 것으로 봅니다.
+READY_FIELDS = {
+    "제품명": [
+        ('[class*="ProductDetails__ProductTitle"]', None),
+    ],
+    "판매량": [
+        ('[class*="ProgressBarContainer__"] p', None),
+        ('p[data-testid="units-sold-text"]', None),
+        ('p', r'^Sold\s+Out$'),
+    ],
+    "종료일": [
+        ('[class*="ProductPageCountdown__CountdownDate"]', None),
+        ('[class*="handle__ProductInfoWrapper"] p', r'Ends on|Ended|days left'),
+    ],
+    "가격": [
+        ('[class*="ProductInfo__Price"]', None),
+        ('[class*="ProductInfo__ProductHeaderWrapper"] p', r'\$\d'),
+    ],
+}
+
+# 페이지 안에서 대상 필드 존재 여부와 DOM 변경 정지(quiet) 여부를 판정하는 스크립트.
+# 첫 호출 시 MutationObserver를 설치하여 마지막 DOM 변경 시각을 기록합니다.
+READINESS_JS = """
+({fields, quietMs}) => {
+    let state = window.__makeshipReadiness;
+    if (!state) {
+        state = window.__makeshipReadiness = { lastMutation: performance.now() };
+        new MutationObserver(() => { state.lastMutation = performance.now(); })
+            .observe(document, { subtree: true, childList: true, characterData: true });
+    }
+    const missing = [];
+    for (const [name, alternatives] of Object.entries(fields)) {
+        const found = alternatives.some(([selector, pattern]) => {
+            const elements = document.querySelectorAll(selector);
+            if (!pattern) return elements.length > 0;
+            const regex = new RegExp(pattern, 'i');
+            for (const el of elements) {
+                if (regex.test((el.textContent || '').trim())) return true;
+            }
+            return false;
+        });
+        if (!found) missing.push(name);
+    }
+    if (missing.length === 0) return { reason: 'all_fields', missing };
+    if (performance.now() - state.lastMutation >= quietMs) return { reason: 'quiet', missing };
+    return false;
+}
+"""
+
+
+class ReadinessStats:
+    """페이지별 준비 대기 시간을 기록하고 요약합니다."""
+
+    def __init__(self):
+        self.wait_ms = []
+        self.reasons = {}
+
+    def record(self, elapsed_ms, reason):
+        self.wait_ms.append(elapsed_ms)
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+    def percentile(self, p):
+        if not self.wait_ms:
+            return 0.0
+        ordered = sorted(self.wait_ms)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def print_summary(self):
+        if not self.wait_ms:
+            return
+        print(f"페이지 준비 대기: {len(self.wait_ms)}건, p50 {self.percentile(50):.0f}ms, "
+              f"p95 {self.percentile(95):.0f}ms, 최대 {max(self.wait_ms):.0f}ms")
+        reasons = ", ".join(f"{k}={v}" for k, v in sorted(self.reasons.items()))
+        print(f"  판정 사유: {reasons}")
+
+
+async def wait_for_product_ready(page, quiet_ms=500, max_wait_ms=5000, stats=None):
+    """
+    고정 sleep 대신, 대상 필드(제품명, 판매량, 종료일, 가격)가 모두 나타나거나
+    DOM 변경이 quiet_ms 동안 멈출 때까지 기다립니다.
+
+    반환값: {"대기_ms": 실제 대기 시간, "사유": 'all_fields' | 'quiet' | 'timeout', "누락_필드": [...]}
+    max_wait_ms를 넘겨도 예외를 발생시키지 않고 'timeout' 사유로 반환합니다.
+    """
+    start = time.perf_counter()
+    try:
+        handle = await page.wait_for_function(
+            READINESS_JS,
+            arg={"fields": READY_FIELDS, "quietMs": quiet_ms},
+            polling=100,
+            timeout=max_wait_ms,
+        )
+        result = await handle.json_value()
+        reason = result.get("reason", "all_fields")
+        missing = result.get("missing", [])
+    except Exception:
+        reason = "timeout"
+        missing = list(READY_FIELDS)
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if stats is not None:
+        stats.record(elapsed_ms, reason)
+    return {"대기_ms": round(elapsed_ms, 1), "사유": reason, "누락_필드": missing}
@@ -0,0 +1,146 @@
+import argparse
+import os
+import random
+import re
+import time
+from datetime import datetime
+
+import makeship_parsing
+from makeship_parsing import (calculate_revenue, convert_to_numeric, normalize_date, normalize_stored_date,
+                              process_sales_data)
+from product_store import DEFAULT_DB_FILE, ProductStore
+
+# makeship_parsing 함수의 값 하나당 처리 비용을 측정합니다.
+#   python parsing_benchmark.py               # 제품 DB가 있으면 실제 레코드, 없으면 생성한 값으로 측정
+#   python parsing_benchmark.py --count 50000
+# '첫 처리'는 캐시를 비운 뒤 한 번 훑는 비용(데이터 안의 반복만 캐시 효과), '재처리'는 모든 값이 캐시에 있는 경우입니다.
+# '기존 방식'은 공용 모듈 도입 전의 strptime/인라인 정규식 구현으로, 비교 기준으로만 사용합니다.
+
+DEFAULT_SAMPLE_COUNT = 20000
+REPEATS = 3
+
+MONTHS = ("January", "February", "March", "April", "May", "June", "July", "August", "September", "October",
+          "November", "December")
+
+
+def legacy_normalize_date(date_str):
+    """기존 방식: strptime을 최대 세 번 시도 (실패할 때마다 ValueError)"""
+    if not date_str or date_str == '정보 없음':
+        return '정보 없음'
+    parts = date_str.split(' / ')
+    project_end_date_part = parts[0].strip()
+    try:
+        project_end_date_clean = ' '.join(project_end_date_part.split(' ')[:3])
+        return datetime.strptime(project_end_date_clean.replace(',', ''), '%B %d %Y').strftime('%Y-%m-%d')
+    except ValueError:
+        pass
+    if 'Ships ' in date_str:
+        try:
+            return datetime.strptime(date_str.split('Ships ')[-1].strip().replace(',', ''), '%B %d %Y').strftime('%Y-%m-%d')
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(date_str.replace(',', ''), '%B %d %Y').strftime('%Y-%m-%d')
+    except ValueError:
+        return '정보 없음'
+
+
+def legacy_process_sales_data(sales_raw_text, funded_raw_text):
+    """기존 방식: 호출마다 인라인 패턴으로 re.search (정규식 검색 부분만 재현)"""
+    sold_of_match = re.search(r'([0-9,]+)\s+of\s+([0-9,]+)\s+sold', sales_raw_text, re.IGNORECASE)
+    if sold_of_match:
+        sales = sold_of_match.group(1).replace(',', '')
+    else:
+        sold_only_match = re.search(r'([0-9,]+)\s+sold', sales_raw_text, re.IGNORECASE)
+        sales = sold_only_match.group(1).replace(',', '') if sold_only_match else "Sold Out"
+    funded_match = re.search(r'([0-9,]+%)(?:\s*\+)?\s+Funded', funded_raw_text, re.IGNORECASE)
+    return sales, funded_match.group(1).replace(',', '') if funded_match else "달성률 정보를 찾을 수 없습니다."
+
+
+def generate_samples(count, seed=42):
+    """제품 DB가 없을 때 쓸 원문 값 (종료일/배송일/판매량/달성률/가격)을 만듭니다."""
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        month, day, year = rng.choice(MONTHS), rng.randint(1, 28), rng.choice((2022, 2023, 2024, 2025))
+        end_date = rng.choice((f"{month} {day}, {year}", f"{month} {day}, 5:00AM GMT+9 / Ships {month} {day}, {year}",
+                               f"Ended: {month} {day}, {year}", "해당 없음"))
+        sold = rng.randint(0, 5000)
+        sales = rng.choice((f"{sold:,} sold", f"{sold:,} of {max(sold, 200):,} sold", "Sold Out"))
+        funded = rng.choice((f"{sold // 2}% Funded", f"{sold // 2:,}%+ Funded", "정보 없음"))
+        samples.append({
+            "프로젝트_종료일": end_date,
+            "배송_시작일": f"Ships {month} {day}, {year}",
+            "판매량_원문": sales,
+            "달성률_원문": funded,
+            "판매량": str(sold),
+            "달성률": f"{sold // 2}%",
+            "제품군": rng.choice(("Plush", "Hoodie", "Enamel Pin", "Keychain Plush")),
+            "제품_가격": rng.choice(("29.99", "59.99", "가격을 찾을 수 없습니다.")),
+        })
+    return samples
+
+
+def load_samples(count):
+    if os.path.exists(DEFAULT_DB_FILE):
+        with ProductStore(DEFAULT_DB_FILE) as store:
+            products = list(store.iter_products())[:count]
+        if products:
+            print(f"제품 DB '{DEFAULT_DB_FILE}'의 레코드 {len(products)}개로 측정합니다. (판매량/달성률 원문은 생성한 값 사용)")
+            generated = generate_samples(len(products))
+            for product, sample in zip(products, generated):
+                product.setdefault("판매량_원문", sample["판매량_원문"])
+                product.setdefault("달성률_원문", sample["달성률_원문"])
+            return products
+    print(f"제품 DB가 없어 생성한 값 {count}개로 측정합니다.")
+    return generate_samples(count)
+
+
+def clear_caches():
+    for function in (makeship_parsing._parse_date_text, makeship_parsing._parse_numeric_text,
+                     makeship_parsing.process_sales_data):
+        function.cache_clear()
+
+
+def measure(function, samples, cold=False):
+    """값 하나당 평균 처리 시간(마이크로초). 여러 번 반복해 가장 빠른 결과를 사용합니다."""
+    best = None
+    for _ in range(REPEATS):
+        if cold:
+            clear_caches()
+        started = time.perf_counter()
+        for sample in samples:
+            function(sample)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(samples) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="makeship_parsing 값 하나당 처리 비용 측정")
+    parser.add_argument("--count", type=int, default=DEFAULT_SAMPLE_COUNT, help="측정할 레코드 수")
+    args = parser.parse_args()
+
+    samples = load_samples(args.count)
+    cases = [
+        ("normalize_date (종료일)", lambda s: legacy_normalize_date(s.get("프로젝트_종료일")),
+         lambda s: normalize_date(s.get("프로젝트_종료일"))),
+        ("normalize_date (배송일)", lambda s: legacy_normalize_date(s.get("배송_시작일")),
+         lambda s: normalize_date(s.get("배송_시작일"))),
+        ("normalize_stored_date (2.py)", None, lambda s: normalize_stored_date(s.get("프로젝트_종료일"))),
+        ("process_sales_data", lambda s: legacy_process_sales_data(s["판매량_원문"], s["달성률_원문"]),
+         lambda s: process_sales_data(s["판매량_원문"], s["달성률_원문"])),
+        ("convert_to_numeric", None, lambda s: convert_to_numeric(s.get("판매량"))),
+        ("calculate_revenue", None, lambda s: calculate_revenue(s.get("판매량"), s.get("제품군"), s.get("제품_가격"))),
+    ]
+
+    print(f"\n{'함수':<30} {'기존 방식':>12} {'첫 처리':>12} {'재처리':>12}  (µs/값)")
+    for name, legacy, current in cases:
+        legacy_cost = f"{measure(legacy, samples):.2f}" if legacy else "-"
+        cold_cost = measure(current, samples, cold=True)
+        warm_cost = measure(current, samples)
+        print(f"{name:<30} {legacy_cost:>12} {cold_cost:>12.2f} {warm_cost:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import asyncio
+import re
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from complete_infinite_extractor import ensure_listing_endpoints, extract_categories_parallel
+from listing_api import discover_listings
+from makeship_site import site_url
+from next_data_fetcher import USER_AGENT
+
+# 지난 상품(/shop/past) 전체 목록 수집.
+# past 목록은 약 805개를 불러오면 처음으로 초기화되므로, 필터/정렬로 목록을 나눠 각 파티션이 한계보다 작게 만든 뒤
+# 파티션을 동시에 수집해 합칩니다. 결과는 페이지에 표시된 전체 개수와 비교해 커버리지로 보고합니다.
+#   1단계: 전체 목록 최신순 + 오래된순 (한계의 두 배까지 커버, API가 한계 없이 넘겨지면 여기서 끝)
+#   2단계: 제품군(type) 필터별 목록
+#   3단계: 2단계에서 한계에 걸린 제품군은 오래된순으로 한 번 더
+# 실제 사이트의 필터/정렬 파라미터가 바뀌면 아래 PARTITION_* 상수만 수정하면 됩니다.
+
+PAST_URL = "https://www.makeship.com/shop/past"
+PAST_RESET_THRESHOLD = 805
+
+PARTITION_TYPE_PARAM = "type"
+PARTITION_SORT_PARAM = "sort"
+PARTITION_SORT_NEWEST = "newest"
+PARTITION_SORT_OLDEST = "oldest"
+# 제품군 필터 값 (complete_infinite_extractor.py의 카테고리 slug와 동일)
+PARTITION_TYPES = ("hoodies", "knitted-crewnecks", "t-shirts", "enamel-pins", "vinyl-figures", "plushies", "longbois",
+                   "doughbois", "jumbo-plushies", "keychain-plushies")
+
+# 목록 페이지에 표시되는 전체 개수 (예: '1,419 products')
+ADVERTISED_TOTAL_PATTERN = re.compile(r'([0-9][0-9,]*)\s+(?:products|results|items)\b', re.IGNORECASE)
+
+
+def partition_url(params):
+    return f"{PAST_URL}?{urlencode(params)}" if params else PAST_URL
+
+
+def partition_endpoint(endpoint, params):
+    """past 목록 API 엔드포인트에 파티션 필터 쿼리를 덧붙인 엔드포인트"""
+    parsed = urlparse(endpoint["url"])
+    query = [(name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True) if name not in params]
+    query.extend(params.items())
+    return dict(endpoint, url=urlunparse(parsed._replace(query=urlencode(query))))
+
+
+def fetch_advertised_total(url, politeness=None):
+    """목록 페이지 HTML에서 표시된 전체 상품 수를 읽습니다. (찾지 못하면 None)"""
+    target_url = site_url(url)
+    if politeness:
+        politeness.wait_turn(target_url)
+    request = urllib.request.Request(target_url, headers={"User-Agent": USER_AGENT})
+    try:
+        with urllib.request.urlopen(request, timeout=15) as response:
+            html = response.read().decode("utf-8", errors="replace")
+    except (urllib.error.URLError, OSError) as e:
+        print(f"  ⚠️ 전체 개수 확인 실패 ({url}): {e}")
+        return None
+    match = ADVERTISED_TOTAL_PATTERN.search(html)
+    return int(match.group(1).replace(',', '')) if match else None
+
+
+def is_truncated(links, total):
+    """파티션이 초기화 한계에 걸려 일부만 수집되었을 수 있는지 여부"""
+    if total is not None:
+        return len(links) < total
+    return len(links) >= PAST_RESET_THRESHOLD
+
+
+def discover_partitions(partitions, politeness, endpoint=None, max_browsers=2, max_products=PAST_RESET_THRESHOLD):
+    """
+    파티션(이름 -> 필터 쿼리)들을 동시에 수집합니다. 반환값: 이름 -> (링크 목록, 표시된 전체 개수)
+    endpoint(past 목록 API)가 있으면 aiohttp로 API를 직접 넘기고, 없거나 실패한 파티션은 브라우저 무한 스크롤로 수집합니다.
+    """
+    configs = {name: {"url": partition_url(params), "max_products": max_products} for name, params in partitions.items()}
+    results = {}
+    if endpoint:
+        targets = [(name, config["url"], config["max_products"]) for name, config in configs.items()]
+        endpoints = {configs[name]["url"]: partition_endpoint(endpoint, params) for name, params in partitions.items()}
+        for name, result in asyncio.run(discover_listings(targets, endpoints, politeness)).items():
+            if result is not None:
+                results[name] = result
+
+    remaining = {name: config for name, config in configs.items() if name not in results}
+    if remaining:
+        scrolled = extract_categories_parallel(remaining, max_browsers, politeness)
+        for name, links in scrolled.items():
+            results[name] = (links, fetch_advertised_total(configs[name]["url"], politeness))
+    return results
+
+
+def enumerate_past_catalog(politeness, use_api=True, max_browsers=2, recapture=False):
+    """
+    지난 상품 전체를 파티션으로 나눠 수집합니다.
+    반환값: (정렬된 링크 목록, 보고서 dict - 파티션별 수집 수/표시된 전체/잘림 가능 여부와 전체 커버리지)
+    """
+    started = time.time()
+    advertised_total = fetch_advertised_total(PAST_URL, politeness)
+    endpoint = None
+    if use_api:
+        endpoint = ensure_listing_endpoints([PAST_URL], politeness, recapture).get(PAST_URL)
+        if not endpoint:
+            print("past 목록 API를 찾지 못해 무한 스크롤로 파티션을 수집합니다.")
+
+    collected = set()
+    partition_reports = []
+
+    def run_round(title, partitions, max_products=PAST_RESET_THRESHOLD):
+        print(f"\n--- {title}: 파티션 {len(partitions)}개 ---")
+        results = discover_partitions(partitions, politeness, endpoint, max_browsers, max_products)
+        for name, (links, total) in results.items():
+            before = len(collected)
+            collected.update(links)
+            truncated = is_truncated(links, total)
+            partition_reports.append({
+                "파티션": name,
+                "쿼리": urlencode(partitions[name]),
+                "수집": len(links),
+                "표시된_전체": total,
+                "신규": len(collected) - before,
+                "잘림_가능": truncated,
+            })
+            if (total is not None and advertised_total and total >= advertised_total
+                    and PARTITION_TYPE_PARAM in partitions[name]):
+                print(f"  ⚠️ [{name}] 필터 결과가 전체 목록과 같습니다. 사이트가 '{PARTITION_TYPE_PARAM}' 필터를 무시하는 것 같습니다.")
+        return results
+
+    def complete():
+        return advertised_total is not None and len(collected) >= advertised_total
+
+    # 1단계: 전체 목록을 양쪽 정렬로 (API는 한계 없이 넘겨질 수 있으므로 표시된 전체 개수까지 요청)
+    first_round = run_round("1단계 전체 목록 정렬", {
+        "전체 최신순": {PARTITION_SORT_PARAM: PARTITION_SORT_NEWEST},
+        "전체 오래된순": {PARTITION_SORT_PARAM: PARTITION_SORT_OLDEST},
+    }, max_products=max(advertised_total or 0, PAST_RESET_THRESHOLD) if endpoint else PAST_RESET_THRESHOLD)
+    if advertised_total is None:
+        # 페이지에서 전체 개수를 찾지 못하면 API 응답의 전체 개수를 사용
+        advertised_total = max((total for _, total in first_round.values() if total is not None), default=None)
+
+    if not complete():
+        # 2단계: 제품군별
+        type_round = run_round("2단계 제품군별", {
+            f"{slug} 최신순": {PARTITION_TYPE_PARAM: slug, PARTITION_SORT_PARAM: PARTITION_SORT_NEWEST}
+            for slug in PARTITION_TYPES
+        })
+        # 3단계: 한계에 걸린 제품군은 반대 정렬로 한 번 더
+        saturated = [name.rsplit(' ', 1)[0] for name, (links, total) in type_round.items() if is_truncated(links, total)]
+        if saturated and not complete():
+            run_round("3단계 한계에 걸린 제품군 반대 정렬", {
+                f"{slug} 오래된순": {PARTITION_TYPE_PARAM: slug, PARTITION_SORT_PARAM: PARTITION_SORT_OLDEST}
+                for slug in saturated
+            })
+
+    report = {
+        "수집": len(collected),
+        "표시된_전체": advertised_total,
+        "커버리지": round(len(collected) / advertised_total * 100, 1) if advertised_total else None,
+        "누락_추정": max(advertised_total - len(collected), 0) if advertised_total else None,
+        "파티션": partition_reports,
+        "소요_초": round(time.time() - started, 1),
+    }
+    return sorted(collected), report
+
+
+def print_coverage(report):
+    print("\n📊 지난 상품 커버리지")
+    print(f"{'파티션':<28} {'수집':>6} {'표시된 전체':>10} {'신규':>6}")
+    for partition in report["파티션"]:
+        total = partition["표시된_전체"] if partition["표시된_전체"] is not None else "?"
+        mark = " ⚠️ 한계에 걸림" if partition["잘림_가능"] else ""
+        print(f"{partition['파티션']:<28} {partition['수집']:>6} {total:>10} {partition['신규']:>6}{mark}")
+    if report["표시된_전체"]:
+        print(f"합계: {report['수집']}/{report['표시된_전체']}개 ({report['커버리지']}%), 누락 추정 {report['누락_추정']}개")
+    else:
+        print(f"합계: {report['수집']}개 (사이트에 표시된 전체 개수를 찾지 못해 커버리지를 계산할 수 없음)")
+    print(f"소요 시간: {report['소요_초']}초")
+
+
+def save_past_catalog(links, report, filename):
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(f"Makeship Past 상품 전체 링크 목록 (총 {len(links)}개)\n")
+        f.write("=" * 60 + "\n")
+        f.write("※ 필터/정렬 파티션으로 나눠 805개 초기화 한계 없이 수집\n")
+        if report["표시된_전체"]:
+            f.write(f"※ 커버리지: {report['수집']}/{report['표시된_전체']}개 ({report['커버리지']}%)\n")
+        f.write(f"※ 수집 일시: {time.strftime('%Y년 %m월 %d일 %H시 %M분')}\n\n")
+        for i, link in enumerate(links, 1):
+            f.write(f"{i}. {link}\n")
+    print(f"\nPast 상품 전체 링크들이 '{filename}' 파일에 저장되었습니다.")
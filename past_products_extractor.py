@@ -1,3 +1,4 @@
+import argparse
 import time
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -9,12 +10,15 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
+from host_politeness import HostPoliteness
+
+PAST_URL = "https://www.makeship.com/shop/past"
 
 def extract_past_products_with_infinite_scroll():
     """
     Makeship의 past 페이지에서 무한 스크롤을 통해 모든 상품을 추출하는 함수
     """
-    url = "https://www.makeship.com/shop/past"
+    url = PAST_URL
     
     # Chrome 옵션 설정
     chrome_options = Options()
@@ -151,16 +155,43 @@ def save_past_products_to_file(links, filename="makeship_past_products.txt"):
     except Exception as e:
         print(f"파일 저장 중 오류 발생: {e}")
 
+def extract_past_products_via_api(max_products=805):
+    """
+    스크롤 대신 past 페이지가 호출하는 목록 API를 직접 요청해 상품을 추출하는 함수
+    (엔드포인트 캡처/저장과 실패 시 무한 스크롤 대체는 complete_infinite_extractor와 같음)
+    """
+    from complete_infinite_extractor import extract_categories_via_api
+    configs = {"지난 상품": {"url": PAST_URL, "max_products": max_products}}
+    return extract_categories_via_api(configs, HostPoliteness())["지난 상품"]
+
 def main():
     """
     메인 실행 함수
     """
+    parser = argparse.ArgumentParser(description="Makeship Past 상품 추출기")
+    parser.add_argument("--api", action="store_true", help="목록 API를 직접 호출해 수집 (무한 스크롤 대신)")
+    parser.add_argument("--full", action="store_true",
+                        help="필터/정렬 파티션으로 나눠 805개 한계 없이 전체 수집하고 커버리지 보고 (--api와 함께 쓰면 API 우선)")
+    parser.add_argument("--parallel", type=int, default=2, help="--full에서 무한 스크롤로 수집할 때 동시에 사용할 브라우저 수")
+    args = parser.parse_args()
+    
+    if args.full:
+        from past_catalog import enumerate_past_catalog, print_coverage, save_past_catalog
+        print("Makeship Past 상품 전체 추출 시작 (파티션 병렬 수집)...")
+        past_links, report = enumerate_past_catalog(HostPoliteness(), use_api=args.api, max_browsers=args.parallel)
+        print_coverage(report)
+        if past_links:
+            save_past_catalog(past_links, report, f"makeship_past_products_full_{time.strftime('%Y%m%d_%H%M%S')}.txt")
+        else:
+            print("❌ Past 상품을 찾을 수 없습니다.")
+        return
+    
     print("Makeship Past 상품 무한 스크롤 추출 시작...")
     print("805개 한계점에서 자동으로 중단됩니다.")
     print("이 과정은 시간이 걸릴 수 있습니다. 잠시만 기다려주세요.")
     
     # Past 상품 추출
-    past_links = extract_past_products_with_infinite_scroll()
+    past_links = extract_past_products_via_api() if args.api else extract_past_products_with_infinite_scroll()
     
     if past_links:
         print(f"\n" + "=" * 60)
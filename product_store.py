@@ -0,0 +1,185 @@
+import glob
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+# 전체 제품 데이터를 보관하는 SQLite 파일 (makeship_all_products_*.json 누적 대신 사용)
+DEFAULT_DB_FILE = "makeship_products.db"
+# 예전 실행이 남긴 결과 파일 (처음 한 번만 DB로 가져옴)
+LEGACY_JSON_PATTERN = "makeship_all_products_*.json"
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    url TEXT PRIMARY KEY,
+    status TEXT,
+    sales TEXT,
+    end_date TEXT,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    run_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_products_status ON products(status);
+CREATE INDEX IF NOT EXISTS idx_products_sales ON products(sales);
+CREATE INDEX IF NOT EXISTS idx_products_end_date ON products(end_date);
+
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    product_count INTEGER DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    run_id INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    data TEXT NOT NULL,
+    scraped_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, url)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_url ON snapshots(url);
+
+CREATE TABLE IF NOT EXISTS imported_files (
+    filename TEXT PRIMARY KEY,
+    imported_at TEXT NOT NULL
+);
+"""
+
+
+class ProductStore:
+    """
+    제품_URL을 키로 하는 SQLite(WAL) 제품 저장소.
+
+    - products: URL별 최신 레코드 (스크래핑할 때마다 upsert)
+    - runs / snapshots: 실행 단위 기록과 실행별 레코드 이력
+    - JSON/Excel 결과 파일은 이 DB에서 내보냅니다. (export_json)
+    """
+
+    def __init__(self, path=DEFAULT_DB_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def begin_run(self, source="scrape"):
+        with self.conn:
+            cursor = self.conn.execute("INSERT INTO runs (source, started_at) VALUES (?, ?)",
+                                       (source, datetime.now().strftime(TIME_FORMAT)))
+        return cursor.lastrowid
+
+    def finish_run(self, run_id, product_count):
+        with self.conn:
+            self.conn.execute("UPDATE runs SET finished_at = ?, product_count = ? WHERE id = ?",
+                              (datetime.now().strftime(TIME_FORMAT), product_count, run_id))
+
+    def upsert_many(self, records, run_id=None, scraped_at=None):
+        """레코드들을 한 트랜잭션으로 upsert하고, run_id가 있으면 실행별 스냅샷도 남깁니다. 처리한 개수를 반환합니다."""
+        scraped_at = (scraped_at or datetime.now()).strftime(TIME_FORMAT)
+        rows = [
+            (record["제품_URL"], record.get("진행_여부"), record.get("판매량"), record.get("프로젝트_종료일"),
+             json.dumps(record, ensure_ascii=False), scraped_at, run_id)
+            for record in records if record.get("제품_URL")
+        ]
+        with self.conn:
+            self.conn.executemany(
+                """INSERT INTO products (url, status, sales, end_date, data, updated_at, run_id)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(url) DO UPDATE SET status = excluded.status, sales = excluded.sales,
+                       end_date = excluded.end_date, data = excluded.data,
+                       updated_at = excluded.updated_at, run_id = excluded.run_id""",
+                rows,
+            )
+            if run_id is not None:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO snapshots (run_id, url, data, scraped_at) VALUES (?, ?, ?, ?)",
+                    [(run_id, row[0], row[4], scraped_at) for row in rows],
+                )
+        return len(rows)
+
+    def upsert(self, record, run_id=None, scraped_at=None):
+        return self.upsert_many([record], run_id, scraped_at)
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def iter_products(self):
+        for (data,) in self.conn.execute("SELECT data FROM products ORDER BY url"):
+            yield json.loads(data)
+
+    def load_products(self):
+        """URL별 최신 레코드 딕셔너리를 반환합니다."""
+        return {product["제품_URL"]: product for product in self.iter_products()}
+
+    def updated_times(self):
+        """URL별 레코드가 마지막으로 반영된 수집 시각 (TIME_FORMAT 문자열)"""
+        return dict(self.conn.execute("SELECT url, updated_at FROM products"))
+
+    def iter_runs(self):
+        """레코드를 남긴 실행 목록: (id, source, started_at, product_count)"""
+        return self.conn.execute(
+            "SELECT id, source, started_at, product_count FROM runs WHERE product_count > 0 ORDER BY id").fetchall()
+
+    def run_products(self, run_id):
+        """실행 하나가 반영한 레코드 목록 (snapshots 테이블)"""
+        return [json.loads(data) for (data,) in
+                self.conn.execute("SELECT data FROM snapshots WHERE run_id = ? ORDER BY url", (run_id,))]
+
+    def sold_out_urls(self):
+        return {url for (url,) in self.conn.execute("SELECT url FROM products WHERE sales = 'Sold Out'")}
+
+    def import_legacy_json(self, pattern=LEGACY_JSON_PATTERN):
+        """
+        아직 가져오지 않은 예전 결과 JSON 파일을 DB로 가져옵니다. (파일명 순으로 적용하므로 최신 파일이 우선)
+        가져온 파일은 기록해 두므로 다음 실행부터는 다시 읽지 않습니다. 가져온 파일 수를 반환합니다.
+        """
+        imported = {filename for (filename,) in self.conn.execute("SELECT filename FROM imported_files")}
+        imported_count = 0
+        for json_file in sorted(glob.glob(pattern)):
+            if json_file in imported:
+                continue
+            try:
+                with open(json_file, "r", encoding="utf-8") as f:
+                    products = json.load(f).get("제품_목록", [])
+                modified = datetime.fromtimestamp(os.path.getmtime(json_file))
+                self.upsert_many(products, scraped_at=modified)
+                self._mark_imported(json_file)
+                imported_count += 1
+                print(f"'{json_file}'에서 {len(products)}개 제품을 DB로 가져왔습니다.")
+            except Exception as e:
+                print(f"'{json_file}' 가져오기 중 오류 발생: {e}")
+        return imported_count
+
+    def _mark_imported(self, filename):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO imported_files (filename, imported_at) VALUES (?, ?)",
+                              (filename, datetime.now().strftime(TIME_FORMAT)))
+
+    def export_json(self, output_filename=None):
+        """DB의 전체 제품을 makeship_all_products_<ts>.json 형식으로 내보내고 파일명을 반환합니다."""
+        if output_filename is None:
+            output_filename = f"makeship_all_products_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        products = list(self.iter_products())
+        final_data = {
+            "추출_시간": datetime.now().strftime(TIME_FORMAT),
+            "총_제품_수": len(products),
+            "제품_목록": products
+        }
+        tmp_filename = output_filename + ".tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as f:
+            json.dump(final_data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_filename, output_filename)
+        self._mark_imported(output_filename) # DB에서 내보낸 파일이므로 다시 가져오지 않음
+        return output_filename
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import random
+import time
+
+from scrape_logging import get_logger
+
+logger = get_logger("proxy")
+
+
+class ProxyStats:
+    """프록시 하나의 상태(성공률, 지연시간 EWMA, 연속 실패, 격리 정보)"""
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.latency_ewma = None      # 성공한 요청의 지연시간 지수이동평균 (초)
+        self.quarantined_until = 0.0  # 이 시각(time.monotonic)까지 격리
+        self.quarantine_count = 0     # 연속 격리 횟수 (격리 시간 지수 증가에 사용)
+        self.total_quarantines = 0    # 실행 중 전체 격리 횟수
+        self.in_flight = 0
+        self.last_error = None
+
+    @property
+    def success_rate(self):
+        # 표본이 적을 때 극단값이 나오지 않도록 라플라스 스무딩 적용
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+    def to_dict(self):
+        return {
+            "프록시": self.proxy,
+            "성공": self.successes,
+            "실패": self.failures,
+            "성공률": round(self.success_rate, 3),
+            "평균_지연_초": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            "연속_실패": self.consecutive_failures,
+            "격리_횟수": self.total_quarantines,
+            "마지막_오류": self.last_error,
+        }
+
+
+class ProxyManager:
+    """
+    상태 점수 기반 적응형 프록시 관리자.
+
+    - 성공률과 지연시간 EWMA로 계산한 가중치에 비례하여 프록시를 선택합니다.
+    - 연속 실패가 failure_threshold회에 도달하면 격리하며, 격리 시간은 base_quarantine초부터 지수적으로 늘어납니다.
+    - 격리 시간이 지나면 다시 선택 대상이 되어 재검증(re-probe)되고, 성공하면 격리 횟수가 초기화됩니다.
+    """
+
+    def __init__(self, proxies, ewma_alpha=0.3, failure_threshold=3, base_quarantine=30.0, max_quarantine=900.0):
+        self.stats = {proxy: ProxyStats(proxy) for proxy in proxies}
+        self.ewma_alpha = ewma_alpha
+        self.failure_threshold = failure_threshold
+        self.base_quarantine = base_quarantine
+        self.max_quarantine = max_quarantine
+        self.quarantine_wait_seconds = 0.0  # 모든 프록시가 격리 중이어서 기다린 시간 합계 (작업자별 누적)
+
+    def __len__(self):
+        return len(self.stats)
+
+    def _weight(self, stats, reference_latency):
+        latency = stats.latency_ewma if stats.latency_ewma is not None else reference_latency
+        latency_factor = reference_latency / (reference_latency + latency)
+        # 성공률은 제곱하여 실패가 잦은 프록시의 비중을 크게 낮춤, 동시 사용 중인 요청이 많을수록 약간 감점
+        return (stats.success_rate ** 2) * latency_factor / (1 + 0.1 * stats.in_flight)
+
+    def _reference_latency(self):
+        latencies = sorted(s.latency_ewma for s in self.stats.values() if s.latency_ewma is not None)
+        return latencies[len(latencies) // 2] if latencies else 5.0
+
+    async def acquire(self, exclude=()):
+        """
+        상태 점수에 비례하여 프록시를 하나 선택합니다.
+        exclude에 포함된 프록시는 가능하면 피합니다.
+        모든 프록시가 격리 중이면 격리 중인 프록시를 바로 내주지 않고, 가장 먼저 격리가 끝날 때까지 기다린 뒤 선택합니다.
+        """
+        while True:
+            now = time.monotonic()
+            candidates = [s for s in self.stats.values() if s.quarantined_until <= now and s.proxy not in exclude]
+            if not candidates:
+                candidates = [s for s in self.stats.values() if s.quarantined_until <= now]
+            if candidates:
+                break
+            delay = min(s.quarantined_until for s in self.stats.values()) - now
+            self.quarantine_wait_seconds += delay
+            await asyncio.sleep(delay)
+        reference_latency = self._reference_latency()
+        weights = [self._weight(s, reference_latency) for s in candidates]
+        chosen = random.choices(candidates, weights=weights, k=1)[0]
+        chosen.in_flight += 1
+        return chosen.proxy
+
+    def report_success(self, proxy, latency):
+        stats = self.stats[proxy]
+        stats.in_flight = max(0, stats.in_flight - 1)
+        stats.successes += 1
+        stats.consecutive_failures = 0
+        stats.quarantine_count = 0
+        if stats.latency_ewma is None:
+            stats.latency_ewma = latency
+        else:
+            stats.latency_ewma = self.ewma_alpha * latency + (1 - self.ewma_alpha) * stats.latency_ewma
+
+    def report_failure(self, proxy, error=None):
+        stats = self.stats[proxy]
+        stats.in_flight = max(0, stats.in_flight - 1)
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        if error:
+            stats.last_error = str(error)[:200]
+        # 격리 후 재검증 중인 프록시는 한 번만 실패해도 다시 (더 길게) 격리
+        if stats.consecutive_failures >= self.failure_threshold or stats.quarantine_count > 0:
+            self._quarantine(stats)
+
+    def release(self, proxy):
+        """성공/실패 판단 없이 사용만 끝난 경우 (프록시와 무관한 오류 등)"""
+        stats = self.stats[proxy]
+        stats.in_flight = max(0, stats.in_flight - 1)
+
+    def _quarantine(self, stats):
+        duration = min(self.max_quarantine, self.base_quarantine * (2 ** stats.quarantine_count))
+        stats.quarantine_count += 1
+        stats.total_quarantines += 1
+        stats.consecutive_failures = 0
+        stats.quarantined_until = time.monotonic() + duration
+        logger.warning(f"프록시 {stats.proxy} 격리 ({duration:.0f}초, {stats.quarantine_count}회째)")
+
+    def export_stats(self, filename):
+        """프록시별 통계를 JSON 파일로 저장합니다."""
+        ordered = sorted(self.stats.values(), key=lambda s: (-s.success_rate, s.latency_ewma or 0))
+        data = {"프록시_수": len(ordered), "프록시_목록": [s.to_dict() for s in ordered]}
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return filename
+
+    def print_summary(self, limit=5):
+        ordered = sorted(self.stats.values(), key=lambda s: s.success_rate)
+        quarantined = sum(1 for s in ordered if s.total_quarantines > 0)
+        print(f"프록시 상태: {len(ordered)}개 중 {quarantined}개가 실행 중 격리됨")
+        if self.quarantine_wait_seconds:
+            print(f"  전체 격리로 대기한 시간: {self.quarantine_wait_seconds:.1f}초 (작업자별 합계)")
+        for s in ordered[:limit]:
+            latency = f"{s.latency_ewma:.2f}초" if s.latency_ewma is not None else "-"
+            print(f"  {s.proxy}: 성공 {s.successes}, 실패 {s.failures}, 성공률 {s.success_rate:.0%}, 지연 {latency}")
@@ -0,0 +1,91 @@
+from urllib.parse import urlparse
+
+# 기본 허용 리소스 타입 (문서, XHR/fetch, 1st-party 스크립트)
+DEFAULT_ALLOWED_TYPES = ("document", "xhr", "fetch", "script")
+# 1st-party 도메인 (이 도메인 및 하위 도메인만 허용)
+DEFAULT_FIRST_PARTY_DOMAINS = ("makeship.com",)
+
+
+class ResourcePolicy:
+    """
+    page.route / context.route 기반 리소스 차단 정책.
+
+    허용 목록(allow-list) 방식으로 동작합니다.
+    - allowed_types에 포함된 리소스 타입만 허용 (이미지, 폰트, 미디어, CSS 등은 차단)
+    - script/xhr/fetch는 1st-party 도메인에서 온 것만 허용 (3rd-party 트래킹 스크립트 등 차단)
+    - document는 도메인과 무관하게 허용 (리다이렉트 대응)
+
+    실행 단위로 허용/차단 요청 수와 수신 바이트 수를 집계합니다.
+    """
+
+    def __init__(self, enabled=True, allowed_types=DEFAULT_ALLOWED_TYPES,
+                 first_party_domains=DEFAULT_FIRST_PARTY_DOMAINS, allow_third_party_scripts=False):
+        self.enabled = enabled
+        self.allowed_types = set(allowed_types)
+        self.first_party_domains = tuple(first_party_domains)
+        self.allow_third_party_scripts = allow_third_party_scripts
+        # 실행 단위 카운터
+        self.allowed_requests = 0
+        self.blocked_requests = 0
+        self.blocked_by_type = {}
+        self.bytes_received = 0
+        self.bytes_by_type = {}
+
+    def is_first_party(self, url):
+        host = urlparse(url).hostname or ""
+        return any(host == domain or host.endswith("." + domain) for domain in self.first_party_domains)
+
+    def should_allow(self, resource_type, url):
+        """리소스 타입과 URL을 보고 요청 허용 여부를 결정합니다."""
+        if not self.enabled:
+            return True
+        if resource_type not in self.allowed_types:
+            return False
+        if resource_type == "document":
+            return True
+        if resource_type == "script" and self.allow_third_party_scripts:
+            return True
+        return self.is_first_party(url)
+
+    async def _handle_route(self, route):
+        request = route.request
+        if self.should_allow(request.resource_type, request.url):
+            self.allowed_requests += 1
+            await route.continue_()
+        else:
+            self.blocked_requests += 1
+            self.blocked_by_type[request.resource_type] = self.blocked_by_type.get(request.resource_type, 0) + 1
+            await route.abort()
+
+    async def _on_request_finished(self, request):
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        received = sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0)
+        if received > 0:
+            self.bytes_received += received
+            self.bytes_by_type[request.resource_type] = self.bytes_by_type.get(request.resource_type, 0) + received
+
+    async def attach(self, context_or_page):
+        """컨텍스트(또는 페이지)에 라우팅 정책과 바이트 집계 리스너를 등록합니다."""
+        if self.enabled:
+            await context_or_page.route("**/*", self._handle_route)
+        context_or_page.on("requestfinished", self._on_request_finished)
+
+    def summary(self):
+        """실행 단위 집계 결과를 딕셔너리로 반환합니다."""
+        return {
+            "허용_요청_수": self.allowed_requests,
+            "차단_요청_수": self.blocked_requests,
+            "차단_타입별": dict(self.blocked_by_type),
+            "수신_바이트": self.bytes_received,
+            "수신_바이트_타입별": dict(self.bytes_by_type),
+        }
+
+    def print_summary(self):
+        mb = self.bytes_received / (1024 * 1024)
+        print(f"리소스 정책: 허용 {self.allowed_requests}건, 차단 {self.blocked_requests}건, 수신 {mb:.2f} MB")
+        if self.blocked_by_type:
+            blocked = ", ".join(f"{k}={v}" for k, v in sorted(self.blocked_by_type.items()))
+            print(f"  차단 타입별: {blocked}")
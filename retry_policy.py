@@ -0,0 +1,105 @@
+import json
+import os
+import random
+from datetime import datetime
+
+from jsonl_checkpoint import load_checkpoint
+
+# 재시도 후에도 실패한 URL을 기록하는 파일 (--retry-dead-letters 모드에서 이 URL만 다시 처리)
+DEFAULT_DEAD_LETTER_FILE = "makeship_dead_letters.jsonl"
+
+# 오류 유형
+ERROR_TIMEOUT = "timeout"              # 페이지 로드/요청 시간 초과
+ERROR_PROXY = "proxy"                  # 프록시 연결 실패
+ERROR_BLOCK = "block"                  # 차단 페이지 (403/429, 봇 확인 페이지 등)
+ERROR_MISSING_TITLE = "missing_title"  # 페이지는 열렸지만 제품 타이틀이 없음 (삭제된 제품, 구조 변경 등)
+ERROR_OTHER = "other"
+
+# 오류 유형별 재시도 정책: (최대 시도 횟수, 기본 대기 초, 최대 대기 초)
+# 프록시 오류는 다른 프록시로 바로 바꾸면 해결되는 경우가 많아 짧게, 차단은 길게 기다립니다.
+RETRY_POLICIES = {
+    ERROR_TIMEOUT: (3, 5.0, 60.0),
+    ERROR_PROXY: (4, 1.0, 10.0),
+    ERROR_BLOCK: (3, 30.0, 300.0),
+    ERROR_MISSING_TITLE: (2, 10.0, 30.0),
+    ERROR_OTHER: (2, 5.0, 30.0),
+}
+
+# 응답 상태 코드 / 페이지 문구로 차단 페이지 판단
+BLOCK_STATUS_CODES = (403, 429, 503)
+BLOCK_PAGE_MARKERS = ("access denied", "just a moment", "attention required", "captcha",
+                      "too many requests", "are you a robot", "request blocked")
+# 예외 메시지로 프록시 오류 판단 (Chromium net:: 오류)
+PROXY_ERROR_MARKERS = ("err_proxy", "err_tunnel_connection_failed", "err_socks", "err_no_supported_proxies",
+                       "proxy authentication")
+TIMEOUT_ERROR_MARKERS = ("timeout", "err_timed_out", "err_connection_timed_out")
+
+
+class ScrapeError(Exception):
+    """유형(kind)이 분류된 제품 페이지 수집 오류"""
+
+    def __init__(self, kind, message):
+        super().__init__(message)
+        self.kind = kind
+
+
+def is_block_text(text):
+    """페이지 제목/본문이 차단 또는 봇 확인 페이지인지 확인합니다."""
+    lowered = (text or "").lower()
+    return any(marker in lowered for marker in BLOCK_PAGE_MARKERS)
+
+
+def classify_error(error):
+    """예외를 오류 유형 문자열로 분류합니다."""
+    if isinstance(error, ScrapeError):
+        return error.kind
+    message = str(error).lower()
+    if any(marker in message for marker in PROXY_ERROR_MARKERS):
+        return ERROR_PROXY
+    # playwright.async_api.TimeoutError는 내장 TimeoutError를 상속하지 않으므로 클래스 이름으로도 확인
+    if type(error).__name__ == "TimeoutError" or any(marker in message for marker in TIMEOUT_ERROR_MARKERS):
+        return ERROR_TIMEOUT
+    return ERROR_OTHER
+
+
+def max_attempts(kind):
+    return RETRY_POLICIES.get(kind, RETRY_POLICIES[ERROR_OTHER])[0]
+
+
+def backoff_delay(kind, attempt):
+    """
+    attempt번째 시도가 실패한 뒤 다시 시도하기까지 기다릴 시간(초).
+    지수 백오프에 full jitter를 적용하여 같은 시점에 실패한 URL들이 동시에 재시도되지 않도록 합니다.
+    """
+    _, base_delay, max_delay = RETRY_POLICIES.get(kind, RETRY_POLICIES[ERROR_OTHER])
+    return random.uniform(0, min(max_delay, base_delay * (2 ** (attempt - 1))))
+
+
+def dead_letter_record(url, kind, message, attempts, proxies, is_rescrape=False):
+    """데드레터 파일에 기록할 레코드를 만듭니다. (체크포인트 로그와 같이 제품_URL 기준으로 로드됨)"""
+    return {
+        "제품_URL": url,
+        "오류_유형": kind,
+        "마지막_오류": str(message)[:300],
+        "시도_횟수": attempts,
+        "사용_프록시": list(proxies),
+        "재스크래핑": is_rescrape,
+        "기록_시간": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def prune_dead_letters(paths, succeeded_urls):
+    """성공한 URL을 데드레터 파일에서 제거하고 URL별 최신 실패 레코드만 남깁니다. 남은 레코드 수를 반환합니다."""
+    remaining = 0
+    for path in paths:
+        records = [record for url, record in load_checkpoint(path).items() if url not in succeeded_urls]
+        if not records:
+            os.remove(path)
+            continue
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, path)
+        remaining += len(records)
+    return remaining
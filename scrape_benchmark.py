@@ -0,0 +1,394 @@
+import argparse
+import asyncio
+import glob
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime
+
+try:
+    import psutil
+except ImportError:  # psutil이 없으면 프로세스 트리 전체 RSS는 측정하지 않음 (가장 큰 프로세스의 최대 RSS만 기록)
+    psutil = None
+
+from makeship_simulator import CANONICAL_BASE_URL, SiteProfile, recorded_urls, start_in_background
+from scrape_logging import setup_logging, shutdown_logging
+from scrape_metrics import quantile
+
+# 시뮬레이터(또는 녹화된 페이지)를 상대로 스크래퍼 처리량을 측정하고 기준 결과와 비교합니다.
+#   python scrape_benchmark.py                         # 기본 시나리오 전체
+#   python scrape_benchmark.py --scenario detail-browser --latency-ms 150
+#   python scrape_benchmark.py --recorded makeship_snapshots --scenario detail-browser
+# 결과는 BENCHMARK_DIR에 저장되고, 같은 시나리오/설정의 직전 결과(또는 --baseline 파일)와 비교해 출력됩니다.
+
+BENCHMARK_DIR = "benchmark_results"
+BENCHMARK_FILE_PATTERN = "scrape_benchmark_{timestamp}.json"
+
+# 시나리오
+SCENARIO_DETAIL = "detail"                  # 1.py 기본 경로 (__NEXT_DATA__ HTTP 요청 우선, 실패 시 Playwright)
+SCENARIO_DETAIL_BROWSER = "detail-browser"  # 1.py Playwright 경로만 (셀렉터/대기 로직 변경 측정용)
+SCENARIO_LISTING = "listing"                # complete_infinite_extractor.py 무한 스크롤 목록 수집
+SCENARIOS = (SCENARIO_DETAIL, SCENARIO_DETAIL_BROWSER, SCENARIO_LISTING)
+
+DEFAULT_DETAIL_PAGES = 200
+DEFAULT_LISTING_CATEGORIES = ("plushies", "past")
+DEFAULT_LISTING_MAX_PRODUCTS = 300
+
+# 직전 결과 대비 이 비율 이상 나빠지면 회귀로 표시
+REGRESSION_THRESHOLD = 0.10
+
+# 비교할 지표: (키, 클수록 좋은지 여부)
+COMPARED_METRICS = (
+    ("처리량_초당", True),
+    ("p95_지연_초", False),
+    ("최대_RSS_MB", False),
+    ("트리_최대_RSS_MB", False),
+    ("전송_KB_페이지당", False),
+    ("CPU_초_페이지당", False),
+    ("성공률", True),
+)
+
+
+def load_scraper_module():
+    """1.py는 이름이 숫자라 import 문으로 불러올 수 없으므로 파일 경로로 불러옵니다."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "1.py")
+    spec = importlib.util.spec_from_file_location("makeship_detail_scraper", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_detail_child(scenario, urls):
+    """(자식 프로세스) 1.py의 run_scraping으로 URL 목록을 처리하고 측정 결과를 반환합니다."""
+    from jsonl_checkpoint import CheckpointWriter
+    from scrape_metrics import STAGE_TOTAL
+
+    scraper = load_scraper_module()
+    scraper.USE_HTTP_FETCH = scenario != SCENARIO_DETAIL_BROWSER
+    checkpoint = CheckpointWriter("benchmark_checkpoint.jsonl")
+    dead_letters = CheckpointWriter("benchmark_dead_letters.jsonl")
+    batches = scraper.build_work_batches(urls, {}, set())
+    started = time.perf_counter()
+    try:
+        asyncio.run(scraper.run_scraping(batches, [None], checkpoint, dead_letters))
+    finally:
+        checkpoint.close()
+        dead_letters.close()
+    return {
+        "단위": "페이지",
+        "시도": len(urls),
+        "성공": checkpoint.written_count,
+        "실패": dead_letters.written_count,
+        "경과_초": time.perf_counter() - started,
+        "지연_초": scraper.metrics.stage_samples.get(STAGE_TOTAL, []),
+    }
+
+
+def run_listing_child(categories, max_products):
+    """(자식 프로세스) 카테고리마다 extract_category_with_infinite_scroll을 실행하고 측정 결과를 반환합니다."""
+    import complete_infinite_extractor
+
+    latencies = []
+    found = 0
+    failed = 0
+    started = time.perf_counter()
+    for category in categories:
+        category_started = time.perf_counter()
+        links = complete_infinite_extractor.extract_category_with_infinite_scroll(
+            category, f"{CANONICAL_BASE_URL}/shop/{category}", max_products)
+        latencies.append(time.perf_counter() - category_started)
+        found += len(links)
+        failed += 0 if links else 1  # 오류가 나면 빈 목록을 반환함
+    return {
+        "단위": "링크",
+        "시도": len(categories),
+        "성공": found,
+        "실패": failed,
+        "경과_초": time.perf_counter() - started,
+        "지연_초": latencies,
+    }
+
+
+def child_main(args):
+    setup_logging(quiet=args.quiet)
+    try:
+        if args.child == SCENARIO_LISTING:
+            result = run_listing_child(args.categories, args.max_products)
+        else:
+            with open(args.url_file, "r", encoding="utf-8") as f:
+                urls = [line.strip() for line in f if line.strip()]
+            result = run_detail_child(args.child, urls)
+    finally:
+        shutdown_logging()
+    with open(args.result_file, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+class TreeMemorySampler:
+    """psutil로 자식 프로세스 트리(Chromium 포함) 전체 RSS 합계의 최대값을 주기적으로 기록합니다."""
+
+    def __init__(self, pid, interval=0.2):
+        self.pid = pid
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        try:
+            root = psutil.Process(self.pid)
+        except psutil.Error:
+            return
+        while not self._stop.wait(self.interval):
+            try:
+                processes = [root] + root.children(recursive=True)
+            except psutil.Error:
+                break
+            total = 0
+            for process in processes:
+                try:
+                    total += process.memory_info().rss
+                except psutil.Error:
+                    pass
+            self.peak_bytes = max(self.peak_bytes, total)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def fetch_simulator_stats(base_url):
+    with urllib.request.urlopen(f"{base_url}/__stats", timeout=10) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def run_child_process(command, env, log_path):
+    """
+    자식 프로세스를 실행하고 (종료 코드, CPU 초, 최대 RSS MB, 트리 최대 RSS MB)를 반환합니다.
+    os.wait4의 자원 사용량에는 자식이 기다린(종료된) 하위 프로세스(브라우저, 드라이버)도 포함됩니다.
+    """
+    with open(log_path, "w", encoding="utf-8") as log:
+        process = subprocess.Popen(command, env=env, cwd=os.path.dirname(log_path), stdout=log, stderr=subprocess.STDOUT)
+        sampler = TreeMemorySampler(process.pid) if psutil is not None else None
+        if sampler:
+            sampler.start()
+        try:
+            if hasattr(os, "wait4"):
+                _, status, usage = os.wait4(process.pid, 0)
+                process.returncode = os.waitstatus_to_exitcode(status)
+                cpu_seconds = usage.ru_utime + usage.ru_stime
+                max_rss_mb = usage.ru_maxrss / 1024  # Linux에서 ru_maxrss 단위는 KB
+            else:  # Windows 등 wait4가 없는 환경에서는 CPU/RSS를 측정하지 않음
+                process.wait()
+                cpu_seconds = max_rss_mb = None
+        finally:
+            if sampler:
+                sampler.stop()
+    tree_rss_mb = sampler.peak_bytes / (1024 * 1024) if sampler and sampler.peak_bytes else None
+    return process.returncode, cpu_seconds, max_rss_mb, tree_rss_mb
+
+
+def summarize(scenario, child_result, cpu_seconds, max_rss_mb, tree_rss_mb, bytes_sent):
+    units = child_result["성공"] if scenario == SCENARIO_LISTING else child_result["시도"]
+    latencies = sorted(child_result["지연_초"])
+    elapsed = child_result["경과_초"]
+    attempted = child_result["시도"]
+
+    def per_unit(value, scale=1):
+        return round(value / scale / units, 4) if value is not None and units else None
+
+    return {
+        "단위": child_result["단위"],
+        "처리_수": units,
+        "성공": child_result["성공"],
+        "실패": child_result["실패"],
+        "성공률": round(child_result["성공"] / attempted, 4) if attempted and scenario != SCENARIO_LISTING else None,
+        "경과_초": round(elapsed, 2),
+        "처리량_초당": round(units / elapsed, 3) if elapsed else None,
+        "p50_지연_초": round(quantile(latencies, 0.5), 3) if latencies else None,
+        "p95_지연_초": round(quantile(latencies, 0.95), 3) if latencies else None,
+        "최대_RSS_MB": round(max_rss_mb, 1) if max_rss_mb is not None else None,
+        "트리_최대_RSS_MB": round(tree_rss_mb, 1) if tree_rss_mb is not None else None,
+        "전송_바이트": bytes_sent,
+        "전송_KB_페이지당": per_unit(bytes_sent, 1024),
+        "CPU_초": round(cpu_seconds, 2) if cpu_seconds is not None else None,
+        "CPU_초_페이지당": per_unit(cpu_seconds),
+    }
+
+
+def run_scenario(scenario, args, server, base_url, workdir):
+    """시나리오 하나를 별도 프로세스로 실행하고 측정 결과를 반환합니다. (실패하면 None)"""
+    scenario_dir = os.path.join(workdir, scenario)
+    os.makedirs(scenario_dir, exist_ok=True)
+    result_file = os.path.join(scenario_dir, "result.json")
+    log_path = os.path.join(scenario_dir, "output.log")
+    command = [sys.executable, os.path.abspath(__file__), "--child", scenario, "--result-file", result_file]
+    if args.quiet:
+        command.append("--quiet")
+    if scenario == SCENARIO_LISTING:
+        command += ["--categories", *args.categories, "--max-products", str(args.max_products)]
+    else:
+        if server.state.recorded:
+            urls = recorded_urls(server.state)[:args.pages]
+        else:
+            urls = [f"{CANONICAL_BASE_URL}/products/{product['handle']}" for product in server.state.catalog[:args.pages]]
+        url_file = os.path.join(scenario_dir, "urls.txt")
+        with open(url_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(urls) + "\n")
+        command += ["--url-file", url_file]
+
+    env = dict(os.environ, MAKESHIP_BASE_URL=base_url, PYTHONUNBUFFERED="1")
+    # 스크래퍼가 import하는 로컬 모듈을 찾을 수 있도록 저장소 폴더를 경로에 추가 (자식은 임시 폴더에서 실행)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.dirname(os.path.abspath(__file__)), env.get("PYTHONPATH")]))
+    print(f"\n▶ {scenario} 실행 중... (로그: {log_path})")
+    bytes_before = fetch_simulator_stats(base_url)["전송_바이트"]
+    exit_code, cpu_seconds, max_rss_mb, tree_rss_mb = run_child_process(command, env, log_path)
+    bytes_sent = fetch_simulator_stats(base_url)["전송_바이트"] - bytes_before
+    if exit_code != 0 or not os.path.exists(result_file):
+        print(f"❌ {scenario} 실패 (exit code {exit_code}) - 로그를 확인하세요: {log_path}")
+        return None
+    with open(result_file, "r", encoding="utf-8") as f:
+        child_result = json.load(f)
+    return summarize(scenario, child_result, cpu_seconds, max_rss_mb, tree_rss_mb, bytes_sent)
+
+
+def find_baseline(scenario, profile_dict, exclude=None):
+    """같은 시나리오와 시뮬레이터 설정으로 측정한 가장 최근 결과를 찾습니다."""
+    for path in sorted(glob.glob(os.path.join(BENCHMARK_DIR, BENCHMARK_FILE_PATTERN.format(timestamp="*"))), reverse=True):
+        if path == exclude:
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if previous.get("시뮬레이터_설정") == profile_dict and scenario in previous.get("결과", {}):
+            return path, previous["결과"][scenario]
+    return None, None
+
+
+def load_baseline_file(path, scenario):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("결과", {}).get(scenario)
+
+
+def print_comparison(scenario, current, baseline, baseline_label):
+    print(f"\n=== {scenario} ({current['단위']} {current['처리_수']}개) ===")
+    if baseline is None:
+        print("  (비교할 기준 결과 없음)")
+    else:
+        print(f"  기준: {baseline_label}")
+    regressions = []
+    for key, higher_is_better in COMPARED_METRICS:
+        value = current.get(key)
+        previous = baseline.get(key) if baseline else None
+        line = f"  {key}: {value}"
+        if value is not None and previous:
+            change = (value - previous) / previous
+            worse = change < -REGRESSION_THRESHOLD if higher_is_better else change > REGRESSION_THRESHOLD
+            line += f" (기준 {previous}, {change:+.1%}){' ❗️ 회귀' if worse else ''}"
+            if worse:
+                regressions.append(key)
+        print(line)
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Makeship 스크래퍼 처리량 벤치마크")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                        help="실행할 시나리오 (여러 번 지정 가능, 기본값: 전체)")
+    parser.add_argument("--pages", type=int, default=DEFAULT_DETAIL_PAGES, help="상세 페이지 시나리오에서 처리할 제품 수")
+    parser.add_argument("--categories", nargs="+", default=list(DEFAULT_LISTING_CATEGORIES), help="목록 시나리오 카테고리")
+    parser.add_argument("--max-products", type=int, default=DEFAULT_LISTING_MAX_PRODUCTS, help="목록 시나리오 카테고리별 최대 수집 수")
+    parser.add_argument("--baseline", metavar="FILE", help="비교할 기준 결과 파일 (기본값: 같은 설정의 직전 결과)")
+    parser.add_argument("--quiet", action="store_true", help="스크래퍼를 --quiet 모드(경고/오류만 출력)로 측정")
+    parser.add_argument("--recorded", metavar="DIR", help="스냅샷 저장소에 녹화된 실제 제품 HTML로 측정")
+    parser.add_argument("--products", type=int, default=2000, help="시뮬레이터 제품 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--block-rate", type=float, default=0.0)
+    parser.add_argument("--page-weight-kb", type=int, default=0)
+    parser.add_argument("--hydrate-delay-ms", type=int, default=0)
+    parser.add_argument("--no-next-data", action="store_true")
+    # 내부용: 시나리오 하나를 자식 프로세스에서 실행
+    parser.add_argument("--child", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--url-file", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.child:
+        child_main(args)
+        return
+
+    scenarios = args.scenario or list(SCENARIOS)
+    profile = SiteProfile(products=args.products, seed=args.seed, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                          error_rate=args.error_rate, block_rate=args.block_rate, page_weight_kb=args.page_weight_kb,
+                          hydrate_delay_ms=args.hydrate_delay_ms, next_data=not args.no_next_data,
+                          recorded_dir=os.path.abspath(args.recorded) if args.recorded else None)
+    # 기준 결과 비교 시 사용할 설정 (녹화 폴더는 절대 경로 대신 입력한 값으로 기록)
+    profile_dict = dict(profile.to_dict(), recorded_dir=args.recorded, pages=args.pages,
+                        categories=args.categories, max_products=args.max_products)
+    server, base_url = start_in_background(profile)
+    print(f"🧪 시뮬레이터 실행: {base_url}")
+    if args.recorded:
+        print(f"녹화된 제품 페이지 {len(server.state.recorded)}개를 사용합니다.")
+
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory(prefix="makeship_benchmark_") as workdir:
+            for scenario in scenarios:
+                summary = run_scenario(scenario, args, server, base_url, workdir)
+                if summary is not None:
+                    results[scenario] = summary
+                # 실패한 경우 로그를 볼 수 있도록 임시 폴더의 로그를 결과 폴더로 옮겨 둠
+                elif os.path.exists(os.path.join(workdir, scenario, "output.log")):
+                    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+                    os.replace(os.path.join(workdir, scenario, "output.log"),
+                               os.path.join(BENCHMARK_DIR, f"{scenario}_failed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    if not results:
+        print("측정된 결과가 없습니다.")
+        return
+
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    output_path = os.path.join(BENCHMARK_DIR, BENCHMARK_FILE_PATTERN.format(timestamp=datetime.now().strftime('%Y%m%d_%H%M%S')))
+    all_regressions = {}
+    for scenario, summary in results.items():
+        if args.baseline:
+            baseline_label, baseline = args.baseline, load_baseline_file(args.baseline, scenario)
+        else:
+            baseline_label, baseline = find_baseline(scenario, profile_dict, exclude=output_path)
+        regressions = print_comparison(scenario, summary, baseline, baseline_label)
+        if regressions:
+            all_regressions[scenario] = regressions
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "측정_시간": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "시뮬레이터_설정": profile_dict,
+            "결과": results,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\n벤치마크 결과가 '{output_path}' 파일로 저장되었습니다.")
+    if all_regressions:
+        print("❗️ 기준 대비 회귀: " + ", ".join(f"{scenario}({', '.join(keys)})" for scenario, keys in all_regressions.items()))
+
+
+if __name__ == "__main__":
+    main()
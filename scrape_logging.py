@@ -0,0 +1,104 @@
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+
+# 스크래퍼 로그는 모두 이 로거(및 하위 로거) 아래에 기록됩니다.
+LOGGER_NAME = "makeship"
+
+LOG_FORMAT_TEXT = "text"  # 메시지만 출력 (기존 print 출력과 같은 모양)
+LOG_FORMAT_JSON = "json"  # 한 줄 JSON (로그 수집기용, extra 필드 포함)
+LOG_FORMATS = (LOG_FORMAT_TEXT, LOG_FORMAT_JSON)
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# LogRecord 기본 속성 (이 외의 속성은 logger.info(..., extra={...})로 넘긴 값)
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_log_queue = None
+_listener = None
+_settings = {}
+
+
+def record_extras(record):
+    return {key: value for key, value in record.__dict__.items() if key not in _STANDARD_ATTRS}
+
+
+class JsonLineFormatter(logging.Formatter):
+    """로그 한 건을 한 줄 JSON으로 만듭니다. extra로 넘긴 필드(제품 데이터 등)도 함께 기록합니다."""
+
+    def format(self, record):
+        entry = {
+            "시간": self.formatTime(record, TIME_FORMAT),
+            "레벨": record.levelname,
+            "로거": record.name,
+            "메시지": record.getMessage(),
+        }
+        entry.update(record_extras(record))
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """메시지만 출력합니다. include_extras가 True(DEBUG 레벨)이면 extra 필드를 한 줄 JSON으로 덧붙입니다."""
+
+    def __init__(self, include_extras=False):
+        super().__init__("%(message)s")
+        self.include_extras = include_extras
+
+    def format(self, record):
+        text = super().format(record)
+        extras = record_extras(record) if self.include_extras else None
+        if extras:
+            text += " " + json.dumps(extras, ensure_ascii=False, default=str)
+        return text
+
+
+def get_logger(name=None):
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def setup_logging(level="INFO", log_format=LOG_FORMAT_TEXT, quiet=False, stream=None):
+    """
+    큐 기반 로깅을 설정합니다. 이벤트 루프 스레드에서는 QueueHandler가 레코드를 큐에 넣기만 하고,
+    포맷(JSON 직렬화 포함)과 stdout 쓰기는 QueueListener의 백그라운드 스레드가 처리합니다.
+    quiet=True이면 경고 이상만 출력합니다. (처리량 측정/대량 실행용)
+    """
+    global _log_queue, _listener, _settings
+    shutdown_logging()
+    _settings = {"level": level, "log_format": log_format, "quiet": quiet}
+    level_no = logging.WARNING if quiet else logging.getLevelName(level.upper())
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    if log_format == LOG_FORMAT_JSON:
+        output.setFormatter(JsonLineFormatter())
+    else:
+        output.setFormatter(TextFormatter(include_extras=level_no <= logging.DEBUG))
+
+    _log_queue = queue.Queue(-1)
+    _listener = logging.handlers.QueueListener(_log_queue, output, respect_handler_level=False)
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.handlers[:] = [logging.handlers.QueueHandler(_log_queue)]
+    logger.setLevel(level_no)
+    logger.propagate = False
+    _listener.start()
+    return logger
+
+
+def current_settings():
+    """샤드 프로세스에서 같은 설정으로 setup_logging을 호출할 수 있도록 현재 설정을 반환합니다."""
+    return dict(_settings)
+
+
+def drain_logging():
+    """큐에 쌓인 로그가 모두 출력될 때까지 기다립니다. (print로 요약을 출력하기 전에 호출)"""
+    if _listener is not None and _log_queue is not None:
+        _log_queue.join()
+
+
+def shutdown_logging():
+    """남은 로그를 모두 출력하고 백그라운드 스레드를 종료합니다."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
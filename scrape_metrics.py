@@ -0,0 +1,159 @@
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# 단계 이름 (Prometheus 라벨로도 사용되므로 영문 식별자)
+STAGE_HTTP_FETCH = "http_fetch"            # __NEXT_DATA__ HTTP 요청 + 파싱
+STAGE_CONTEXT_ACQUIRE = "context_acquire"  # 컨텍스트 풀에서 페이지 획득 (필요 시 컨텍스트 생성 포함)
+STAGE_STEALTH_PREPARE = "stealth_prepare"  # stealth 회피 스크립트 생성 (실행당 한 번)
+STAGE_STEALTH = "stealth"                  # 새 컨텍스트에 stealth init script 등록
+STAGE_GOTO = "goto"                        # page.goto (commit)
+STAGE_WAIT_TITLE = "wait_title"            # 제품 타이틀 셀렉터 대기
+STAGE_WAIT_READY = "wait_ready"            # 필드 준비 / DOM 안정 대기
+STAGE_EXTRACT = "extract"                  # 필드 추출 page.evaluate
+STAGE_POST_PROCESS = "post_process"        # build_product_data (판매량/날짜/매출 후처리)
+STAGE_TOTAL = "total"                      # URL 하나 처리 전체
+
+
+def quantile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class ScrapeMetrics:
+    """
+    스크래퍼 단계별 지연시간과 결과 카운터를 모으는 수집기.
+    실행이 끝나면 Prometheus textfile(node_exporter textfile collector용)과 JSON 요약으로 저장합니다.
+
+    사용 예:
+        with metrics.timer(STAGE_GOTO, proxy):
+            await page.goto(url)
+        metrics.count("success")
+    """
+
+    def __init__(self):
+        self.stage_samples = defaultdict(list)        # 단계 -> [초]
+        self.proxy_stage_samples = defaultdict(list)  # (프록시, 단계) -> [초]
+        self.outcomes = Counter()                     # 결과 -> 횟수
+        self.missing_fields = Counter()               # 필드명 -> 누락 횟수
+        self.run_values = {}                          # 실행 단위 값 (예: stealth 오버헤드) 이름 -> 값
+        self.started_at = time.time()
+
+    def observe(self, stage, seconds, proxy=None):
+        self.stage_samples[stage].append(seconds)
+        if proxy:
+            self.proxy_stage_samples[(proxy, stage)].append(seconds)
+
+    @contextmanager
+    def timer(self, stage, proxy=None):
+        """with 블록의 실행 시간을 stage에 기록합니다. (예외로 끝나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, proxy)
+
+    def count(self, outcome, amount=1):
+        self.outcomes[outcome] += amount
+
+    def count_missing_field(self, field):
+        self.missing_fields[field] += 1
+
+    def set_value(self, name, value):
+        """실행 전체에 대해 한 번 계산하는 값을 기록합니다. (Prometheus gauge, name은 영문 식별자)"""
+        self.run_values[name] = value
+
+    @staticmethod
+    def _describe(samples):
+        values = sorted(samples)
+        described = {"횟수": len(values), "합계_초": round(sum(values), 3)}
+        for q in QUANTILES:
+            value = quantile(values, q)
+            described[f"p{int(q * 100)}_초"] = round(value, 3) if value is not None else None
+        return described
+
+    def summary(self):
+        by_proxy = defaultdict(dict)
+        for (proxy, stage), samples in self.proxy_stage_samples.items():
+            by_proxy[proxy][stage] = self._describe(samples)
+        return {
+            "실행_시간_초": round(time.time() - self.started_at, 1),
+            "결과": dict(self.outcomes),
+            "누락_필드": dict(self.missing_fields),
+            "실행_값": {name: round(value, 6) for name, value in sorted(self.run_values.items())},
+            "단계별_지연": {stage: self._describe(samples) for stage, samples in sorted(self.stage_samples.items())},
+            "프록시별_지연": {proxy: stages for proxy, stages in sorted(by_proxy.items())},
+        }
+
+    def write_json(self, filename):
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+        return filename
+
+    def _prometheus_summary_lines(self, name, labels, samples):
+        values = sorted(samples)
+        label_text = ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+        prefix = f"{label_text}," if label_text else ""
+        lines = [f'{name}{{{prefix}quantile="{q}"}} {quantile(values, q):.6f}' for q in QUANTILES]
+        lines.append(f"{name}_sum{{{label_text}}} {sum(values):.6f}")
+        lines.append(f"{name}_count{{{label_text}}} {len(values)}")
+        return lines
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP makeship_stage_latency_seconds Latency of each scraper stage.",
+            "# TYPE makeship_stage_latency_seconds summary",
+        ]
+        for stage, samples in sorted(self.stage_samples.items()):
+            lines += self._prometheus_summary_lines("makeship_stage_latency_seconds", {"stage": stage}, samples)
+        lines += [
+            "# HELP makeship_proxy_stage_latency_seconds Latency of each scraper stage per proxy.",
+            "# TYPE makeship_proxy_stage_latency_seconds summary",
+        ]
+        for (proxy, stage), samples in sorted(self.proxy_stage_samples.items()):
+            lines += self._prometheus_summary_lines("makeship_proxy_stage_latency_seconds",
+                                                    {"proxy": proxy, "stage": stage}, samples)
+        lines += [
+            "# HELP makeship_scrape_outcomes_total Scrape attempts by outcome.",
+            "# TYPE makeship_scrape_outcomes_total counter",
+        ]
+        for outcome, value in sorted(self.outcomes.items()):
+            lines.append(f'makeship_scrape_outcomes_total{{outcome="{_escape_label(outcome)}"}} {value}')
+        lines += [
+            "# HELP makeship_missing_fields_total Products with a field that could not be extracted.",
+            "# TYPE makeship_missing_fields_total counter",
+        ]
+        for field, value in sorted(self.missing_fields.items()):
+            lines.append(f'makeship_missing_fields_total{{field="{_escape_label(field)}"}} {value}')
+        lines += [
+            "# HELP makeship_run_value Per-run values such as stealth overhead.",
+            "# TYPE makeship_run_value gauge",
+        ]
+        for name, value in sorted(self.run_values.items()):
+            lines.append(f'makeship_run_value{{name="{_escape_label(name)}"}} {value:.6f}')
+        lines.append(f"makeship_last_run_timestamp_seconds {time.time():.0f}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, filename):
+        # textfile collector가 쓰는 도중의 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_filename = filename + ".tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_filename, filename)
+        return filename
+
+    def print_summary(self):
+        print("단계별 지연 (p50 / p95 / p99):")
+        for stage, described in self.summary()["단계별_지연"].items():
+            print(f"  {stage}: {described['p50_초']}초 / {described['p95_초']}초 / {described['p99_초']}초 ({described['횟수']}회)")
+        if self.outcomes:
+            print("결과: " + ", ".join(f"{outcome} {value}" for outcome, value in sorted(self.outcomes.items())))
@@ -0,0 +1,112 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from jsonl_checkpoint import iter_checkpoint
+from scrape_logging import get_logger
+
+logger = get_logger("snapshot")
+
+# 제품 페이지 스냅샷 저장 폴더
+DEFAULT_SNAPSHOT_DIR = "makeship_snapshots"
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class SnapshotStore:
+    """
+    제품 페이지에서 추출한 원본 필드(raw)와 렌더링된 HTML을 gzip으로 압축해 저장하는 내용 주소 기반 저장소.
+
+    - objects/<해시 앞 2자리>/<sha256>.gz : 내용 자체 (같은 내용은 한 번만 저장)
+    - index.jsonl : 제품_URL + 수집_시간 → 내용 해시 (수집할 때마다 한 줄씩 추가)
+
+    저장된 원본 필드는 1.py의 build_product_data로 네트워크 없이 다시 처리할 수 있습니다. (1.py --replay-snapshots)
+    """
+
+    def __init__(self, root=DEFAULT_SNAPSHOT_DIR):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "index.jsonl")
+        self.saved_count = 0         # 새로 저장한 내용 수
+        self.deduplicated_count = 0  # 이미 같은 내용이 있어 건너뛴 수
+        self._lock = threading.Lock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.gz")
+
+    def put_object(self, data):
+        """바이트 내용을 저장하고 sha256 해시를 반환합니다."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            self.deduplicated_count += 1
+            return digest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 샤드 프로세스가 같은 내용을 동시에 쓰더라도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.saved_count += 1
+        return digest
+
+    def get_object(self, digest):
+        with gzip.open(self._object_path(digest), "rb") as f:
+            return f.read()
+
+    def put(self, url, raw, html=None, source=None, fetched_at=None):
+        """
+        제품 하나의 스냅샷을 저장하고 색인 항목을 반환합니다.
+        파일 쓰기가 있으므로 이벤트 루프에서는 asyncio.to_thread로 호출합니다.
+        """
+        fetched_at = fetched_at or datetime.now()
+        entry = {
+            "제품_URL": url,
+            "수집_시간": fetched_at.strftime(TIME_FORMAT),
+            "출처": source,
+            "원본_해시": self.put_object(json.dumps(raw, ensure_ascii=False, sort_keys=True).encode("utf-8")),
+        }
+        if html is not None:
+            entry["HTML_해시"] = self.put_object(html.encode("utf-8"))
+        # 한 줄씩 append 모드로 기록하므로 여러 프로세스가 같은 색인 파일에 써도 줄이 섞이지 않음
+        with self._lock, open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+    def load_raw(self, entry):
+        return json.loads(self.get_object(entry["원본_해시"]).decode("utf-8"))
+
+    def load_html(self, entry):
+        if not entry.get("HTML_해시"):
+            return None
+        return self.get_object(entry["HTML_해시"]).decode("utf-8")
+
+    def iter_index(self):
+        return iter_checkpoint(self.index_path)
+
+    def latest_entries(self, until=None):
+        """URL별 가장 최근 색인 항목을 반환합니다. until(datetime)을 지정하면 그 시각 이전 스냅샷만 대상으로 합니다."""
+        limit = until.strftime(TIME_FORMAT) if until else None
+        latest = {}
+        for entry in self.iter_index():
+            if limit and entry["수집_시간"] > limit:
+                continue
+            current = latest.get(entry["제품_URL"])
+            if current is None or entry["수집_시간"] >= current["수집_시간"]:
+                latest[entry["제품_URL"]] = entry
+        return latest
+
+    def iter_latest(self, until=None):
+        """URL별 최신 스냅샷을 (색인 항목, 원본 필드) 형태로 반환합니다."""
+        for entry in self.latest_entries(until).values():
+            try:
+                yield entry, self.load_raw(entry)
+            except (OSError, ValueError) as e:
+                logger.warning(f"스냅샷을 읽을 수 없어 건너뜁니다 ({entry['제품_URL']}): {e}")
+
+    def print_summary(self):
+        print(f"스냅샷 저장: 새 내용 {self.saved_count}개, 중복 {self.deduplicated_count}개 ('{self.root}')")
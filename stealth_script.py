@@ -0,0 +1,27 @@
+from contextlib import nullcontext
+
+from playwright_stealth import Stealth
+
+from scrape_metrics import STAGE_STEALTH, STAGE_STEALTH_PREPARE
+
+# Stealth()가 만드는 회피 스크립트를 프로세스마다 한 번만 생성해 모든 컨텍스트에서 재사용합니다.
+# (apply_stealth_async가 컨텍스트마다 등록하는 것과 같은 스크립트, 1.py와 debug_page.py가 함께 사용)
+# metrics(ScrapeMetrics)를 넘기면 생성/등록 시간을 stealth_prepare / stealth 단계로 기록합니다.
+
+_stealth_script = None
+
+
+def get_stealth_script(metrics=None):
+    """stealth 회피 스크립트를 처음 호출할 때 한 번만 생성합니다."""
+    global _stealth_script
+    if _stealth_script is None:
+        with metrics.timer(STAGE_STEALTH_PREPARE) if metrics else nullcontext():
+            _stealth_script = Stealth().script_payload
+    return _stealth_script
+
+
+async def apply_stealth(context, metrics=None):
+    """새로 생성된 컨텍스트에 미리 만들어 둔 stealth 스크립트를 init script로 등록합니다. (컨텍스트당 한 번만 호출)"""
+    script = get_stealth_script(metrics)
+    with metrics.timer(STAGE_STEALTH) if metrics else nullcontext():
+        await context.add_init_script(script)
@@ -1,43 +1,11 @@
-import re
+import os
+import sys
 import pandas as pd
 from datetime import datetime
 
-def process_sales_data(sales_volume, funded_rate):
-    """
-    의뢰인 요구사항에 맞게 판매량과 달성률 데이터를 처리하는 함수
-    
-    1. 판매량: "1000 of 1000 sold" -> 판매량: 1000, 달성률: "1000 of 1000 sold"
-    2. 단위 제거: "716 sold" -> "716", "143% Funded" -> "143%"
-    """
-    processed_sales = sales_volume
-    processed_rate = funded_rate
-    
-    # 1. "X of Y sold" 패턴 처리 (콤마 포함)
-    sold_pattern = r'([0-9,]+)\s+of\s+([0-9,]+)\s+sold'
-    sold_match = re.search(sold_pattern, sales_volume, re.IGNORECASE)
-    
-    if sold_match:
-        sold_count = sold_match.group(1).replace(',', '')  # 콤마 제거
-        total_count = sold_match.group(2).replace(',', '')  # 콤마 제거
-        processed_sales = sold_count
-        processed_rate = f"{sold_count} of {total_count} sold"
-        return processed_sales, processed_rate
-    
-    # 2. 일반적인 판매량 처리 ("716 sold" -> "716", 콤마 포함)
-    sold_only_pattern = r'([0-9,]+)\s+sold'
-    sold_only_match = re.search(sold_only_pattern, sales_volume, re.IGNORECASE)
-    
-    if sold_only_match:
-        processed_sales = sold_only_match.group(1).replace(',', '')  # 콤마 제거
-    
-    # 3. 달성률 처리 ("143% Funded" -> "143%", 콤마 포함)
-    funded_pattern = r'([0-9,]+%)\s+Funded'
-    funded_match = re.search(funded_pattern, funded_rate, re.IGNORECASE)
-    
-    if funded_match:
-        processed_rate = funded_match.group(1).replace(',', '')  # 콤마 제거
-    
-    return processed_sales, processed_rate
+# 상위 폴더의 공용 파싱 모듈 사용 (이 스크립트는 과거/ 폴더에서 실행됨)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from makeship_parsing import process_excel_sales_data as process_sales_data
 
 def extract_product_data_fixed(page, url):
     """수정된 제품 데이터 추출 함수"""